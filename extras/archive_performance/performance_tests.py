@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Telemetry archive: publication rate through the archiver, and readback"""
+
+import time
+from tempfile import mkdtemp
+from shutil import rmtree
+
+from mamba.core.context import Context
+from mamba.core.msg import Empty, ServiceResponse, ParameterType
+from mamba.component.utils.telemetry_archiver import TelemetryArchiver
+from mamba.core.telemetry_archive import TelemetryArchive
+
+NUMBER_OF_SAMPLES = 500000
+
+
+def publish(number_of_parameters):
+    """ Publish the samples on io_result, as a cyclic TM provider """
+    directory = mkdtemp()
+    context = Context()
+
+    archiver = TelemetryArchiver(context,
+                                 local_config={'directory': directory})
+    archiver.initialize()
+
+    results = [
+        ServiceResponse(provider='cyclic_tm',
+                        id=f'tm_{key}',
+                        type=ParameterType.get,
+                        value=float(key))
+        for key in range(number_of_parameters)
+    ]
+
+    start = time.perf_counter()
+
+    for index in range(NUMBER_OF_SAMPLES):
+        context.rx['io_result'].on_next(results[index %
+                                                number_of_parameters])
+
+    published = time.perf_counter() - start
+
+    archiver._writer.flush()
+    written = time.perf_counter() - start
+
+    dropped = archiver._writer.dropped
+    context.rx['quit'].on_next(Empty())
+
+    read_start = time.perf_counter()
+    archive = TelemetryArchive(directory)
+    timestamps, _ = archive.read('cyclic_tm', 'tm_0')
+    archive.read('cyclic_tm', 'tm_0', timestamps[len(timestamps) // 2],
+                 timestamps[len(timestamps) // 2 + 100])
+    read = time.perf_counter() - read_start
+
+    rmtree(directory)
+
+    return (NUMBER_OF_SAMPLES / published, NUMBER_OF_SAMPLES / written,
+            dropped, read)
+
+
+print(f'{NUMBER_OF_SAMPLES} samples published on io_result')
+print(f'{"parameters":>10} {"publish/s":>12} {"written/s":>12} '
+      f'{"dropped":>8} {"read ms":>8}')
+
+for number_of_parameters in [1, 10, 100, 1000]:
+    published, written, dropped, read = publish(number_of_parameters)
+
+    print(f'{number_of_parameters:>10} {published:>12.0f} {written:>12.0f} '
+          f'{dropped:>8} {read * 1000:>8.1f}')
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""TCP drivers of 200 instruments: blocking, worker threads and asyncio"""
+
+import asyncio
+import threading
+import time
+
+from mamba.core.context import Context
+from mamba.core.event_loop import EventLoop
+from mamba.core.msg import Empty, ServiceRequest, ServiceResponse, \
+    ParameterType
+from mamba.marketplace.components.tcp_udp.single_port_tcp import \
+    SinglePortTcpController
+
+NUMBER_OF_INSTRUMENTS = 200
+NUMBER_OF_ROUNDS = 5
+FIRST_PORT = 22000
+REPLY_DELAY = 0.01  # Seconds each simulated instrument takes to reply
+
+
+async def reply(reader, writer):
+    try:
+        while True:
+            await reader.readuntil(b'\r\n')
+            await asyncio.sleep(REPLY_DELAY)
+            writer.write(b'Mamba Framework,Simulated Instrument,1.0\n')
+    except (asyncio.IncompleteReadError, ConnectionError):
+        writer.close()
+
+
+async def start_instruments():
+    for port in range(FIRST_PORT, FIRST_PORT + NUMBER_OF_INSTRUMENTS):
+        await asyncio.start_server(reply, 'localhost', port)
+
+
+def benchmark(execution):
+    context = Context()
+    received = []
+    done = threading.Event()
+
+    def on_result(result):
+        if isinstance(result, ServiceResponse) and result.id == 'idn':
+            received.append(result)
+            if len(received) == NUMBER_OF_INSTRUMENTS:
+                done.set()
+
+    context.rx['io_result'].subscribe(on_result)
+
+    for index in range(NUMBER_OF_INSTRUMENTS):
+        SinglePortTcpController(context,
+                                local_config={
+                                    'name': f'instrument_{index}',
+                                    'instrument': {
+                                        'address': 'localhost',
+                                        'port': FIRST_PORT + index
+                                    },
+                                    'execution': execution
+                                }).initialize()
+
+        context.rx['io_service_request'].on_next(
+            ServiceRequest(provider=f'instrument_{index}',
+                           id='connect',
+                           type=ParameterType.set,
+                           args=['1']))
+
+    threads = threading.active_count()
+    start = time.perf_counter()
+
+    for _ in range(NUMBER_OF_ROUNDS):
+        received.clear()
+        done.clear()
+
+        for index in range(NUMBER_OF_INSTRUMENTS):
+            context.rx['io_service_request'].on_next(
+                ServiceRequest(provider=f'instrument_{index}',
+                               id='idn',
+                               type=ParameterType.get,
+                               args=[]))
+
+        done.wait()
+
+    elapsed = (time.perf_counter() - start) / NUMBER_OF_ROUNDS
+
+    assert all(result.type == ParameterType.get for result in received)
+
+    context.rx['quit'].on_next(Empty())
+
+    if execution['mode'] == 'async':
+        context.event_loop().stop()
+
+    return elapsed, threads
+
+
+simulator = EventLoop(name='instruments')
+simulator.run(start_instruments())
+
+print(f'{NUMBER_OF_INSTRUMENTS} instruments replying in '
+      f'{REPLY_DELAY * 1e3:.0f} ms, one query to each instrument')
+print(f'{"mode":>8} {"ms/round":>10} {"threads":>8}')
+
+for name, execution in [('direct', {
+        'mode': 'direct'
+}), ('queue', {
+        'mode': 'queue'
+}), ('async', {
+        'mode': 'async'
+})]:
+    elapsed, threads = benchmark(execution)
+
+    print(f'{name:>8} {elapsed * 1e3:>10.1f} {threads:>8}')
+
+simulator.stop()
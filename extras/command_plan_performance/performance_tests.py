@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Instrument command preparation: per request lookups vs compiled plans"""
+
+import timeit
+
+NUMBER_OF_LOOPS = 100000
+
+SETUP = """
+from mamba.core.component_base.instrument_driver import compile_command_plans
+from mamba.core.msg import ServiceRequest, ParameterType
+
+parameter_info = {
+    ('idn', ParameterType.get): {
+        'signature': [[], 'str'],
+        'instrument_command': [{'query': '*IDN?'}]},
+    ('frequency', ParameterType.set): {
+        'signature': [['float'], None],
+        'instrument_command': [{'write': 'FREQ {:.3f}'}, {'query': 'FREQ?'}]},
+}
+shared_memory_setter = {'frequency': 'frequency'}
+plans = compile_command_plans(parameter_info, shared_memory_setter)
+
+get_request = ServiceRequest(provider='driver', id='idn',
+                             type=ParameterType.get)
+set_request = ServiceRequest(provider='driver', id='frequency',
+                             type=ParameterType.set, args=[1.5])
+
+
+def per_request(service_request):
+    service = parameter_info[(service_request.id, service_request.type)]
+    if service.get('instrument_command') is None:
+        return
+    param_sig = parameter_info[(service_request.id,
+                                service_request.type)]['signature'][0]
+    if len(param_sig) != len(service_request.args):
+        return
+    for inst_cmd in parameter_info[(service_request.id, service_request.type)][
+            'instrument_command']:
+        cmd_type = list(inst_cmd.keys())[0]
+        cmd = list(inst_cmd.values())[0]
+        cmd.format(*service_request.args)
+        if service_request.type == ParameterType.set:
+            shared_memory_setter[service_request.id]
+
+
+def compiled(service_request):
+    plan = plans.get((service_request.id, service_request.type))
+    if plan is None or plan.arity != len(service_request.args):
+        return
+    for cmd in plan.commands:
+        cmd.render(service_request.args)
+        cmd.memory_slot
+"""
+
+print(f'{"request":>8} {"per request [us]":>17} {"compiled [us]":>14} '
+      f'{"ratio":>6}')
+
+for request in ['get', 'set']:
+    per_request_time = timeit.timeit(f'per_request({request}_request)',
+                                     setup=SETUP,
+                                     number=NUMBER_OF_LOOPS) / NUMBER_OF_LOOPS
+    compiled_time = timeit.timeit(f'compiled({request}_request)',
+                                  setup=SETUP,
+                                  number=NUMBER_OF_LOOPS) / NUMBER_OF_LOOPS
+
+    print(f'{request:>8} {per_request_time * 1e6:>17.2f} '
+          f'{compiled_time * 1e6:>14.2f} '
+          f'{per_request_time / compiled_time:>6.1f}')
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""Cyclic TM parsing of the H8823 gateway telemetries at 10k lines/s"""
+
+import socket
+import threading
+import time
+
+from stringparser import Parser
+
+from mamba.core.context import Context
+from mamba.core.msg import ServiceResponse
+from mamba.core.parameter_store import ParameterStore
+from mamba.marketplace.components.spacewire_gateway.hvs_h8823_tmtc import \
+    H8823TmTcController, ThreadedCyclicTmHandler
+
+LINES_PER_SECOND = 10000
+DURATION = 3  # Seconds of telemetry stream
+NUMBER_OF_LINES = 50000  # Lines of the parsing capacity benchmark
+
+component = H8823TmTcController(Context())
+component.initialize()
+
+mapping = component._cyclic_tm_mapping
+parser = component._cyclic_tm_parser
+
+lines = [
+    tm_format.format('0 1 2 3') for tm_format in mapping.values()
+]
+
+
+def parse_per_line(line):
+    """ Previous parsing, a new parser of every format for every line """
+    values = []
+    for key, val in mapping.items():
+        try:
+            values.append((key, Parser(val)(line)))
+        except ValueError:
+            continue
+    return values
+
+
+print(f'{len(mapping)} telemetry formats')
+print(f'{"parsing":>12} {"lines/s":>10}')
+
+for name, parse in [('per line', parse_per_line),
+                    ('precompiled', parser.parse)]:
+    start = time.perf_counter()
+    for index in range(NUMBER_OF_LINES):
+        parse(lines[index % len(lines)])
+    elapsed = time.perf_counter() - start
+
+    print(f'{name:>12} {NUMBER_OF_LINES / elapsed:>10.0f}')
+
+# Stream of timestamped telemetry lines, paced to LINES_PER_SECOND
+context = Context()
+received = []
+context.rx['io_result'].subscribe(
+    lambda result: received.append(result)
+    if isinstance(result, ServiceResponse) else None)
+
+tm_socket, gateway_socket = socket.socketpair()
+cpu_time = []
+
+
+def handler():
+    start = time.thread_time()
+    ThreadedCyclicTmHandler(tm_socket, '\n', ParameterStore(), context.rx,
+                            lambda message: None, parser, 'gateway')
+    cpu_time.append(time.thread_time() - start)
+
+
+thread = threading.Thread(target=handler)
+thread.start()
+
+sent = 0
+start = time.perf_counter()
+
+while sent < LINES_PER_SECOND * DURATION:
+    # Send the lines due, in 1 ms batches
+    due = min(int((time.perf_counter() - start) * LINES_PER_SECOND),
+              LINES_PER_SECOND * DURATION)
+    if due > sent:
+        gateway_socket.sendall(''.join(
+            f'{time.time()} {lines[index % len(lines)]}\n'
+            for index in range(sent, due)).encode('utf-8'))
+        sent = due
+    time.sleep(0.001)
+
+gateway_socket.sendall(b'1 UNKNOWN_TM 0\n')
+time.sleep(0.5)
+gateway_socket.close()
+thread.join()
+
+print()
+print(f'{LINES_PER_SECOND} lines/s during {DURATION} s')
+print(f'{"sent":>8} {"parsed":>8} {"unparsed":>9} {"cpu":>6}')
+print(f'{sent:>8} {len(received):>8} {parser.unparsed:>9} '
+      f'{cpu_time[0] / DURATION:>6.0%}')
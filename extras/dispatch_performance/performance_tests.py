@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""io_service_request dispatch: broadcast filters vs provider routing"""
+
+import timeit
+
+NUMBER_OF_LOOPS = 10000
+NUMBER_OF_DRIVERS = [1, 10, 40, 100, 400]
+
+SETUP = """
+from rx import operators as op
+from mamba.core.subject_factory import RoutedSubject
+from mamba.core.msg import ServiceRequest, ParameterType
+
+subject = RoutedSubject()
+parameters = {{('idn', ParameterType.get): None}}
+
+for i in range({drivers}):
+    if {routed}:
+        subject.subscribe_route(f'driver_{{i}}', lambda value: None)
+    else:
+        subject.pipe(
+            op.filter(lambda value, name=f'driver_{{i}}': value.provider ==
+                      name and (value.id, value.type) in parameters)
+        ).subscribe(on_next=lambda value: None)
+
+request = ServiceRequest(provider='driver_0', id='idn',
+                         type=ParameterType.get)
+"""
+
+print(f'{"drivers":>8} {"filter [us]":>12} {"routed [us]":>12} {"ratio":>6}')
+
+for drivers in NUMBER_OF_DRIVERS:
+    filter_time = timeit.timeit(
+        'subject.on_next(request)',
+        setup=SETUP.format(drivers=drivers, routed=False),
+        number=NUMBER_OF_LOOPS) / NUMBER_OF_LOOPS
+    routed_time = timeit.timeit(
+        'subject.on_next(request)',
+        setup=SETUP.format(drivers=drivers, routed=True),
+        number=NUMBER_OF_LOOPS) / NUMBER_OF_LOOPS
+
+    print(f'{drivers:>8} {filter_time * 1e6:>12.2f} '
+          f'{routed_time * 1e6:>12.2f} {filter_time / routed_time:>6.1f}')
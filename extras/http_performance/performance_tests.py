@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""HTTP queries: connection per request vs keep-alive connection pool"""
+
+import http.client
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+from mamba.core.context import Context
+from mamba.core.msg import Empty
+from mamba.core.component_base.http_instrument_driver import \
+    HttpConnectionPool
+from mamba.marketplace.components.simulator.http_flask_server_sim import \
+    FlaskServerMock, app
+
+NUMBER_OF_QUERIES = 2000
+NUMBER_OF_CLIENTS = 4
+BATCH_SIZE = 10
+WERKZEUG_PORT = 9310
+KEEP_ALIVE_PORT = 9311
+
+
+def connection_per_request(port):
+    for _ in range(NUMBER_OF_QUERIES):
+        conn = http.client.HTTPConnection('localhost', port)
+        conn.request('GET', '/query?param=idn')
+        conn.getresponse().read()
+        conn.close()
+
+
+def pool(port, clients=1):
+    connection_pool = HttpConnectionPool('localhost', port, size=clients)
+
+    def client():
+        for _ in range(NUMBER_OF_QUERIES // clients):
+            connection_pool.request('GET', '/query?param=idn')
+
+    client_threads = [threading.Thread(target=client) for _ in range(clients)]
+    for client_thread in client_threads:
+        client_thread.start()
+    for client_thread in client_threads:
+        client_thread.join()
+
+    connection_pool.close()
+
+
+def batched_pool(port):
+    connection_pool = HttpConnectionPool('localhost', port)
+    params = '&'.join(['param=idn'] * BATCH_SIZE)
+
+    for _ in range(NUMBER_OF_QUERIES // BATCH_SIZE):
+        connection_pool.request('GET', f'/batch?{params}')
+
+    connection_pool.close()
+
+
+# Previous simulator server, closing every connection
+werkzeug_server = make_server('localhost', WERKZEUG_PORT, app, threaded=True)
+threading.Thread(target=werkzeug_server.serve_forever, daemon=True).start()
+
+context = Context()
+mock = FlaskServerMock(context,
+                       local_config={'instrument': {
+                           'port': KEEP_ALIVE_PORT
+                       }})
+mock.initialize()
+time.sleep(.1)
+
+print(f'{"mode":>36} {"queries/s":>10}')
+
+for name, benchmark in [
+    ('werkzeug, connection per request',
+     lambda: connection_per_request(WERKZEUG_PORT)),
+    ('keep-alive, connection per request',
+     lambda: connection_per_request(KEEP_ALIVE_PORT)),
+    ('keep-alive, pool', lambda: pool(KEEP_ALIVE_PORT)),
+    (f'keep-alive, pool x{NUMBER_OF_CLIENTS}',
+     lambda: pool(KEEP_ALIVE_PORT, NUMBER_OF_CLIENTS)),
+    (f'keep-alive, batches of {BATCH_SIZE}',
+     lambda: batched_pool(KEEP_ALIVE_PORT)),
+]:
+    start = time.perf_counter()
+    benchmark()
+    elapsed = time.perf_counter() - start
+
+    print(f'{name:>36} {NUMBER_OF_QUERIES / elapsed:>10.0f}')
+
+werkzeug_server.shutdown()
+context.rx['quit'].on_next(Empty())
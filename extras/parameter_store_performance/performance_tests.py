@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Shared memory contention: telemetry writers and request readers"""
+
+import threading
+import time
+
+from mamba.core.parameter_store import ParameterStore
+
+NUMBER_OF_PARAMETERS = 100
+DURATION = 2  # Seconds of each benchmark
+
+
+def write_cycles(memory, stop, counts, index):
+    """ Writer of cyclic telemetries, all parameters of a cycle together """
+    cycles = 0
+
+    while not stop.is_set():
+        cycles += 1
+        values = {f'tm_{key}': cycles for key in range(NUMBER_OF_PARAMETERS)}
+
+        if isinstance(memory, ParameterStore):
+            memory.update(values)
+        else:
+            for key, value in values.items():
+                memory[key] = value
+
+    counts[index] = cycles
+
+
+def read_cycles(memory, stop, counts, torn, index):
+    """ Reader of all the parameters, as a TM dump request """
+    reads = 0
+    torn_reads = 0
+
+    while not stop.is_set():
+        reads += 1
+
+        if isinstance(memory, ParameterStore):
+            values = memory.values_snapshot()
+        else:
+            values = dict(memory)
+
+        if len(set(values.values())) > 1:
+            torn_reads += 1
+
+    counts[index] = reads
+    torn[index] = torn_reads
+
+
+def benchmark(memory, writers, readers):
+    memory.update({f'tm_{key}': 0 for key in range(NUMBER_OF_PARAMETERS)})
+
+    stop = threading.Event()
+    writes = [0] * writers
+    reads = [0] * readers
+    torn = [0] * readers
+
+    threads = [
+        threading.Thread(target=write_cycles,
+                         args=(memory, stop, writes, index))
+        for index in range(writers)
+    ] + [
+        threading.Thread(target=read_cycles,
+                         args=(memory, stop, reads, torn, index))
+        for index in range(readers)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    time.sleep(DURATION)
+    stop.set()
+
+    for thread in threads:
+        thread.join()
+
+    return sum(writes) / DURATION, sum(reads) / DURATION, sum(torn)
+
+
+print(f'{NUMBER_OF_PARAMETERS} parameters written per cycle, '
+      f'{DURATION} s per benchmark')
+print(f'{"memory":>8} {"writers":>8} {"readers":>8} {"cycles/s":>10} '
+      f'{"reads/s":>10} {"torn":>8}')
+
+for writers, readers in [(1, 1), (1, 4), (4, 4), (4, 16)]:
+    for name, memory in [('dict', {}), ('store', ParameterStore())]:
+        cycles, reads, torn = benchmark(memory, writers, readers)
+
+        print(f'{name:>8} {writers:>8} {readers:>8} {cycles:>10.0f} '
+              f'{reads:>10.0f} {torn:>8}')
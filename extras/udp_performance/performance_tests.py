@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""UDP queries: socket per command vs persistent and tagged channels"""
+
+import socket
+import threading
+import time
+
+from mamba.core.context import Context
+from mamba.core.msg import Empty
+from mamba.core.component_base.udp_instrument_driver import \
+    UdpDatagramChannel, udp_raw_write, udp_raw_read
+from mamba.marketplace.components.simulator.udp_server_single_port_sim \
+    import SinglePortUdpMock
+
+NUMBER_OF_QUERIES = 5000
+NUMBER_OF_CLIENTS = 4
+ADDRESS = ('localhost', 8095)
+
+
+def socket_per_command():
+    for _ in range(NUMBER_OF_QUERIES):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(5)
+            sock.connect(ADDRESS)
+            udp_raw_write(sock, '*IDN?', '\r\n', 'utf-8')
+            udp_raw_read(sock, '\n', 'utf-8')
+
+
+def persistent_channel():
+    channel = UdpDatagramChannel(*ADDRESS, '\r\n', '\n', 'utf-8')
+    for _ in range(NUMBER_OF_QUERIES):
+        channel.query('*IDN?')
+    channel.close()
+
+
+def tagged_channel():
+    channel = UdpDatagramChannel(*ADDRESS,
+                                 '\r\n',
+                                 '\n',
+                                 'utf-8',
+                                 sequence_tag=True)
+
+    def client():
+        for _ in range(NUMBER_OF_QUERIES // NUMBER_OF_CLIENTS):
+            channel.query('*IDN?')
+
+    clients = [
+        threading.Thread(target=client) for _ in range(NUMBER_OF_CLIENTS)
+    ]
+    for client_thread in clients:
+        client_thread.start()
+    for client_thread in clients:
+        client_thread.join()
+
+    channel.close()
+
+
+context = Context()
+mock = SinglePortUdpMock(context)
+mock.initialize()
+time.sleep(.1)
+
+print(f'{"mode":>20} {"queries/s":>10}')
+
+for name, benchmark in [('socket per command', socket_per_command),
+                        ('persistent', persistent_channel),
+                        (f'tagged x{NUMBER_OF_CLIENTS}', tagged_channel)]:
+    start = time.perf_counter()
+    benchmark()
+    elapsed = time.perf_counter() - start
+
+    print(f'{name:>20} {NUMBER_OF_QUERIES / elapsed:>10.0f}')
+
+context.rx['quit'].on_next(Empty())
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""VISA trace transfer: ASCII query vs binary block query"""
+
+import os
+import tempfile
+import timeit
+
+import numpy
+import pyvisa
+
+NUMBER_OF_LOOPS = 3
+NUMBER_OF_POINTS = 100000
+ADDRESS = 'TCPIP0::1.2.3.4::INSTR'
+
+# Trace values whose float32 bytes are ASCII, the VISA sim files are text
+trace = numpy.resize(numpy.array([2.0, 2.5, 3.0], dtype='<f4'),
+                     NUMBER_OF_POINTS)
+block = trace.tobytes()
+header = f'#{len(str(len(block)))}{len(block)}'
+yaml_block = block.decode('ascii').replace('\0', '\\0')
+
+ascii_trace = ','.join(f'{value:.6e}' for value in trace)
+
+sim_file = os.path.join(tempfile.mkdtemp(), 'visa_sim.yml')
+with open(sim_file, 'w') as sim:
+    sim.write(f'''spec: "1.0"
+devices:
+  device 1:
+    eom:
+      TCPIP INSTR:
+        q: "\\r\\n"
+        r: "\\n"
+    dialogues:
+      - q: "TRAC:DATA? ASCII"
+        r: "{ascii_trace}"
+      - q: "TRAC:DATA? REAL"
+        r: "{header}{yaml_block}"
+resources:
+  {ADDRESS}:
+    device: device 1
+''')
+
+inst = pyvisa.ResourceManager(f'{sim_file}@sim').open_resource(
+    ADDRESS, read_termination='\n', write_termination='\r\n')
+
+ascii_time = timeit.timeit(
+    lambda: numpy.array(
+        inst.query('TRAC:DATA? ASCII').split(','), dtype=numpy.float32),
+    number=NUMBER_OF_LOOPS) / NUMBER_OF_LOOPS
+
+binary_time = timeit.timeit(
+    lambda: inst.query_binary_values(
+        'TRAC:DATA? REAL', datatype='f', container=numpy.array),
+    number=NUMBER_OF_LOOPS) / NUMBER_OF_LOOPS
+
+assert numpy.array_equal(
+    inst.query_binary_values('TRAC:DATA? REAL',
+                             datatype='f',
+                             container=numpy.array), trace)
+
+print(f'{NUMBER_OF_POINTS} points trace, '
+      f'{len(ascii_trace)} bytes ASCII, {len(block)} bytes binary')
+print(f'ASCII query:  {ascii_time * 1e3:8.1f} ms')
+print(f'Binary query: {binary_time * 1e3:8.1f} ms')
+print(f'Ratio:        {ascii_time / binary_time:8.1f}')
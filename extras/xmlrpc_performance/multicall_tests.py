@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""XMLRPC command plans: one call per command vs system.multicall"""
+
+import time
+import xmlrpc.client
+
+from mamba.core.context import Context
+from mamba.marketplace.components.simulator.xmlrpc_server_sim import \
+    XmlRpcMock
+
+NUMBER_OF_PLANS = 1000
+PLAN = [('write', 'parameter_1 5'), ('query', 'parameter_2'),
+        ('query', 'parameter_1')]
+
+
+def one_call_per_command(port):
+    with xmlrpc.client.ServerProxy(f'http://localhost:{port}') as client:
+        for _ in range(NUMBER_OF_PLANS):
+            for kind, command in PLAN:
+                getattr(client, kind)(command)
+
+
+def multicall(port):
+    with xmlrpc.client.ServerProxy(f'http://localhost:{port}') as client:
+        for _ in range(NUMBER_OF_PLANS):
+            calls = xmlrpc.client.MultiCall(client)
+            for kind, command in PLAN:
+                getattr(calls, kind)(command)
+            tuple(calls())
+
+
+context = Context()
+for port, threaded in [(8910, False), (8911, True)]:
+    XmlRpcMock(context,
+               local_config={
+                   'instrument': {
+                       'port': port,
+                       'threaded': threaded
+                   }
+               }).initialize()
+
+print(f'{"mode":>36} {"plans/s":>8}')
+
+for name, benchmark in [
+    ('single thread server, call per cmd', lambda: one_call_per_command(8910)),
+    ('single thread server, multicall', lambda: multicall(8910)),
+    ('keep-alive server, call per cmd', lambda: one_call_per_command(8911)),
+    ('keep-alive server, multicall', lambda: multicall(8911)),
+]:
+    start = time.perf_counter()
+    benchmark()
+    elapsed = time.perf_counter() - start
+
+    print(f'{name:>36} {NUMBER_OF_PLANS / elapsed:>8.0f}')
@@ -0,0 +1,119 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" Mamba server telemetry archive export command """
+
+from os.path import isdir
+
+import numpy
+
+from mamba.commands import MambaCommand
+from mamba.core.telemetry_archive import TelemetryArchive
+
+EXPORT_FORMATS = ['csv', 'npz']
+
+
+class Command(MambaCommand):
+    """ Mamba server telemetry archive export command """
+    @staticmethod
+    def short_desc():
+        return "Export a time range of the telemetry archive"
+
+    @staticmethod
+    def add_arguments(parser):
+        MambaCommand.add_arguments(parser)
+
+        parser.add_argument("archive", help="Telemetry archive folder.")
+
+        parser.add_argument("-p",
+                            "--provider",
+                            dest="provider",
+                            help="Export only the parameters of a provider.")
+
+        parser.add_argument("-i",
+                            "--parameter",
+                            dest="parameter",
+                            help="Export only a parameter.")
+
+        parser.add_argument("--start",
+                            dest="start",
+                            type=float,
+                            help="Start of the range, in seconds since the "
+                            "epoch.")
+
+        parser.add_argument("--end",
+                            dest="end",
+                            type=float,
+                            help="End of the range, in seconds since the "
+                            "epoch.")
+
+        parser.add_argument("-f",
+                            "--format",
+                            dest="format",
+                            choices=EXPORT_FORMATS,
+                            default='csv',
+                            help="Output format.")
+
+        parser.add_argument("-o",
+                            "--output",
+                            dest="output",
+                            help="Output file. By default the CSV is "
+                            "printed on the console.")
+
+    @staticmethod
+    def run(args, mamba_dir, project_dir):
+        if not isdir(args.archive):
+            print(f'Unable to find telemetry archive: {args.archive}')
+            return 1
+
+        archive = TelemetryArchive(args.archive)
+
+        parameters = [
+            (provider, parameter)
+            for provider, parameter in archive.parameters()
+            if args.provider in [None, provider] and args.parameter in
+            [None, parameter]
+        ]
+
+        if len(parameters) == 0:
+            print('No archived parameter matches the selection')
+            return 1
+
+        samples = {
+            key: archive.read(*key, start=args.start, end=args.end)
+            for key in parameters
+        }
+
+        if args.format == 'npz':
+            if args.output is None:
+                print('The npz format requires an output file')
+                return 1
+
+            arrays = {}
+            for (provider, parameter), (timestamps, values) in \
+                    samples.items():
+                arrays[f'{provider}.{parameter}.time'] = timestamps
+                arrays[f'{provider}.{parameter}.value'] = values
+
+            numpy.savez(args.output, **arrays)
+        else:
+            lines = ['timestamp,provider,parameter,value']
+            for (provider, parameter), (timestamps, values) in \
+                    samples.items():
+                lines += [
+                    f'{timestamp!r},{provider},{parameter},{value!r}'
+                    for timestamp, value in zip(timestamps.tolist(),
+                                                values.tolist())
+                ]
+
+            if args.output is None:
+                print('\n'.join(lines))
+            else:
+                with open(args.output, 'w') as output:
+                    output.write('\n'.join(lines) + '\n')
+
+        return 0
@@ -7,15 +7,22 @@
 ############################################################################
 
 import os
+import time
+import heapq
+import threading
+from collections import OrderedDict
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 from mamba.core.context import Context
 from mamba.core.msg import ServiceResponse,\
-    ServiceRequest, ParameterInfo, ParameterType
+    ServiceRequest, ParameterInfo, ParameterType, Empty
 from mamba.core.component_base import Component
 from mamba.core.exceptions import ComponentConfigException
 
+# Number of expired requests remembered to identify their late results
+EXPIRED_REQUESTS_HISTORY = 1024
+
 
 class MambaProtocolController(Component):
     def __init__(self,
@@ -28,7 +35,17 @@ class MambaProtocolController(Component):
 
         # Define custom variables
         self._provider_params: Dict[tuple, ParameterInfo] = {}
-        self._io_result_subs = None
+
+        # Table of in-flight IO service requests, by request identifier
+        self._pending_requests: Dict[int, ServiceRequest] = {}
+        self._pending_deadlines: List[Tuple[float, int]] = []
+        self._pending_condition = threading.Condition()
+        self._expired_requests: 'OrderedDict[int, str]' = OrderedDict()
+        self._timeout_thread: Optional[threading.Thread] = None
+        self._closing = False
+
+        self._request_timeout: Optional[float] = self._configuration.get(
+            'request_timeout')
 
     def _register_observers(self) -> None:
         """ Entry point for registering component observers """
@@ -40,6 +57,23 @@ class MambaProtocolController(Component):
         self._context.rx['io_service_signature'].subscribe(
             on_next=self._io_service_signature)
 
+        # Register to the results of the IO services
+        self._context.rx['io_result'].subscribe(
+            on_next=self._process_io_result)
+
+        # Quit is sent to command App finalization
+        self._context.rx['quit'].subscribe(on_next=self._close)
+
+    def _close(self, rx_value: Optional[Empty] = None) -> None:
+        """ Entry point for closing application
+
+            Args:
+                rx_value: The value published by the subject.
+        """
+        with self._pending_condition:
+            self._closing = True
+            self._pending_condition.notify()
+
     def _generate_tm(self, telecommand: ServiceRequest,
                      param_type: ParameterType) -> None:
         """ Entry point for generating response telemetry
@@ -85,17 +119,84 @@ class MambaProtocolController(Component):
                 telecommand: The service request received.
         """
 
-        self._io_result_subs = self._context.rx['io_result'].subscribe(
-            on_next=self._process_io_result)
-
-        self._context.rx['io_service_request'].on_next(
-            ServiceRequest(
-                provider=self._provider_params[(telecommand.id,
-                                                telecommand.type)].provider,
-                id=self._provider_params[(telecommand.id,
-                                          telecommand.type)].id,
-                type=telecommand.type,
-                args=telecommand.args))
+        # The deadline of the telecommand, if set by the client, is
+        # shortened to the request timeout
+        deadline = telecommand.deadline
+
+        if self._request_timeout is not None:
+            timeout_deadline = time.monotonic() + self._request_timeout
+            deadline = timeout_deadline if deadline is None else min(
+                deadline, timeout_deadline)
+
+        io_service_request = ServiceRequest(
+            provider=self._provider_params[(telecommand.id,
+                                            telecommand.type)].provider,
+            id=self._provider_params[(telecommand.id, telecommand.type)].id,
+            type=telecommand.type,
+            args=telecommand.args,
+            deadline=deadline)
+
+        # The request shall be pending before being published, as the
+        # result can be generated synchronously
+        with self._pending_condition:
+            self._pending_requests[
+                io_service_request.request_id] = telecommand
+
+            if deadline is not None:
+                heapq.heappush(self._pending_deadlines,
+                               (deadline, io_service_request.request_id))
+                self._start_timeout_thread()
+                self._pending_condition.notify()
+
+        self._context.rx['io_service_request'].on_next(io_service_request)
+
+    def _start_timeout_thread(self) -> None:
+        """ Start the thread expiring the unanswered requests, if it is not
+            already running.
+        """
+        if self._timeout_thread is None:
+            self._timeout_thread = threading.Thread(
+                target=self._expire_pending_requests)
+            self._timeout_thread.daemon = True
+            self._timeout_thread.start()
+
+    def _expire_pending_requests(self) -> None:
+        """ Loop answering with an error telemetry the requests that have
+            not been answered before their deadline.
+        """
+        while True:
+            expired = []
+
+            with self._pending_condition:
+                while not self._closing:
+                    now = time.monotonic()
+
+                    while len(self._pending_deadlines
+                              ) > 0 and self._pending_deadlines[0][0] <= now:
+                        _, request_id = heapq.heappop(self._pending_deadlines)
+                        telecommand = self._pending_requests.pop(
+                            request_id, None)
+                        if telecommand is not None:
+                            expired.append(telecommand)
+                            self._expired_requests[request_id] = \
+                                telecommand.id
+                            if len(self._expired_requests
+                                   ) > EXPIRED_REQUESTS_HISTORY:
+                                self._expired_requests.popitem(last=False)
+
+                    if len(expired) > 0:
+                        break
+
+                    self._pending_condition.wait(
+                        self._pending_deadlines[0][0] -
+                        now if len(self._pending_deadlines) > 0 else None)
+
+                if self._closing:
+                    return
+
+            for telecommand in expired:
+                self._log_error(f'Request timeout: {telecommand.id}')
+                self._generate_error_tm(telecommand, 'Timeout')
 
     def _received_tc(self, telecommand: ServiceRequest) -> None:
         """ Entry point for processing a new telecommand coming from the
@@ -137,10 +238,21 @@ class MambaProtocolController(Component):
             Args:
                 rx_result: The io service response.
         """
-        if self._io_result_subs is not None:
-            self._io_result_subs.dispose()
-
-        self._context.rx['tm'].on_next(rx_result)
+        with self._pending_condition:
+            telecommand = self._pending_requests.pop(rx_result.request_id,
+                                                     None)
+            expired_id = None if telecommand is not None else \
+                self._expired_requests.pop(rx_result.request_id, None)
+
+        # Results of unknown, expired or unsolicited requests are discarded
+        if telecommand is not None:
+            self._context.rx['tm'].on_next(rx_result)
+        elif expired_id is not None:
+            self._log_warning(f'Discarded late result of expired request '
+                              f'{rx_result.request_id}: {expired_id}')
+        elif rx_result.request_id is not None:
+            self._log_dev(f'Discarded result of unknown request '
+                          f'{rx_result.request_id}: {rx_result.id}')
 
     def _io_service_signature(self,
                               parameters_info: List[ParameterInfo]) -> None:
@@ -12,6 +12,8 @@ import time
 
 from typing import Optional
 
+import numpy
+
 from mamba.core.context import Context
 from mamba.core.msg import Raw, ServiceRequest, ServiceResponse, ParameterType
 from mamba.core.component_base import Component
@@ -24,6 +26,10 @@ class HvsProtocolTranslator(Component):
                  local_config: Optional[dict] = None) -> None:
         super().__init__(os.path.dirname(__file__), context, local_config)
 
+        # Time in seconds to answer a telecommand, if limited
+        self._request_timeout: Optional[float] = self._configuration.get(
+            'request_timeout')
+
         # Initialize observers
         self._register_observers()
 
@@ -43,6 +49,10 @@ class HvsProtocolTranslator(Component):
                                          the socket.
         """
         self._log_dev('Received Raw TC')
+
+        deadline = None if self._request_timeout is None else \
+            time.monotonic() + float(self._request_timeout)
+
         for telecommand in raw_tc.msg.replace('"', '').split('\r\n')[:-1]:
             tc_list = telecommand.rstrip().split(' ')
             self._log_dev('Published TC')
@@ -50,7 +60,8 @@ class HvsProtocolTranslator(Component):
                 ServiceRequest(id=tc_list[1],
                                args=tc_list[2:],
                                type=ParameterType[tc_list[0].replace(
-                                   'tc', 'set').replace('tm', 'get')]))
+                                   'tc', 'set').replace('tm', 'get')],
+                               deadline=deadline))
 
     def _received_tm(self, telemetry: ServiceResponse) -> None:
         """ Entry point for processing a new telemetry generated by the
@@ -64,8 +75,18 @@ class HvsProtocolTranslator(Component):
         if telemetry.type == ParameterType.set:
             raw_tm = f"> OK {telemetry.id}\r\n"
         elif telemetry.type == ParameterType.get:
-            raw_tm = f"> OK {telemetry.id};{time.time()};{telemetry.value};" \
-                     f"{telemetry.value};0;1\r\n"
+            value = telemetry.value
+            if isinstance(value, numpy.ndarray) and value.ndim > 1:
+                # Rows separated by commas, row elements by spaces
+                value = ','.join(' '.join(map(str, row))
+                                 for row in value.tolist())
+            elif isinstance(value, numpy.ndarray):
+                # All the elements in a single line, NumPy would summarize
+                # and wrap them
+                value = ','.join(map(str, value.tolist()))
+
+            raw_tm = f"> OK {telemetry.id};{time.time()};{value};" \
+                     f"{value};0;1\r\n"
         elif telemetry.type == ParameterType.set_meta:
             raw_tm = f"> OK {telemetry.id};" \
                      f"{len(telemetry.value['signature'][0])};" \
@@ -0,0 +1,345 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" Cyclic polling of the get parameters """
+
+import os
+import time
+import heapq
+import threading
+
+from typing import Optional, Dict, List, Tuple
+
+from mamba.core.context import Context
+from mamba.core.component_base import Component
+from mamba.core.exceptions import ComponentConfigException
+from mamba.core.msg import ParameterInfo, ParameterType, ServiceRequest, \
+    ServiceResponse, Empty
+
+# Fraction of the period between the phases of consecutive polls. The
+# golden ratio spreads the polls evenly, whatever the number of parameters.
+PHASE_STEP = 0.6180339887498949
+
+SUBSCRIPTION_SIGNATURE = [[{
+    'provider': {
+        'type': 'str'
+    }
+}, {
+    'parameter': {
+        'type': 'str'
+    }
+}, {
+    'period': {
+        'type': 'float'
+    }
+}], None]
+
+
+class _Poll:
+    """ Polling state of a parameter """
+    def __init__(self, period: float) -> None:
+        # Fastest of the periods requested by the subscribers
+        self.period = period
+
+        # Incremented on rescheduling, to discard the outdated schedule
+        self.version = 0
+
+        # Last poll waiting for its result, and when it was sent
+        self.request_id: Optional[int] = None
+        self.sent = 0.0
+
+
+class ParameterPoller(Component):
+    """ Polls the get parameters at the rates declared in the
+        configuration or requested by the subscribers.
+
+        The subscriptions to the same parameter are merged into one poll,
+        at the fastest requested rate. The results are published by the
+        providers on io_result, as for any other request.
+    """
+    def __init__(self,
+                 context: Context,
+                 local_config: Optional[dict] = None) -> None:
+        super().__init__(os.path.dirname(__file__), context, local_config)
+
+        self._min_period = float(self._configuration.get('min_period', 0))
+        self._poll_timeout = float(
+            self._configuration.get('poll_timeout', 5))
+
+        # Get parameters published by the providers
+        self._parameters = set()
+
+        # Number of subscriptions of each parameter, by requested period
+        self._subscriptions: Dict[Tuple[str, str], Dict[float, int]] = {}
+
+        # Polled parameters, and schedule of their next poll
+        self._polls: Dict[Tuple[str, str], _Poll] = {}
+        self._schedule: List[Tuple[float, Tuple[str, str], int]] = []
+        self._phase = 0.0
+
+        # Parameter of each poll waiting for its result
+        self._in_flight: Dict[int, Tuple[str, str]] = {}
+
+        self._polls_skipped = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+
+        self._register_observers()
+
+    def _register_observers(self) -> None:
+        """ Entry point for registering component observers """
+        self._context.rx['io_service_signature'].subscribe(
+            on_next=self._io_service_signature)
+
+        self._context.rx['io_result'].subscribe(
+            on_next=self._process_io_result)
+
+        self._context.rx['quit'].subscribe(on_next=self._close)
+
+    def initialize(self) -> None:
+        for poll in self._configuration.get('polls') or []:
+            try:
+                key = (poll['provider'], poll['parameter'])
+                period = float(poll['period'])
+            except (KeyError, TypeError, ValueError):
+                raise ComponentConfigException(
+                    f'In service {self._name}: poll {poll} shall have a '
+                    f'provider, a parameter and a numeric period')
+
+            if period <= 0:
+                raise ComponentConfigException(
+                    f'In service {self._name}: poll period of {key[0]} -> '
+                    f'"{key[1]}" shall be positive')
+
+            self._subscribe(key, period)
+
+        self._context.rx['io_service_signature'].on_next([
+            ParameterInfo(provider=self._name,
+                          param_id='subscribe',
+                          param_type=ParameterType.set,
+                          signature=SUBSCRIPTION_SIGNATURE,
+                          description='Poll a parameter with a period in '
+                          'seconds'),
+            ParameterInfo(provider=self._name,
+                          param_id='unsubscribe',
+                          param_type=ParameterType.set,
+                          signature=SUBSCRIPTION_SIGNATURE,
+                          description='Cancel a subscription to a '
+                          'parameter'),
+            ParameterInfo(provider=self._name,
+                          param_id='polls',
+                          param_type=ParameterType.get,
+                          signature=[[], 'str'],
+                          description='Polled parameters, with their '
+                          'period in seconds'),
+            ParameterInfo(provider=self._name,
+                          param_id='polls_skipped',
+                          param_type=ParameterType.get,
+                          signature=[[], 'float'],
+                          description='Number of polls skipped because the '
+                          'previous poll was waiting for its result')
+        ])
+
+        # Subscribe to the services request addressed to this provider
+        self._context.rx['io_service_request'].subscribe_route(
+            self._name, self._run_command)
+
+    def _close(self, rx_value: Optional[Empty] = None) -> None:
+        """ Entry point for closing the component """
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+
+    def _io_service_signature(self,
+                              parameters_info: List[ParameterInfo]) -> None:
+        """ Entry point for processing the service signatures """
+        for parameter_info in parameters_info:
+            if parameter_info.type == ParameterType.get:
+                self._parameters.add(
+                    (parameter_info.provider, parameter_info.id))
+
+    def _run_command(self, service_request: ServiceRequest) -> None:
+        self._log_dev(f"Received service request: {service_request.id}")
+
+        result = ServiceResponse(provider=self._name,
+                                 id=service_request.id,
+                                 type=service_request.type,
+                                 request_id=service_request.request_id)
+
+        if service_request.type == ParameterType.get:
+            if service_request.id == 'polls':
+                with self._condition:
+                    result.value = ','.join(
+                        f'{key[0]} {key[1]} {poll.period}'
+                        for key, poll in sorted(self._polls.items()))
+            elif service_request.id == 'polls_skipped':
+                result.value = self._polls_skipped
+            else:
+                return
+        elif service_request.type == ParameterType.set and \
+                service_request.id in ['subscribe', 'unsubscribe']:
+            error = self._update_subscription(service_request)
+
+            if error is not None:
+                result.type = ParameterType.error
+                result.value = error
+                self._log_error(error)
+        else:
+            return
+
+        self._context.rx['io_result'].on_next(result)
+
+    def _update_subscription(self,
+                             service_request: ServiceRequest) -> Optional[str]:
+        """ Add or cancel the subscription of a service request.
+
+            Returns:
+                The error message, if the subscription is not valid.
+        """
+        if len(service_request.args) != 3:
+            return 'Wrong number of arguments, expected: provider ' \
+                   'parameter period'
+
+        key = (service_request.args[0], service_request.args[1])
+
+        try:
+            period = float(service_request.args[2])
+        except ValueError:
+            return f'Period shall be numeric: {service_request.args[2]}'
+
+        if service_request.id == 'unsubscribe':
+            if not self._unsubscribe(key, period):
+                return f'No subscription to {key[0]} -> "{key[1]}" ' \
+                       f'with period {period}'
+        elif key not in self._parameters:
+            return f'Unknown get parameter {key[0]} -> "{key[1]}"'
+        elif period < self._min_period or period <= 0:
+            return f'Period shall not be lower than {self._min_period}'
+        else:
+            self._subscribe(key, period)
+
+        return None
+
+    def _subscribe(self, key: Tuple[str, str], period: float) -> None:
+        with self._condition:
+            periods = self._subscriptions.setdefault(key, {})
+            periods[period] = periods.get(period, 0) + 1
+            self._reschedule(key)
+
+    def _unsubscribe(self, key: Tuple[str, str], period: float) -> bool:
+        with self._condition:
+            periods = self._subscriptions.get(key) or {}
+
+            if period not in periods:
+                return False
+
+            periods[period] -= 1
+            if periods[period] == 0:
+                del periods[period]
+            if len(periods) == 0:
+                del self._subscriptions[key]
+
+            self._reschedule(key)
+            return True
+
+    def _reschedule(self, key: Tuple[str, str]) -> None:
+        """ Schedule a parameter at the fastest period of its subscriptions.
+            Shall be called with the condition acquired.
+        """
+        periods = self._subscriptions.get(key)
+
+        if not periods:
+            self._polls.pop(key, None)
+            return
+
+        period = min(periods)
+        poll = self._polls.get(key)
+
+        if poll is not None and poll.period == period:
+            return
+
+        if poll is None:
+            poll = self._polls[key] = _Poll(period)
+        else:
+            poll.period = period
+            poll.version += 1
+
+        # Spread the first poll of each parameter over the period, to avoid
+        # bursts of requests to the providers
+        self._phase = (self._phase + PHASE_STEP) % 1
+        heapq.heappush(self._schedule,
+                       (time.monotonic() + self._phase * period, key,
+                        poll.version))
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._poll_loop)
+            self._thread.daemon = True
+            self._thread.start()
+
+        self._condition.notify()
+
+    def _poll_loop(self) -> None:
+        """ Loop publishing the service requests of the polls when due """
+        while True:
+            requests = []
+
+            with self._condition:
+                while not self._closing:
+                    now = time.monotonic()
+
+                    while len(self._schedule
+                              ) > 0 and self._schedule[0][0] <= now:
+                        due, key, version = heapq.heappop(self._schedule)
+                        poll = self._polls.get(key)
+
+                        if poll is None or poll.version != version:
+                            continue
+
+                        # Keep the phase, unless the poll is late by more
+                        # than a period
+                        heapq.heappush(self._schedule,
+                                       (max(due + poll.period, now), key,
+                                        version))
+
+                        if poll.request_id is not None and \
+                                now - poll.sent < self._poll_timeout:
+                            self._polls_skipped += 1
+                            continue
+
+                        request = ServiceRequest(provider=key[0],
+                                                 id=key[1],
+                                                 type=ParameterType.get,
+                                                 args=[])
+
+                        self._in_flight.pop(poll.request_id, None)
+                        self._in_flight[request.request_id] = key
+                        poll.request_id = request.request_id
+                        poll.sent = now
+                        requests.append(request)
+
+                    if len(requests) > 0:
+                        break
+
+                    self._condition.wait(
+                        self._schedule[0][0] -
+                        now if len(self._schedule) > 0 else None)
+
+                if self._closing:
+                    return
+
+            for request in requests:
+                self._context.rx['io_service_request'].on_next(request)
+
+    def _process_io_result(self, rx_result: ServiceResponse) -> None:
+        """ Entry point for processing the IO Service results """
+        with self._condition:
+            key = self._in_flight.pop(rx_result.request_id, None)
+            poll = self._polls.get(key) if key is not None else None
+
+            if poll is not None and poll.request_id == rx_result.request_id:
+                poll.request_id = None
@@ -9,8 +9,6 @@
 import os
 from typing import Optional
 
-from rx import operators as op
-
 from mamba.core.context import Context
 from mamba.core.component_base import Component
 from mamba.core.msg import ParameterInfo, ParameterType, ServiceRequest, Empty
@@ -31,12 +29,14 @@ class RemoteShutdown(Component):
                           description='Shutdown Mamba Server')
         ])
 
-        # Subscribe to the services request
-        self._context.rx['io_service_request'].pipe(
-            op.filter(lambda value: value.provider == self._name and value.id
-                      == 'shutdown' and value.type == ParameterType.set)
-        ).subscribe(on_next=self._run_command)
+        # Subscribe to the services request addressed to this provider
+        self._context.rx['io_service_request'].subscribe_route(
+            self._name, self._run_command)
 
     def _run_command(self, service_request: ServiceRequest) -> None:
+        if service_request.id != 'shutdown' or \
+                service_request.type != ParameterType.set:
+            return
+
         self._log_dev(f"Received service request: {service_request.id}")
         self._context.rx['quit'].on_next(Empty())
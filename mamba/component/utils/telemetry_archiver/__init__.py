@@ -0,0 +1,149 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" Archive of the telemetry samples on disk """
+
+import os
+import time
+
+from typing import Optional, Set, Tuple
+
+from mamba.core.context import Context
+from mamba.core.component_base import Component
+from mamba.core.exceptions import ComponentConfigException
+from mamba.core.telemetry_archive import ArchiveWriter
+from mamba.core.msg import ParameterInfo, ParameterType, ServiceRequest, \
+    ServiceResponse, Empty
+
+
+class TelemetryArchiver(Component):
+    """ Archives the numeric results of the get parameters published on
+        io_result, and every cyclic telemetry sample published on
+        io_result_raw, in an append-only archive.
+
+        The samples are queued and written by a background thread, the
+        publishers are never blocked by the disk.
+    """
+    def __init__(self,
+                 context: Context,
+                 local_config: Optional[dict] = None) -> None:
+        super().__init__(os.path.dirname(__file__), context, local_config)
+
+        try:
+            chunk_samples = int(self._configuration['chunk_samples'])
+            fsync_interval = float(self._configuration['fsync_interval'])
+            max_pending = int(self._configuration['max_pending'])
+        except (TypeError, ValueError):
+            raise ComponentConfigException(
+                f'In service {self._name}: chunk_samples, fsync_interval '
+                f'and max_pending shall be numeric')
+
+        if chunk_samples <= 0 or fsync_interval <= 0 or max_pending <= 0:
+            raise ComponentConfigException(
+                f'In service {self._name}: chunk_samples, fsync_interval '
+                f'and max_pending shall be positive')
+
+        # Archived parameters, all if None
+        self._parameters: Optional[Set[Tuple[str, str]]] = None
+
+        if self._configuration.get('parameters'):
+            try:
+                self._parameters = {
+                    (parameter['provider'], parameter['parameter'])
+                    for parameter in self._configuration['parameters']
+                }
+            except (KeyError, TypeError):
+                raise ComponentConfigException(
+                    f'In service {self._name}: archived parameters shall '
+                    f'have a provider and a parameter')
+
+        directory = self._configuration['directory']
+        if not os.path.isabs(directory):
+            directory = os.path.join(
+                context.get('project_dir') or os.getcwd(), directory)
+
+        self._writer = ArchiveWriter(directory,
+                                     chunk_samples=chunk_samples,
+                                     fsync_interval=fsync_interval,
+                                     max_pending=max_pending)
+
+        # Providers of cyclic telemetry, archived from io_result_raw
+        self._raw_providers: Set[str] = set()
+
+        self._register_observers()
+
+    def _register_observers(self) -> None:
+        """ Entry point for registering component observers """
+        self._context.rx['io_result'].subscribe(
+            on_next=self._process_io_result)
+
+        self._context.rx['io_result_raw'].subscribe(
+            on_next=self._process_raw_result)
+
+        self._context.rx['quit'].subscribe(on_next=self._close)
+
+    def initialize(self) -> None:
+        self._writer.start()
+
+        self._context.rx['io_service_signature'].on_next([
+            ParameterInfo(provider=self._name,
+                          param_id='archive_status',
+                          param_type=ParameterType.get,
+                          signature=[[], 'str'],
+                          description='Number of samples written, dropped '
+                          'by a full queue, and rejected as not numeric')
+        ])
+
+        # Subscribe to the services request addressed to this provider
+        self._context.rx['io_service_request'].subscribe_route(
+            self._name, self._run_command)
+
+    def _close(self, rx_value: Optional[Empty] = None) -> None:
+        """ Entry point for closing the component """
+        self._writer.close()
+
+    def _run_command(self, service_request: ServiceRequest) -> None:
+        self._log_dev(f"Received service request: {service_request.id}")
+
+        if service_request.type != ParameterType.get or \
+                service_request.id != 'archive_status':
+            return
+
+        self._context.rx['io_result'].on_next(
+            ServiceResponse(provider=self._name,
+                            id=service_request.id,
+                            type=service_request.type,
+                            value=f'{self._writer.written} '
+                            f'{self._writer.dropped} '
+                            f'{self._writer.rejected}',
+                            request_id=service_request.request_id))
+
+    def _process_io_result(self, rx_result: ServiceResponse) -> None:
+        """ Entry point for processing the IO Service results """
+        # Unsolicited results of the cyclic telemetry providers are
+        # archived from io_result_raw, with their undecimated samples
+        if rx_result.request_id is None and \
+                rx_result.provider in self._raw_providers:
+            return
+
+        self._archive(rx_result)
+
+    def _process_raw_result(self, rx_result: ServiceResponse) -> None:
+        """ Entry point for processing the received cyclic telemetry """
+        self._raw_providers.add(rx_result.provider)
+        self._archive(rx_result)
+
+    def _archive(self, rx_result: ServiceResponse) -> None:
+        if rx_result.type != ParameterType.get or rx_result.value is None:
+            return
+
+        if self._parameters is not None and (
+                rx_result.provider, rx_result.id) not in self._parameters:
+            return
+
+        self._writer.append(time.time(), rx_result.provider, rx_result.id,
+                            rx_result.value)
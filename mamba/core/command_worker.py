@@ -0,0 +1,188 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" Bounded priority queue of commands, executed by a worker thread """
+
+from typing import Optional, Dict, Callable, Any
+import itertools
+import threading
+import queue
+import time
+
+from mamba.core.exceptions import ComponentConfigException
+from mamba.core.msg import ServiceRequest
+
+FULL_POLICIES = ['reject', 'block']
+DEFAULT_PRIORITY = 1
+
+# Period in seconds blocked requesters check if the worker is stopped
+BLOCK_POLL_PERIOD = 0.1
+
+# Weight of the last wait in the moving average of waits
+WAIT_AVERAGE_WEIGHT = 0.1
+
+# Sentinel to stop the worker thread, it has precedence over any command
+_STOP = (-1, -1, 0.0, None)
+
+
+class CommandWorker:
+    """ Executes service requests in a dedicated thread, in order of
+    priority and, for the same priority, in order of arrival.
+
+    Args:
+        handler: Function executing a service request.
+        on_rejected: Function called with the requests that do not fit in
+                     the queue, when the full policy is 'reject'.
+        queue_size: Maximum number of queued requests. 0 means unbounded.
+        full_policy: 'reject' the new request or 'block' the requester
+                     until there is room in the queue.
+        priorities: Priority of each service id. Lower values are executed
+                    first.
+        name: Name of the worker thread.
+        on_metrics: Function called with the worker every time its queue
+                    metrics change.
+    """
+    def __init__(self,
+                 handler: Callable[[ServiceRequest], None],
+                 on_rejected: Callable[[ServiceRequest], None],
+                 queue_size: int = 0,
+                 full_policy: str = 'reject',
+                 priorities: Optional[Dict[str, int]] = None,
+                 name: Optional[str] = None,
+                 on_metrics: Optional[Callable[['CommandWorker'],
+                                               None]] = None) -> None:
+        if full_policy not in FULL_POLICIES:
+            raise ComponentConfigException(
+                f'Command queue full policy "{full_policy}" is not valid. '
+                f'Valid policies are: {FULL_POLICIES}')
+
+        self._handler = handler
+        self._on_rejected = on_rejected
+        self._on_metrics = on_metrics
+        self._metrics_lock = threading.Lock()
+        self._full_policy = full_policy
+        self._priorities = priorities or {}
+        self._queue: queue.PriorityQueue = queue.PriorityQueue(queue_size)
+        self._sequence = itertools.count()
+        self._thread = threading.Thread(target=self._run, name=name)
+        self._thread.daemon = True
+        self._running = False
+
+        # Queue metrics. Waits are the time in seconds the executed
+        # requests waited in the queue
+        self.queue_length: int = 0
+        self.last_wait: float = 0.0
+        self.max_wait: float = 0.0
+        self.average_wait: float = 0.0
+        self.rejected: int = 0
+
+    def start(self) -> None:
+        """ Start the worker thread """
+        self._running = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        """ Stop the worker thread. Queued requests are discarded, and
+        requesters blocked by a full queue are released.
+        """
+        self._running = False
+
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+
+        try:
+            self._queue.put_nowait(_STOP)
+        except queue.Full:
+            pass  # The worker will stop after the request in process
+
+    def qsize(self) -> int:
+        """ Number of requests waiting in the queue """
+        return self._queue.qsize()
+
+    def submit(self, service_request: ServiceRequest) -> None:
+        """ Queue a service request for its execution.
+
+        Args:
+            service_request: The service request to be executed.
+        """
+        item = (self._priorities.get(service_request.id, DEFAULT_PRIORITY),
+                next(self._sequence), time.monotonic(), service_request)
+
+        queued = self._put(item)
+
+        with self._metrics_lock:
+            if not queued:
+                self.rejected += 1
+            self._update_metrics()
+
+        if not queued:
+            self._on_rejected(service_request)
+
+    def _put(self, item: tuple) -> bool:
+        if self._full_policy != 'block':
+            try:
+                self._queue.put_nowait(item)
+                return True
+            except queue.Full:
+                return False
+
+        # Blocked requesters are released if the worker is stopped
+        while self._running:
+            try:
+                self._queue.put(item, timeout=BLOCK_POLL_PERIOD)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def _update_metrics(self) -> None:
+        self.queue_length = self._queue.qsize()
+
+        if self._on_metrics is not None:
+            self._on_metrics(self)
+
+    def _run(self) -> None:
+        while self._running:
+            _, _, enqueue_time, service_request = self._queue.get()
+
+            if service_request is None or not self._running:
+                break
+
+            wait = time.monotonic() - enqueue_time
+
+            with self._metrics_lock:
+                self.last_wait = wait
+                self.max_wait = max(self.max_wait, wait)
+                self.average_wait += WAIT_AVERAGE_WEIGHT * (
+                    wait - self.average_wait)
+                self._update_metrics()
+
+            self._handler(service_request)
+
+    @staticmethod
+    def from_config(config: Dict[str, Any],
+                    handler: Callable,
+                    on_rejected: Callable,
+                    name: Optional[str] = None,
+                    on_metrics: Optional[Callable] = None) -> 'CommandWorker':
+        """ Create a worker from the 'execution' block of a component
+        configuration.
+        """
+        priorities = {'connect': 0}
+        priorities.update(config.get('priorities') or {})
+
+        return CommandWorker(handler=handler,
+                             on_rejected=on_rejected,
+                             queue_size=int(config.get('queue_size', 0)),
+                             full_policy=config.get('full_policy', 'reject'),
+                             priorities=priorities,
+                             name=name,
+                             on_metrics=on_metrics)
@@ -8,3 +8,6 @@ from .udp_instrument_driver import UdpInstrumentDriver
 from .tcp_tmtc_cyclic import TcpTmTcCyclic
 from .visa_instrument_driver import VisaInstrumentDriver
 from .xmlrpc_instrument_driver import XmlRpcInstrumentDriver
+from .async_instrument_driver import AsyncInstrumentDriver
+from .async_tcp_instrument_driver import AsyncTcpInstrumentDriver
+from .async_udp_instrument_driver import AsyncUdpInstrumentDriver
@@ -0,0 +1,200 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" asyncio Instrument driver controller base """
+
+from typing import Optional, Any, Awaitable
+import asyncio
+
+from mamba.core.context import Context
+from mamba.core.event_loop import EventLoop
+from mamba.core.component_base import InstrumentDriver
+from mamba.core.component_base.instrument_driver import InstrumentCommand
+from mamba.core.msg import ServiceRequest, \
+    ServiceResponse, ParameterType
+
+
+class AsyncInstrumentDriver(InstrumentDriver):
+    """ Instrument driver that, in the 'async' execution mode, executes the
+    instrument commands as coroutines of the event loop shared by the
+    application, instead of blocking the requesting thread.
+
+    The commands of different instruments run concurrently in the loop
+    thread, the commands of one instrument are executed one at a time. In
+    the 'direct' and 'queue' modes the blocking driver is used.
+    """
+
+    EXECUTION_MODES = ['direct', 'queue', 'async']
+
+    def __init__(self,
+                 config_folder: str,
+                 context: Context,
+                 local_config: Optional[dict] = None) -> None:
+        super().__init__(config_folder, context, local_config)
+
+        # Event loop executing the commands, in async mode
+        self._event_loop: Optional[EventLoop] = None
+
+        # Serializes the instrument IO. Created in the event loop
+        self._command_lock: Optional[asyncio.Lock] = None
+
+    def initialize(self) -> None:
+        if (self._configuration.get('execution')
+                or {}).get('mode') == 'async':
+            self._event_loop = self._context.event_loop()
+
+        super().initialize()
+
+    def _run_command(self, service_request: ServiceRequest) -> None:
+        if self._event_loop is None or service_request.id == 'connect':
+            # Connection changes block the requester, as the background
+            # reconnections of the connection supervisor
+            super()._run_command(service_request)
+        else:
+            self._event_loop.submit(self._run_command_async(service_request))
+
+    async def _run_command_async(self,
+                                 service_request: ServiceRequest) -> None:
+        self._log_dev(f"Received service request: {service_request.id}")
+
+        result = ServiceResponse(provider=self._name,
+                                 id=service_request.id,
+                                 type=service_request.type,
+                                 request_id=service_request.request_id)
+
+        try:
+            self._service_preprocessing(service_request, result)
+
+            async with self._lock():
+                await self._execute_command_async(service_request, result)
+
+            if self._response_cache is not None:
+                self._cache_result(service_request, result)
+        except Exception as exc:
+            result = ServiceResponse(provider=self._name,
+                                     id=service_request.id,
+                                     type=ParameterType.error,
+                                     value=f'Command execution error: {exc}',
+                                     request_id=service_request.request_id)
+            self._log_error(f'Command execution error in '
+                            f'{service_request.id}: {exc}')
+
+        self._publish_result(result)
+
+    async def _execute_command_async(self, service_request: ServiceRequest,
+                                     result: ServiceResponse) -> None:
+        """ Execute a service request on the instrument, or serve it from
+            memory. Called holding the command lock.
+
+            Args:
+                service_request: The current service request.
+                result: The result to be published.
+        """
+        plan = self._validated_plan(service_request, result)
+
+        if plan is None:
+            return
+
+        for inst_cmd in plan.commands:
+            if self._plan_interrupted(service_request, result):
+                break
+
+            await self._process_inst_command_async(inst_cmd.kind, inst_cmd,
+                                                   service_request, result)
+
+    def _lock(self) -> asyncio.Lock:
+        if self._command_lock is None:
+            self._command_lock = asyncio.Lock()
+
+        return self._command_lock
+
+    async def _locked(self, coroutine: Awaitable) -> Any:
+        """ Run a coroutine holding the command lock """
+        async with self._lock():
+            return await coroutine
+
+    def _instrument_connect(self,
+                            result: Optional[ServiceResponse] = None) -> None:
+        if self._event_loop is None:
+            super()._instrument_connect(result)
+        else:
+            self._event_loop.run(
+                self._locked(self._instrument_connect_async(result)))
+
+    def _instrument_disconnect(self,
+                               result: Optional[ServiceResponse] = None
+                               ) -> None:
+        if self._event_loop is None:
+            super()._instrument_disconnect(result)
+        else:
+            self._event_loop.run(
+                self._locked(self._instrument_disconnect_async(result)))
+
+    def _instrument_probe(self) -> bool:
+        if self._event_loop is None:
+            return super()._instrument_probe()
+
+        return self._event_loop.run(
+            self._locked(self._instrument_probe_async()))
+
+    async def _instrument_connect_async(
+            self, result: Optional[ServiceResponse] = None) -> None:
+        pass
+
+    async def _instrument_disconnect_async(
+            self, result: Optional[ServiceResponse] = None) -> None:
+        pass
+
+    async def _instrument_probe_async(self) -> bool:
+        """ Check the liveness of the open connection to the instrument.
+            Called holding the command lock.
+
+            Returns:
+                Whether the instrument is alive.
+        """
+        return self._instrument_is_connected()
+
+    async def _process_inst_command_async(
+            self, cmd_type: str, cmd: InstrumentCommand,
+            service_request: ServiceRequest, result: ServiceResponse) -> None:
+        pass
+
+    async def _connection_lost_async(self, result: ServiceResponse) -> None:
+        """ Close the lost connection to the instrument, to be reconnected
+            in background by the connection supervisor.
+
+            Args:
+                result: The result of the failed request.
+        """
+        await self._instrument_disconnect_async()
+        self._supervisor.lost()
+
+        result.type = ParameterType.error
+        result.value = 'Instrument connection lost, reconnecting'
+        self._log_error(result.value)
+
+    async def _deadline_exceeded_async(self, service_request: ServiceRequest,
+                                       result: ServiceResponse) -> bool:
+        """ Answer with a timeout error the request whose deadline expired
+            while waiting for the instrument, and open again the connection
+            to discard the late reply.
+
+            Returns:
+                Whether the deadline has expired.
+        """
+        if not self._deadline_exceeded(
+                service_request, result, reset_connection=False):
+            return False
+
+        await self._instrument_disconnect_async()
+        await self._instrument_connect_async()
+
+        if self._supervisor is not None and \
+                not self._instrument_is_connected():
+            self._supervisor.lost()
+
+        return True
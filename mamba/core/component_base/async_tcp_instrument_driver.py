@@ -0,0 +1,185 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" asyncio TCP Instrument driver controller base """
+
+from typing import Optional
+import asyncio
+import socket
+
+from mamba.core.context import Context
+from mamba.core.component_base.async_instrument_driver import \
+    AsyncInstrumentDriver
+from mamba.core.component_base.tcp_instrument_driver import \
+    TcpInstrumentDriver, MessageTooLongError
+from mamba.core.component_base.instrument_driver import InstrumentCommand
+from mamba.core.msg import ServiceRequest, \
+    ServiceResponse, ParameterType
+
+
+class AsyncTcpInstrumentDriver(AsyncInstrumentDriver, TcpInstrumentDriver):
+    """ TCP Instrument driver controller class. In the 'async' execution
+    mode, the instrument is accessed with asyncio streams in the event loop
+    shared by the application.
+    """
+    def __init__(self,
+                 config_folder: str,
+                 context: Context,
+                 local_config: Optional[dict] = None) -> None:
+        super().__init__(config_folder, context, local_config)
+
+        # Reader of the instrument replies, in async mode. The stream
+        # writer is kept as the instrument handle
+        self._stream_reader: Optional[asyncio.StreamReader] = None
+
+    async def _instrument_connect_async(
+            self, result: Optional[ServiceResponse] = None) -> None:
+        try:
+            self._stream_reader, self._inst = await asyncio.open_connection(
+                self._instrument.address,
+                self._instrument.port,
+                limit=self._instrument.max_message_size)
+
+            if self._supervisor is not None:
+                # Let the system detect the loss of idle connections
+                self._inst.get_extra_info('socket').setsockopt(
+                    socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+            if result is not None and result.id in self._shared_memory_setter:
+                self._shared_memory[self._shared_memory_setter[result.id]] = 1
+
+            self._log_dev("Established connection to Instrument")
+
+        except OSError:
+            error = 'Instrument is unreachable'
+            if result is not None:
+                result.type = ParameterType.error
+                result.value = error
+            self._log_error(error)
+
+    async def _instrument_disconnect_async(
+            self, result: Optional[ServiceResponse] = None) -> None:
+        if self._inst is not None:
+            self._inst.close()
+            self._inst = None
+            self._stream_reader = None
+
+            if result is not None and result.id in self._shared_memory_setter:
+                self._shared_memory[self._shared_memory_setter[result.id]] = 0
+            self._log_dev("Closed connection to Instrument")
+
+    async def _instrument_probe_async(self) -> bool:
+        if self._inst is None:
+            return False
+
+        if self._probe_command is None:
+            # Check the connection has not been closed by the peer
+            return not self._stream_reader.at_eof()
+
+        try:
+            await self._query(self._probe_command, self._reply_timeout())
+            return True
+        except (OSError, asyncio.TimeoutError, MessageTooLongError):
+            return False
+
+    async def _write(self, message: str) -> None:
+        self._inst.write(
+            bytes(f'{message}{self._instrument.terminator_write}',
+                  self._instrument.encoding))
+        await self._inst.drain()
+
+    async def _query(self, message: str, timeout: Optional[float]) -> str:
+        """ Send a command and return its reply, without terminator.
+
+        Raises:
+            asyncio.TimeoutError: The reply is not received before timeout.
+            ConnectionResetError: The connection is closed by the peer.
+            MessageTooLongError: The reply exceeds the maximum size. The
+                                 rest of the reply is discarded.
+        """
+        await self._write(message)
+        return await asyncio.wait_for(self._read_message(), timeout)
+
+    async def _read_message(self) -> str:
+        terminator = bytes(self._instrument.terminator_read,
+                           self._instrument.encoding)
+
+        try:
+            message = await self._stream_reader.readuntil(terminator)
+        except asyncio.IncompleteReadError:
+            raise ConnectionResetError('Connection closed by the peer')
+        except asyncio.LimitOverrunError:
+            # Discard the message up to its terminator
+            while True:
+                try:
+                    await self._stream_reader.readuntil(terminator)
+                    break
+                except asyncio.LimitOverrunError as exc:
+                    await self._stream_reader.readexactly(exc.consumed)
+                except asyncio.IncompleteReadError:
+                    raise ConnectionResetError('Connection closed by the '
+                                               'peer')
+
+            raise MessageTooLongError(
+                'Message exceeds the maximum size of '
+                f'{self._instrument.max_message_size} bytes')
+
+        return str(message[:-len(terminator)], self._instrument.encoding)
+
+    async def _process_inst_command_async(
+            self, cmd_type: str, cmd: InstrumentCommand,
+            service_request: ServiceRequest, result: ServiceResponse) -> None:
+        connection_attempts = 0
+        success = False
+
+        while connection_attempts < self._instrument.max_connection_attempts:
+            connection_attempts += 1
+
+            if self._inst is not None:
+                try:
+                    if cmd_type == 'query':
+                        value = await self._query(
+                            cmd.render(service_request.args),
+                            self._request_timeout(service_request,
+                                                  self._reply_timeout()))
+
+                        self._store_query_result(cmd, service_request, result,
+                                                 value)
+
+                    elif cmd_type == 'write':
+                        await self._write(cmd.render(service_request.args))
+
+                except MessageTooLongError as exc:
+                    result.type = ParameterType.error
+                    result.value = str(exc)
+                    self._log_error(result.value)
+                except (OSError, asyncio.TimeoutError):
+                    if await self._deadline_exceeded_async(
+                            service_request, result):
+                        return
+
+                    if self._supervisor is not None:
+                        await self._connection_lost_async(result)
+                        return
+
+                    await self._instrument_disconnect_async()
+                    await self._instrument_connect_async()
+                    continue
+            else:
+                result.type = ParameterType.error
+                result.value = 'Not possible to perform command before ' \
+                               'connection is established'
+                self._log_error(result.value)
+
+            success = True
+            break
+
+        if not success:
+            result.type = ParameterType.error
+            result.value = 'Not possible to communicate to the' \
+                           ' instrument'
+            self._log_error(result.value)
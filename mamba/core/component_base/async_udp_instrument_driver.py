@@ -0,0 +1,215 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" asyncio UDP Instrument driver controller base """
+
+from typing import Optional, Dict
+import asyncio
+import itertools
+
+from mamba.core.context import Context
+from mamba.core.component_base.async_instrument_driver import \
+    AsyncInstrumentDriver
+from mamba.core.component_base.udp_instrument_driver import \
+    UdpInstrumentDriver, DEFAULT_REPLY_TIMEOUT, SEQUENCE_TAG_PREFIX
+from mamba.core.component_base.instrument_driver import InstrumentCommand
+from mamba.core.msg import ServiceRequest, \
+    ServiceResponse, ParameterType
+
+
+class DatagramReplies(asyncio.DatagramProtocol):
+    """ Delivers the datagrams received from an instrument to the queries
+    waiting for them. Datagrams without waiting query, as late replies of
+    timed out queries, are discarded.
+
+    Args:
+        eom_r: Read terminator.
+        encoding: Messages encoding.
+        sequence_tag: Whether replies carry the sequence tag of their query.
+    """
+    def __init__(self, eom_r: str, encoding: str,
+                 sequence_tag: bool) -> None:
+        self._eom_r = eom_r
+        self._encoding = encoding
+        self._sequence_tag = sequence_tag
+
+        # Waiting queries, by tag. None for untagged queries
+        self.pending: Dict[Optional[str], asyncio.Future] = {}
+
+        # Number of discarded stale or unexpected datagrams
+        self.discarded: int = 0
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        reply = str(data, self._encoding)
+        if reply.endswith(self._eom_r):
+            reply = reply[:-len(self._eom_r)]
+
+        tag = None
+        if self._sequence_tag:
+            tag, _, reply = reply.partition(' ')
+
+        future = self.pending.pop(tag, None)
+
+        if future is None or future.done():
+            self.discarded += 1
+        else:
+            future.set_result(reply)
+
+    def error_received(self, exc: Exception) -> None:
+        # Wake up the waiting queries, e.g. port unreachable
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(exc)
+        self.pending.clear()
+
+
+class AsyncUdpInstrumentDriver(AsyncInstrumentDriver, UdpInstrumentDriver):
+    """ UDP Instrument driver controller class. In the 'async' execution
+    mode, the instrument is accessed with an asyncio datagram endpoint in
+    the event loop shared by the application.
+    """
+    def __init__(self,
+                 config_folder: str,
+                 context: Context,
+                 local_config: Optional[dict] = None) -> None:
+        super().__init__(config_folder, context, local_config)
+
+        # Datagram endpoint to the instrument, in async mode
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._replies: Optional[DatagramReplies] = None
+        self._tags = itertools.count(1)
+
+    def _instrument_is_connected(self) -> bool:
+        if self._event_loop is None:
+            return super()._instrument_is_connected()
+
+        return self._transport is not None
+
+    async def _instrument_connect_async(
+            self, result: Optional[ServiceResponse] = None) -> None:
+        try:
+            self._transport, self._replies = \
+                await self._event_loop.loop.create_datagram_endpoint(
+                    lambda: DatagramReplies(self._instrument.terminator_read,
+                                            self._instrument.encoding,
+                                            self._sequence_tag),
+                    remote_addr=(self._instrument.address,
+                                 self._instrument.port))
+
+            self._log_dev("Opened socket to Instrument")
+
+        except OSError:
+            error = 'Instrument is unreachable'
+            if result is not None:
+                result.type = ParameterType.error
+                result.value = error
+            self._log_error(error)
+
+    async def _instrument_disconnect_async(
+            self, result: Optional[ServiceResponse] = None) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+            self._replies = None
+            self._log_dev("Closed socket to Instrument")
+
+    async def _instrument_probe_async(self) -> bool:
+        if self._transport is None:
+            return False
+
+        if self._probe_command is None:
+            # Datagrams give no evidence of the instrument liveness
+            return True
+
+        try:
+            await self._query(self._probe_command, self._udp_timeout())
+            return True
+        except (OSError, asyncio.TimeoutError):
+            return False
+
+    def _udp_timeout(self) -> float:
+        return float(self._instrument.reply_timeout or DEFAULT_REPLY_TIMEOUT)
+
+    def _write(self, message: str) -> None:
+        self._transport.sendto(
+            bytes(f'{message}{self._instrument.terminator_write}',
+                  self._instrument.encoding))
+
+    async def _query(self, message: str, timeout: float) -> str:
+        """ Send a command and return its reply.
+
+        Raises:
+            asyncio.TimeoutError: The reply is not received before timeout.
+            OSError: The instrument is not reachable.
+        """
+        tag = None
+        if self._sequence_tag:
+            tag = f'{SEQUENCE_TAG_PREFIX}{next(self._tags)}'
+            message = f'{tag} {message}'
+
+        replies = self._replies
+        future = self._event_loop.loop.create_future()
+        replies.pending[tag] = future
+
+        try:
+            self._write(message)
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            if replies.pending.get(tag) is future:
+                del replies.pending[tag]
+
+    async def _process_inst_command_async(
+            self, cmd_type: str, cmd: InstrumentCommand,
+            service_request: ServiceRequest, result: ServiceResponse) -> None:
+        connection_attempts = 0
+        success = False
+
+        while connection_attempts < self._instrument.max_connection_attempts:
+            connection_attempts += 1
+
+            if self._transport is None:
+                await self._instrument_connect_async()
+
+            try:
+                if self._transport is None:
+                    raise ConnectionRefusedError
+
+                if cmd_type == 'query':
+                    value = await self._query(
+                        cmd.render(service_request.args),
+                        self._request_timeout(service_request,
+                                              self._udp_timeout()))
+
+                    self._store_query_result(cmd, service_request, result,
+                                             value)
+
+                elif cmd_type == 'write':
+                    self._write(cmd.render(service_request.args))
+
+            except (OSError, asyncio.TimeoutError):
+                # Late replies are discarded by the endpoint
+                if self._deadline_exceeded(service_request,
+                                           result,
+                                           reset_connection=False):
+                    return
+
+                if self._supervisor is not None:
+                    await self._connection_lost_async(result)
+                    return
+
+                await self._instrument_disconnect_async()
+                await self._instrument_connect_async()
+                continue
+
+            success = True
+            break
+
+        if not success:
+            result.type = ParameterType.error
+            result.value = 'Not possible to communicate to the' \
+                           ' instrument'
+            self._log_error(result.value)
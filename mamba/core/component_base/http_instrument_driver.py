@@ -5,20 +5,137 @@
 # license information.
 #
 ############################################################################
-""" TCP Instrument driver controller base """
+""" HTTP Instrument driver controller base """
 
-from typing import Optional
-import http
+from typing import Optional, List, Tuple
+import http.client
+import itertools
+import json
+import queue
+import socket
+import threading
 
 from mamba.core.context import Context
 from mamba.core.exceptions import ComponentConfigException
 from mamba.core.component_base import InstrumentDriver
+from mamba.core.component_base.instrument_driver import InstrumentCommand, \
+    CommandPlan
 from mamba.core.msg import ServiceRequest, \
-    ServiceResponse, ParameterType, Empty
+    ServiceResponse, ParameterType
+
+DEFAULT_POOL_SIZE = 2
+
+
+class HttpConnectionPool:
+    """ Pool of keep-alive HTTP connections to an instrument.
+
+    Connections are created on demand, up to the pool size, and returned to
+    the pool after their response body has been read. A request that fails
+    on a connection that was idle in the pool, e.g. closed by the server,
+    is retried once on a new connection.
+
+    Args:
+        address: Instrument address.
+        port: Instrument port.
+        size: Maximum number of simultaneous connections.
+        timeout: Socket timeout in seconds, None to block.
+    """
+    def __init__(self,
+                 address: str,
+                 port: int,
+                 size: int = DEFAULT_POOL_SIZE,
+                 timeout: Optional[float] = None) -> None:
+        self._address = address
+        self._port = port
+        self._timeout = timeout
+
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+        # Number of opened connections and of retried requests
+        self.opened: int = 0
+        self.reconnected: int = 0
+
+    def request(self,
+                method: str,
+                url: str,
+                timeout: Optional[float] = None) -> Tuple[int, bytes]:
+        """ Send a request and return the response status and body.
+
+        Args:
+            method: The HTTP method.
+            url: The requested URL.
+            timeout: Socket timeout in seconds of this request, if not the
+                     pool timeout.
+
+        Raises:
+            OSError: The instrument is not reachable.
+            http.client.HTTPException: The response is not valid.
+        """
+        with self._slots:
+            try:
+                conn, reused = self._idle.get_nowait(), True
+            except queue.Empty:
+                conn, reused = self._new_connection(), False
+
+            while True:
+                try:
+                    self._set_timeout(conn, timeout)
+                    conn.request(method, url)
+                    response = conn.getresponse()
+
+                    # Always drain the body, to be able to reuse the socket
+                    body = response.read()
+                    break
+                except (OSError, http.client.HTTPException) as exc:
+                    conn.close()
+
+                    # A timed out request is not sent again
+                    if not reused or isinstance(exc, socket.timeout):
+                        raise
+
+                    # Connection closed by the server while idle
+                    self.reconnected += 1
+                    conn, reused = self._new_connection(), False
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._set_timeout(conn, self._timeout)
+                self._idle.put(conn)
+
+            return response.status, body
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """ Socket timeout in seconds """
+        return self._timeout
+
+    def close(self) -> None:
+        """ Close the idle connections """
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    @staticmethod
+    def _set_timeout(conn: http.client.HTTPConnection,
+                     timeout: Optional[float]) -> None:
+        conn.timeout = timeout
+
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        self.opened += 1
+        return http.client.HTTPConnection(self._address,
+                                          self._port,
+                                          timeout=self._timeout)
 
 
 class HttpInstrumentDriver(InstrumentDriver):
-    """ VISA Instrument driver controller class """
+    """ HTTP Instrument driver controller class """
     def __init__(self,
                  config_folder: str,
                  context: Context,
@@ -30,34 +147,119 @@ class HttpInstrumentDriver(InstrumentDriver):
             raise ComponentConfigException(
                 'Missing port in Instrument Configuration')
 
+        instrument_config = self._configuration.get('instrument') or {}
+
+        # Endpoint answering several queries in one request, if any
+        self._batch_endpoint: Optional[str] = instrument_config.get(
+            'batch_endpoint')
+
+        reply_timeout = self._instrument.reply_timeout
+
+        self._pool = HttpConnectionPool(
+            self._instrument.address,
+            self._instrument.port,
+            size=int(
+                instrument_config.get('connection_pool_size',
+                                      DEFAULT_POOL_SIZE)),
+            timeout=float(reply_timeout)
+            if reply_timeout is not None else None)
+
     def initialize(self) -> None:
         super().initialize()
         self._inst = 0
 
-    def _process_inst_command(self, cmd_type: str, cmd: str,
+    def _instrument_disconnect(self,
+                               result: Optional[ServiceResponse] = None
+                               ) -> None:
+        self._pool.close()
+
+    def _process_inst_plan(self, plan: CommandPlan,
+                           service_request: ServiceRequest,
+                           result: ServiceResponse) -> None:
+        if self._batch_endpoint is None:
+            super()._process_inst_plan(plan, service_request, result)
+            return
+
+        # Consecutive queries are sent in a single batch request
+        for kind, group in itertools.groupby(plan.commands,
+                                             key=lambda cmd: cmd.kind):
+            commands = list(group)
+
+            if kind == 'query' and len(commands) > 1:
+                self._process_inst_batch(commands, service_request, result)
+            else:
+                for inst_cmd in commands:
+                    self._process_inst_command(inst_cmd.kind, inst_cmd,
+                                               service_request, result)
+
+    def _process_inst_batch(self, commands: List[InstrumentCommand],
+                            service_request: ServiceRequest,
+                            result: ServiceResponse) -> None:
+        params = '&'.join(f'param={cmd.render(service_request.args)}'
+                          for cmd in commands)
+
+        body = self._http_request('GET', f'{self._batch_endpoint}?{params}',
+                                  service_request, result)
+
+        if body is None:
+            return
+
+        try:
+            values = json.loads(body)
+            if not isinstance(values, list) or len(values) != len(commands):
+                raise ValueError
+        except ValueError:
+            result.type = ParameterType.error
+            result.value = 'Invalid batch reply from the instrument'
+            self._log_error(result.value)
+            return
+
+        for cmd, value in zip(commands, values):
+            self._store_query_result(cmd, service_request, result, value)
+
+    def _process_inst_command(self, cmd_type: str, cmd: InstrumentCommand,
                               service_request: ServiceRequest,
                               result: ServiceResponse) -> None:
+        if cmd_type == 'query':
+            body = self._http_request(
+                'GET', f'/query?param={cmd.render(service_request.args)}',
+                service_request, result)
+
+            if body is not None:
+                self._store_query_result(cmd, service_request, result, body)
+
+        elif cmd_type == 'write':
+            self._http_request(
+                'PUT', f'/write?param={cmd.render(service_request.args)}',
+                service_request, result)
+
+    def _http_request(self, method: str, url: str,
+                      service_request: ServiceRequest,
+                      result: ServiceResponse) -> Optional[str]:
+        """ Send a request to the instrument and return the decoded reply
+        body, or None if the request failed.
+        """
         try:
-            conn = http.client.HTTPConnection(self._instrument.address,
-                                              self._instrument.port)
-            if cmd_type == 'query':
-                conn.request(
-                    "GET", f"/query?param={cmd.format(*service_request.args)}")
-                response = conn.getresponse()
-                value = response.read().decode(self._instrument.encoding)
-
-                if service_request.type == ParameterType.set:
-                    self._shared_memory[self._shared_memory_setter[
-                        service_request.id]] = value
-                else:
-                    result.value = value
-
-            elif cmd_type == 'write':
-                conn.request(
-                    "PUT", f"/write?param={cmd.format(*service_request.args)}")
-
-        except ConnectionRefusedError:
+            status, body = self._pool.request(
+                method, url,
+                self._request_timeout(service_request, self._pool.timeout))
+        except (OSError, http.client.HTTPException):
+            # The connection of the late reply has been closed
+            if self._deadline_exceeded(service_request,
+                                       result,
+                                       reset_connection=False):
+                return None
+
             result.type = ParameterType.error
             result.value = 'Not possible to communicate to the' \
                            ' instrument'
             self._log_error(result.value)
+            return None
+
+        if status >= 400:
+            result.type = ParameterType.error
+            result.value = f'Instrument replied with HTTP status {status}'
+            self._log_error(result.value)
+            return None
+
+        return body.decode(self._instrument.encoding)
@@ -7,16 +7,26 @@
 ############################################################################
 """ Instrument driver controller base """
 
-from typing import Optional, Dict, Union, Any, Tuple
-
-from rx import operators as op
+from typing import Optional, Dict, Any, Tuple, List, NamedTuple, Set
+from string import Formatter
+import threading
+import time
 
 from mamba.core.context import Context
+from mamba.core.command_worker import CommandWorker
+from mamba.core.response_cache import ResponseCache
+from mamba.core.single_flight import SingleFlight
+from mamba.core.parameter_store import ParameterStore
+from mamba.core.connection_supervisor import ConnectionSupervisor, \
+    ConnectionState
 from mamba.core.component_base import Component
 from mamba.core.exceptions import ComponentConfigException
 from mamba.core.msg import ServiceRequest, Empty, \
     ParameterInfo, ParameterType, ServiceResponse
 
+# Default maximum size in bytes of an instrument reply
+DEFAULT_MAX_MESSAGE_SIZE = 1048576
+
 
 class Instrument:
     def __init__(self, inst_config: dict) -> None:
@@ -52,6 +62,23 @@ class Instrument:
                 'port') is not None else None
 
         self.reply_timeout: str = inst_config.get('reply_timeout') or None
+        self.max_message_size: int = int(
+            inst_config.get('max_message_size') or DEFAULT_MAX_MESSAGE_SIZE)
+
+
+def remaining_time(deadline: Optional[float]) -> Optional[float]:
+    """ Seconds left before an absolute time.monotonic() deadline, or None
+    if there is no deadline. It is never negative.
+    """
+    if deadline is None:
+        return None
+
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def deadline_expired(deadline: Optional[float]) -> bool:
+    """ Whether an absolute time.monotonic() deadline has passed """
+    return deadline is not None and time.monotonic() >= deadline
 
 
 def parameters_format_validation(parameters: Dict[str, dict]) -> None:
@@ -86,7 +113,7 @@ def get_parameters(
                 is_query = False
                 for cmd in getter.get('instrument_command', []):
                     cmd_type = list(cmd.keys())[0]
-                    if cmd_type == 'query' or cmd_type == 'cyclic':
+                    if cmd_type in ('query', 'query_binary', 'cyclic'):
                         is_query = True
                         break
                 if not is_query:
@@ -133,8 +160,182 @@ def get_parameters(
     return _service_info
 
 
+class CommandTemplate(NamedTuple):
+    """ Format template split once into its literal text and fields """
+    template: str
+    # (literal text, argument index, format spec, conversion) of every
+    # template part. None if the template can only be rendered by format
+    segments: Optional[Tuple[Tuple[str, Optional[int], str, Optional[str]],
+                             ...]]
+
+    def render(self, args: List[Any]) -> str:
+        """ Returns the template formatted with the given arguments """
+        if self.segments is None:
+            return self.template.format(*args)
+
+        parts = []
+        for literal, index, format_spec, conversion in self.segments:
+            parts.append(literal)
+
+            if index is not None:
+                value = args[index]
+                if conversion == 'r':
+                    value = repr(value)
+                elif conversion == 's':
+                    value = str(value)
+                elif conversion == 'a':
+                    value = ascii(value)
+
+                parts.append(format(value, format_spec))
+
+        return ''.join(parts)
+
+
+def compile_template(template: str) -> CommandTemplate:
+    """ Split a format template once into its literal text and fields.
+
+    Args:
+        template: The str.format template.
+
+    Returns:
+        The compiled template.
+    """
+    segments = []
+    auto_fields = 0
+    manual_fields = 0
+
+    for literal, field, format_spec, conversion in Formatter().parse(
+            template):
+        index = None
+
+        if field == '':
+            index = auto_fields
+            auto_fields += 1
+        elif field is not None and field.isdigit():
+            index = int(field)
+            manual_fields += 1
+
+        if (field is not None and index is None) or '{' in (format_spec
+                                                            or ''):
+            # Attribute, item and nested fields are left to format
+            return CommandTemplate(template=template, segments=None)
+
+        segments.append((literal, index, format_spec or '', conversion))
+
+    if auto_fields > 0 and manual_fields > 0:
+        # Let format report the mixed field numbering
+        return CommandTemplate(template=template, segments=None)
+
+    return CommandTemplate(template=template, segments=tuple(segments))
+
+
+class InstrumentCommand(NamedTuple):
+    """ Compiled entry of a parameter 'instrument_command' list """
+    kind: str
+    command: Any
+    # Compiled template of a str command, or of every str field of a
+    # dictionary command
+    template: Optional[CommandTemplate]
+    fields: Dict[str, CommandTemplate]
+    # Shared memory key where the result of a setter query is stored
+    memory_slot: Optional[str]
+
+    def render(self, args: List[Any]) -> str:
+        """ Returns the command formatted with the given arguments """
+        return self.template.render(args)
+
+    def render_field(self, name: str, args: List[Any],
+                     default: str = '') -> str:
+        """ Returns a field of a dictionary command formatted with the
+        given arguments.
+        """
+        field = self.fields.get(name)
+        if field is None:
+            return default.format(*args)
+
+        return field.render(args)
+
+
+class CommandPlan(NamedTuple):
+    """ Compiled 'instrument_command' list of a parameter """
+    commands: Tuple[InstrumentCommand, ...]
+    signature: List[Any]
+    arity: int
+
+
+def compile_instrument_command(
+        instrument_command: Dict[str, Any],
+        memory_slot: Optional[str] = None) -> InstrumentCommand:
+    """ Compile an 'instrument_command' entry, splitting its format
+    templates once.
+
+    Args:
+        instrument_command: Single key dictionary, {command kind: command}.
+        memory_slot: Shared memory key of the parameter setter, if any.
+
+    Returns:
+        The compiled instrument command.
+    """
+    (kind, command), = instrument_command.items()
+
+    template = None
+    fields = {}
+
+    if isinstance(command, str):
+        template = compile_template(command)
+    elif isinstance(command, dict):
+        fields = {
+            name: compile_template(value)
+            for name, value in command.items() if isinstance(value, str)
+        }
+
+    return InstrumentCommand(kind=kind,
+                             command=command,
+                             template=template,
+                             fields=fields,
+                             memory_slot=memory_slot)
+
+
+def compile_command_plans(
+        parameter_info: Dict[Tuple[str, ParameterType], dict],
+        shared_memory_setter: Dict[str, str]
+) -> Dict[Tuple[str, ParameterType], CommandPlan]:
+    """ Compile the 'instrument_command' list of every parameter service into
+    an immutable command plan.
+
+    Args:
+        parameter_info: The parameter services, as returned by
+                        get_parameters.
+        shared_memory_setter: Shared memory key of every parameter setter.
+
+    Returns:
+        The command plan of every service with instrument commands.
+    """
+    plans = {}
+
+    for (param_id, param_type), service in parameter_info.items():
+        if service.get('instrument_command') is None:
+            continue
+
+        memory_slot = shared_memory_setter.get(
+            param_id) if param_type == ParameterType.set else None
+
+        plans[(param_id, param_type)] = CommandPlan(
+            commands=tuple(
+                compile_instrument_command(inst_cmd, memory_slot)
+                for inst_cmd in service['instrument_command']),
+            signature=service['signature'][0],
+            arity=len(service['signature'][0]))
+
+    return plans
+
+
 class InstrumentDriver(Component):
     """ VISA controller base class """
+
+    # Command execution modes supported by the driver
+    EXECUTION_MODES = ['direct', 'queue']
+
     def __init__(self,
                  config_folder: str,
                  context: Context,
@@ -144,13 +345,32 @@ class InstrumentDriver(Component):
         # Initialize instrument configuration
         self._instrument = Instrument(self._configuration.get('instrument'))
 
-        # Define parameter mapping
-        self._shared_memory: Dict[str, Union[str, int, float]] = {}
+        # Define parameter mapping. The shared memory is written by the
+        # request threads and the instrument telemetry threads
+        self._shared_memory = ParameterStore()
         self._shared_memory_getter: Dict[str, str] = {}
         self._shared_memory_setter: Dict[str, str] = {}
         self._parameter_info: Dict[Tuple[str, ParameterType], dict] = {}
+        self._command_plans: Dict[Tuple[str, ParameterType],
+                                  CommandPlan] = {}
         self._inst: Optional[Any] = None
 
+        # Worker executing the commands, if the execution mode is 'queue'
+        self._command_worker: Optional[CommandWorker] = None
+
+        # Cache of the getter replies, if any parameter has a cache block
+        self._response_cache: Optional[ResponseCache] = None
+
+        # Getters in flight, and getters that can be coalesced with them
+        self._single_flight: Optional[SingleFlight] = None
+        self._coalesced_getters: Set[str] = set()
+
+        # Supervisor of the instrument connection, if reconnect is
+        # configured. Instrument IO is then serialized with the IO lock.
+        self._supervisor: Optional[ConnectionSupervisor] = None
+        self._probe_command: Optional[str] = None
+        self._io_lock = threading.RLock()
+
         # Initialize observers
         self._register_observers()
 
@@ -166,6 +386,12 @@ class InstrumentDriver(Component):
             Args:
                 rx_value: The value published by the subject.
         """
+        if self._command_worker is not None:
+            self._command_worker.stop()
+
+        if self._supervisor is not None:
+            self._supervisor.close()
+
         self._instrument_disconnect()
 
     def initialize(self) -> None:
@@ -184,8 +410,9 @@ class InstrumentDriver(Component):
                         and (parameter_info['get']
                              or {}).get('instrument_command') is None):
                     # Initialize shared memory with given value, if any
-                    self._shared_memory[key] = parameter_info.get(
-                        'initial_value')
+                    self._shared_memory.declare(
+                        key, parameter_info.get('initial_value'),
+                        parameter_info.get('type'))
                     self._shared_memory_getter[((parameter_info.get('get')
                                                  or {}).get('alias')
                                                 or key).lower()] = key
@@ -193,6 +420,94 @@ class InstrumentDriver(Component):
                                                  or {}).get('alias')
                                                 or key).lower()] = key
 
+        # Compile the instrument commands once, instead of on every request
+        self._command_plans = compile_command_plans(
+            self._parameter_info, self._shared_memory_setter)
+
+        self._response_cache = ResponseCache.from_parameters(
+            self._configuration.get('parameters') or {}, self._name)
+
+        if self._response_cache is not None:
+            self._register_metric('cache_hits',
+                                  'Number of getter replies served from the '
+                                  'cache')
+            self._register_metric('cache_misses',
+                                  'Number of cached getters queried to the '
+                                  'instrument')
+            self._register_metric(
+                'cache_stale_hits',
+                'Number of expired getter replies served because the '
+                'instrument query failed')
+
+        instrument_config = self._configuration.get('instrument') or {}
+
+        if 'reconnect' in instrument_config:
+            reconnect_config = instrument_config['reconnect'] or {}
+
+            self._supervisor = ConnectionSupervisor.from_config(
+                reconnect_config,
+                reconnect=self._reconnect_instrument,
+                probe=self._probe_connection,
+                on_state=self._connection_state_changed,
+                name=f'{self._name}_connection_supervisor')
+            self._probe_command = reconnect_config.get('probe')
+
+            self._register_metric('connection_state',
+                                  'State of the instrument connection: '
+                                  'disconnected, connected or reconnecting',
+                                  value_type='str')
+            self._shared_memory['connection_state'] = \
+                self._supervisor.state.name
+            self._register_metric(
+                'reconnect_attempts',
+                'Number of background reconnection attempts')
+
+        # Configure the command execution mode
+        execution = self._configuration.get('execution') or {}
+        execution_mode = execution.get('mode', 'direct')
+
+        if execution.get('coalesce_gets', True):
+            self._configure_coalescing()
+
+            if 'execution' in self._configuration:
+                self._register_metric(
+                    'coalesced_requests',
+                    'Number of get requests answered with the result of an '
+                    'identical request in flight')
+
+        if execution_mode == 'queue':
+            self._command_worker = CommandWorker.from_config(
+                execution,
+                handler=self._run_queued_command,
+                on_rejected=self._reject_command,
+                name=f'{self._name}_command_worker',
+                on_metrics=self._update_queue_metrics)
+
+            self._register_metric('command_queue_length',
+                                  'Number of commands waiting in the queue')
+            self._register_metric(
+                'command_queue_wait',
+                'Time in seconds the last command waited in the queue')
+            self._register_metric(
+                'command_queue_wait_max',
+                'Maximum time in seconds a command waited in the queue')
+            self._register_metric(
+                'command_queue_wait_average',
+                'Moving average of the time in seconds the commands waited '
+                'in the queue')
+            self._register_metric('command_queue_rejected',
+                                  'Number of commands rejected by a full '
+                                  'queue')
+
+            self._command_worker.start()
+        elif execution_mode not in self.EXECUTION_MODES:
+            raise ComponentConfigException(
+                f'In service {self._name}: execution mode '
+                f'"{execution_mode}" is not valid. Valid modes are: '
+                f'{", ".join(self.EXECUTION_MODES)}')
+
+        self._register_services()
+
         # Compose services signature to be published
         parameter_info = [
             ParameterInfo(provider=self._name,
@@ -206,11 +521,246 @@ class InstrumentDriver(Component):
         # Publish services signature
         self._context.rx['io_service_signature'].on_next(parameter_info)
 
-        # Subscribe to the services request
-        self._context.rx['io_service_request'].pipe(
-            op.filter(lambda value: value.provider == self._name and (
-                (value.id, value.type) in self._parameter_info))).subscribe(
-                    on_next=self._run_command)
+        # Subscribe to the services request addressed to this provider
+        self._context.rx['io_service_request'].subscribe_route(
+            self._name, self._received_service_request)
+
+    def _received_service_request(self,
+                                  service_request: ServiceRequest) -> None:
+        """ Entry point for processing the service requests routed to this
+            component.
+
+            Args:
+                service_request: The service request received.
+        """
+        if (service_request.id,
+                service_request.type) not in self._parameter_info:
+            return
+
+        if self._response_cache is not None and \
+                self._serve_from_cache(service_request):
+            return
+
+        if service_request.type == ParameterType.get and \
+                service_request.id in self._coalesced_getters:
+            if not self._single_flight.join(
+                    (service_request.id, tuple(service_request.args)),
+                    service_request.request_id):
+                if 'coalesced_requests' in self._shared_memory:
+                    self._shared_memory['coalesced_requests'] = \
+                        self._single_flight.coalesced
+                return
+
+        if self._command_worker is None or (
+                service_request.type == ParameterType.get
+                and service_request.id in self._shared_memory_getter):
+            # Values served from memory do not need to wait for the
+            # instrument
+            try:
+                self._run_command(service_request)
+            except Exception as exc:
+                # The attached requests shall not wait for a failed request
+                self._publish_result(
+                    ServiceResponse(provider=self._name,
+                                    id=service_request.id,
+                                    type=ParameterType.error,
+                                    value=f'Command execution error: {exc}',
+                                    request_id=service_request.request_id),
+                    attached_only=True)
+                raise
+        else:
+            self._command_worker.submit(service_request)
+
+    def _configure_coalescing(self) -> None:
+        """ Enable the coalescing of the getters with instrument command,
+            unless disabled in their configuration.
+        """
+        for key, parameter_info in (self._configuration.get('parameters')
+                                    or {}).items():
+            getter = parameter_info.get('get') or {}
+
+            if getter.get('instrument_command') is not None and \
+                    getter.get('coalesce', True):
+                self._coalesced_getters.add(
+                    (getter.get('alias') or key).lower())
+
+        if self._coalesced_getters:
+            self._single_flight = SingleFlight()
+
+    def _publish_result(self,
+                        result: ServiceResponse,
+                        attached_only: bool = False) -> None:
+        """ Publish the result of a service request, and of the identical
+            requests attached to it while it was in flight.
+
+            Args:
+                result: The result to be published.
+                attached_only: Publish only the result of the attached
+                               requests.
+        """
+        attached = self._single_flight.complete(
+            result.request_id) if self._single_flight is not None else []
+
+        if not attached_only:
+            self._context.rx['io_result'].on_next(result)
+
+        for request_id in attached:
+            self._context.rx['io_result'].on_next(
+                ServiceResponse(provider=result.provider,
+                                id=result.id,
+                                type=result.type,
+                                value=result.value,
+                                request_id=request_id))
+
+    def _serve_from_cache(self, service_request: ServiceRequest) -> bool:
+        """ Answer a getter from the response cache, and invalidate the
+            cached replies affected by a setter.
+
+            Args:
+                service_request: The service request received.
+
+            Returns:
+                Whether the request has been answered.
+        """
+        cache = self._response_cache
+
+        if service_request.type == ParameterType.set:
+            # Invalidate on arrival, for the getters received before the
+            # setter execution
+            cache.invalidate(service_request.id)
+            return False
+
+        if service_request.type != ParameterType.get or \
+                not cache.is_cached(service_request.id):
+            return False
+
+        found, value = cache.lookup(service_request.id)
+        self._update_cache_metrics()
+
+        if found:
+            self._context.rx['io_result'].on_next(
+                ServiceResponse(provider=self._name,
+                                id=service_request.id,
+                                type=ParameterType.get,
+                                value=value,
+                                request_id=service_request.request_id))
+
+        return found
+
+    def _cache_result(self, service_request: ServiceRequest,
+                      result: ServiceResponse) -> None:
+        """ Keep the reply of a cached getter, or answer with an expired
+            reply if the instrument query failed.
+
+            Args:
+                service_request: The executed service request.
+                result: The result to be published.
+        """
+        cache = self._response_cache
+
+        if service_request.type == ParameterType.set:
+            if service_request.id == 'connect':
+                # The instrument may have been reset while disconnected, but
+                # the replies are kept to be served while disconnected
+                if service_request.args == ['1']:
+                    cache.clear()
+            else:
+                # Invalidate again, a getter executed before the setter may
+                # have cached the previous value
+                cache.invalidate(service_request.id)
+        elif cache.is_cached(service_request.id):
+            if result.type == ParameterType.get:
+                cache.store(service_request.id, result.value)
+            else:
+                found, value = cache.lookup_stale(service_request.id)
+                if found:
+                    self._log_warning(f'Served expired reply of '
+                                      f'{service_request.id}: {result.value}')
+                    result.type = ParameterType.get
+                    result.value = value
+                    self._update_cache_metrics()
+
+    def _update_cache_metrics(self) -> None:
+        self._shared_memory.update(
+            cache_hits=self._response_cache.hits,
+            cache_misses=self._response_cache.misses,
+            cache_stale_hits=self._response_cache.stale_hits)
+
+    def _run_queued_command(self, service_request: ServiceRequest) -> None:
+        """ Entry point for executing the service requests in the command
+            worker thread.
+
+            Args:
+                service_request: The service request to be executed.
+        """
+        try:
+            self._run_command(service_request)
+        except Exception as exc:
+            self._publish_result(
+                ServiceResponse(provider=self._name,
+                                id=service_request.id,
+                                type=ParameterType.error,
+                                value=f'Command execution error: {exc}',
+                                request_id=service_request.request_id))
+            self._log_error(f'Command execution error in '
+                            f'{service_request.id}: {exc}')
+
+    def _update_queue_metrics(self, worker: CommandWorker) -> None:
+        """ Entry point for publishing the command queue metrics in the
+            shared memory. Called by the worker with its metrics lock held.
+
+            Args:
+                worker: The command worker.
+        """
+        self._shared_memory.update(
+            command_queue_length=worker.queue_length,
+            command_queue_wait=worker.last_wait,
+            command_queue_wait_max=worker.max_wait,
+            command_queue_wait_average=worker.average_wait,
+            command_queue_rejected=worker.rejected)
+
+    def _reject_command(self, service_request: ServiceRequest) -> None:
+        """ Entry point for answering the service requests that do not fit
+            in the command queue.
+
+            Args:
+                service_request: The rejected service request.
+        """
+        result = ServiceResponse(provider=self._name,
+                                 id=service_request.id,
+                                 type=ParameterType.error,
+                                 value='Command queue is full',
+                                 request_id=service_request.request_id)
+        self._log_error(f'{result.value}, rejected {service_request.id}')
+        self._publish_result(result)
+
+    def _register_metric(self,
+                         key: str,
+                         description: str,
+                         value_type: str = 'float') -> None:
+        """ Expose an internal metric of the component as a read only
+            parameter, served from the shared memory.
+
+            Args:
+                key: Parameter identifier of the metric.
+                description: Description of the metric.
+                value_type: Type of the metric value.
+        """
+        self._parameter_info[(key, ParameterType.get)] = {
+            'description': description,
+            'signature': [[], value_type],
+            'instrument_command': None,
+            'type': ParameterType.get,
+        }
+        self._shared_memory.declare(key, 0, value_type)
+        self._shared_memory_getter[key] = key
+
+    def _register_services(self) -> None:
+        """ Entry point for registering the services of the optional
+            features of the component, before their signatures are
+            published.
+        """
+        pass
 
     def _service_preprocessing(self, service_request: ServiceRequest,
                                result: ServiceResponse) -> None:
@@ -236,7 +786,175 @@ class InstrumentDriver(Component):
                                ) -> None:
         pass
 
-    def _process_inst_command(self, cmd_type: str, cmd: str,
+    def _instrument_is_connected(self) -> bool:
+        """ Whether the connection to the instrument is open """
+        return self._inst is not None
+
+    def _instrument_probe(self) -> bool:
+        """ Check the liveness of the open connection to the instrument.
+            Called holding the IO lock.
+
+            Returns:
+                Whether the instrument is alive.
+        """
+        return self._instrument_is_connected()
+
+    def _reconnect_instrument(self) -> bool:
+        """ Entry point for the background reconnection attempts of the
+            connection supervisor.
+
+            Returns:
+                Whether the connection has been established.
+        """
+        self._shared_memory['reconnect_attempts'] = self._supervisor.attempts
+
+        self._instrument_disconnect()
+        self._instrument_connect()
+
+        return self._instrument_is_connected() and (
+            self._probe_command is None or self._instrument_probe())
+
+    def _probe_connection(self) -> None:
+        """ Entry point for the liveness probes of the connection
+            supervisor.
+        """
+        with self._io_lock:
+            if self._supervisor.state == ConnectionState.connected and \
+                    not self._instrument_probe():
+                self._connection_lost()
+
+    def _connection_lost(self,
+                         result: Optional[ServiceResponse] = None) -> None:
+        """ Close the lost connection to the instrument, to be reconnected
+            in background by the connection supervisor. Called holding the
+            IO lock.
+
+            Args:
+                result: The result of the failed request, if any.
+        """
+        self._instrument_disconnect()
+        self._supervisor.lost()
+
+        if result is not None:
+            result.type = ParameterType.error
+            result.value = 'Instrument connection lost, reconnecting'
+            self._log_error(result.value)
+
+    def _request_timeout(self, service_request: ServiceRequest,
+                         timeout: Optional[float]) -> Optional[float]:
+        """ Time in seconds to wait for the instrument: the given timeout,
+            shortened to the time left before the request deadline.
+
+            Args:
+                service_request: The current service request.
+                timeout: The configured timeout, None to wait indefinitely.
+        """
+        remaining = remaining_time(service_request.deadline)
+
+        if remaining is None:
+            return timeout
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
+
+    def _deadline_exceeded(self,
+                           service_request: ServiceRequest,
+                           result: ServiceResponse,
+                           reset_connection: bool = True) -> bool:
+        """ Answer with a timeout error the request whose deadline expired
+            while waiting for the instrument. Called holding the IO lock.
+
+            Args:
+                service_request: The current service request.
+                result: The result to be published.
+                reset_connection: Open again the connection, to discard the
+                                  late reply of the request.
+
+            Returns:
+                Whether the deadline has expired.
+        """
+        if not deadline_expired(service_request.deadline):
+            return False
+
+        result.type = ParameterType.error
+        result.value = 'Timeout'
+        self._log_error(f'Request timeout: {service_request.id}')
+
+        if reset_connection:
+            self._instrument_disconnect()
+            self._instrument_connect()
+
+            if self._supervisor is not None and \
+                    not self._instrument_is_connected():
+                self._supervisor.lost()
+
+        return True
+
+    def _connection_state_changed(self, state: ConnectionState) -> None:
+        """ Entry point for publishing the connection state changes """
+        self._shared_memory['connection_state'] = state.name
+
+        if state == ConnectionState.reconnecting:
+            self._log_warning('Instrument connection lost, reconnecting in '
+                              'background')
+        else:
+            self._log_info(f'Instrument connection state: {state.name}')
+
+        self._context.rx['io_result'].on_next(
+            ServiceResponse(provider=self._name,
+                            id='connection_state',
+                            type=ParameterType.get,
+                            value=state.name))
+
+    def _process_inst_plan(self, plan: CommandPlan,
+                           service_request: ServiceRequest,
+                           result: ServiceResponse) -> None:
+        """ Execute the command plan of a service request.
+
+        Args:
+            plan: The command plan of the requested service.
+            service_request: The current service request.
+            result: The result to be published.
+        """
+        for inst_cmd in plan.commands:
+            if self._plan_interrupted(service_request, result):
+                break
+
+            self._process_inst_command(inst_cmd.kind, inst_cmd,
+                                       service_request, result)
+
+    def _plan_interrupted(self, service_request: ServiceRequest,
+                          result: ServiceResponse) -> bool:
+        """ Whether the next command of a plan shall not be executed,
+            because the connection is lost or the request has expired.
+        """
+        if self._supervisor is not None and \
+                self._supervisor.state == ConnectionState.reconnecting:
+            return True
+
+        if deadline_expired(service_request.deadline):
+            # Expired while queued, or during the previous commands
+            if result.type != ParameterType.error:
+                result.type = ParameterType.error
+                result.value = 'Timeout'
+                self._log_error(f'Request timeout: {service_request.id}')
+            return True
+
+        return False
+
+    def _store_query_result(self, cmd: InstrumentCommand,
+                            service_request: ServiceRequest,
+                            result: ServiceResponse, value: Any) -> None:
+        """ Store the reply of a query. Setter replies are kept in the
+        parameter shared memory, if it has one, getter replies are
+        published in the result.
+        """
+        if service_request.type != ParameterType.set:
+            result.value = value
+        elif cmd.memory_slot is not None:
+            self._shared_memory[cmd.memory_slot] = value
+
+    def _process_inst_command(self, cmd_type: str, cmd: InstrumentCommand,
                               service_request: ServiceRequest,
                               result: ServiceResponse) -> None:
         pass
@@ -246,59 +964,103 @@ class InstrumentDriver(Component):
 
         result = ServiceResponse(provider=self._name,
                                  id=service_request.id,
-                                 type=service_request.type)
+                                 type=service_request.type,
+                                 request_id=service_request.request_id)
 
         self._service_preprocessing(service_request, result)
 
+        if self._supervisor is None:
+            self._execute_command(service_request, result)
+        else:
+            with self._io_lock:
+                self._execute_command(service_request, result)
+
+        if self._response_cache is not None:
+            self._cache_result(service_request, result)
+
+        self._publish_result(result)
+
+    def _execute_command(self, service_request: ServiceRequest,
+                         result: ServiceResponse) -> None:
+        """ Execute a service request on the instrument, or serve it from
+            memory.
+
+            Args:
+                service_request: The current service request.
+                result: The result to be published.
+        """
         if service_request.id == 'connect':
             if len(service_request.args) == 1:
                 if service_request.args[0] == '1':
-                    self._instrument_connect(result)
+                    if self._supervisor is None:
+                        self._instrument_connect(result)
+                    else:
+                        with self._supervisor.lock:
+                            self._instrument_connect(result)
+
+                            if self._instrument_is_connected():
+                                self._supervisor.connected()
+                            else:
+                                self._supervisor.lost()
                 elif service_request.args[0] == '0':
-                    self._instrument_disconnect(result)
+                    if self._supervisor is None:
+                        self._instrument_disconnect(result)
+                    else:
+                        with self._supervisor.lock:
+                            self._instrument_disconnect(result)
+                            self._supervisor.disconnected()
             else:
                 result.type = ParameterType.error
                 result.value = 'Wrong number of arguments'
                 self._log_error(result.value)
-        elif (service_request.type == ParameterType.get) and (
-                service_request.id
-                in self._shared_memory_getter) and self._parameter_info[
-                    (service_request.id,
-                     service_request.type)].get('instrument_command') is None:
-            result.value = self._shared_memory[self._shared_memory_getter[
-                service_request.id]]
-        elif self._parameter_info[(service_request.id, service_request.type
-                                   )].get('instrument_command') is None:
-            pass
+        else:
+            plan = self._validated_plan(service_request, result)
+
+            if plan is not None:
+                self._process_inst_plan(plan, service_request, result)
+
+    def _validated_plan(self, service_request: ServiceRequest,
+                        result: ServiceResponse) -> Optional[CommandPlan]:
+        """ Returns the command plan of a service request, if it can be
+            executed on the instrument. Otherwise, the request is served from
+            memory or answered with an error.
+
+            Args:
+                service_request: The current service request.
+                result: The result to be published.
+        """
+        plan = self._command_plans.get(
+            (service_request.id, service_request.type))
+
+        if plan is None:
+            # Services without instrument command are served from memory
+            if service_request.type == ParameterType.get and \
+                    service_request.id in self._shared_memory_getter:
+                result.value = self._shared_memory[
+                    self._shared_memory_getter[service_request.id]]
+        elif self._supervisor is not None and \
+                self._supervisor.state == ConnectionState.reconnecting:
+            # Fail fast, instead of waiting for the connection timeout
+            result.type = ParameterType.error
+            result.value = 'Instrument is unreachable, reconnecting'
+            self._log_error(result.value)
         elif self._inst is None:
             result.type = ParameterType.error
             result.value = 'Not possible to perform command before ' \
                            'connection is established'
             self._log_error(result.value)
         else:
-            inst_commands = self._parameter_info[(
-                service_request.id,
-                service_request.type)]['instrument_command']
-
-            param_sig = self._parameter_info[(
-                service_request.id, service_request.type)]['signature'][0]
-
-            if (len(param_sig) == 1) and (len(service_request.args) > 1):
+            if (plan.arity == 1) and (len(service_request.args) > 1):
                 service_request.args = [' '.join(service_request.args)]
-            elif len(param_sig) != len(service_request.args):
+            elif plan.arity != len(service_request.args):
                 result.type = ParameterType.error
                 result.value = 'Wrong number or arguments for ' \
                                f'{service_request.id}.\n Expected: ' \
-                               f'{param_sig};\n Received: ' \
+                               f'{plan.signature};\n Received: ' \
                                f'{service_request.args}'
                 self._log_error(result.value)
 
             if result.type != ParameterType.error:
-                for inst_cmd in inst_commands:
-                    cmd_type = list(inst_cmd.keys())[0]
-                    cmd = list(inst_cmd.values())[0]
-
-                    self._process_inst_command(cmd_type, cmd, service_request,
-                                               result)
+                return plan
 
-        self._context.rx['io_result'].on_next(result)
+        return None
@@ -7,29 +7,199 @@
 ############################################################################
 """ TCP Instrument driver controller base """
 
-from typing import Optional, Any
+from typing import Optional, List
 import socket
+import time
 
 from mamba.core.context import Context
 from mamba.core.exceptions import ComponentConfigException
 from mamba.core.component_base import InstrumentDriver
+from mamba.core.component_base.instrument_driver import InstrumentCommand, \
+    DEFAULT_MAX_MESSAGE_SIZE
 from mamba.core.msg import ServiceRequest, \
     ServiceResponse, ParameterType
 
 
+RECEIVE_CHUNK_SIZE = 4096
+
+
+class MessageTooLongError(ValueError):
+    """ Raised when a message exceeds the reader maximum message size """
+
+
+class TcpStreamReader:
+    """ Buffered reader of terminator framed messages from a stream socket.
+
+    Received bytes are stored with recv_into in a growable buffer, that is
+    kept between reads so that replies split across several segments are
+    reassembled and bytes received after a terminator are kept for the next
+    message.
+
+    Args:
+        sock: The connected stream socket.
+        terminator: The end of message bytes.
+        max_message_size: Maximum size in bytes of a message, without
+                          terminator.
+        timeout: Maximum time in seconds to receive a complete message. If
+                 None, only the socket timeout applies to every receive.
+    """
+    def __init__(self,
+                 sock: socket.socket,
+                 terminator: bytes,
+                 max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE,
+                 timeout: Optional[float] = None) -> None:
+        if len(terminator) == 0:
+            raise ValueError('Empty message terminator')
+
+        self._sock = sock
+        self._terminator = terminator
+        self._max_message_size = max_message_size
+        self._timeout = timeout
+
+        self._buffer = bytearray(RECEIVE_CHUNK_SIZE)
+        self._start = 0  # First byte of the pending message
+        self._end = 0  # End of the received bytes
+        self._scanned = 0  # Bytes before this index contain no terminator
+        self._discarding = False
+
+    def read_message(self, deadline: Optional[float] = None) -> bytes:
+        """ Returns the next message, without terminator. Blocks until a
+        complete message is received.
+
+        Args:
+            deadline: Absolute time.monotonic() time to stop waiting, if
+                      earlier than the reader timeout.
+
+        Raises:
+            socket.timeout: The message is not received before the timeout.
+            ConnectionResetError: The connection is closed by the peer.
+            MessageTooLongError: The message exceeds the maximum size. The
+                                 rest of the message is discarded.
+        """
+        if self._timeout is not None:
+            timeout_deadline = time.monotonic() + self._timeout
+            deadline = timeout_deadline if deadline is None else min(
+                deadline, timeout_deadline)
+
+        while True:
+            message = self._next_message()
+            if message is not None:
+                return message
+
+            self._receive(deadline)
+
+    def read_messages(self) -> List[bytes]:
+        """ Returns all the received messages, without terminator. Blocks
+        until at least one complete message is received.
+
+        Raises:
+            The same exceptions as read_message.
+        """
+        messages = [self.read_message()]
+
+        while True:
+            message = self._next_message()
+            if message is None:
+                return messages
+
+            messages.append(message)
+
+    def clear(self) -> None:
+        """ Discard all the received bytes """
+        self._start = self._end = self._scanned = 0
+        self._discarding = False
+
+    def _next_message(self) -> Optional[bytes]:
+        while True:
+            index = self._buffer.find(self._terminator, self._scanned,
+                                      self._end)
+
+            if index < 0:
+                # A terminator may be split between receives
+                self._scanned = max(self._start,
+                                    self._end - len(self._terminator) + 1)
+
+                if self._discarding:
+                    self._start = self._scanned
+                elif self._end - self._start > self._max_message_size:
+                    self._start = self._scanned
+                    self._discarding = True
+                    self._raise_too_long()
+
+                return None
+
+            message_start = self._start
+            self._start = self._scanned = index + len(self._terminator)
+
+            if self._start == self._end:
+                self._start = self._end = self._scanned = 0
+
+            if self._discarding:
+                self._discarding = False
+                continue
+
+            if index - message_start > self._max_message_size:
+                self._raise_too_long()
+
+            return bytes(self._buffer[message_start:index])
+
+    def _raise_too_long(self) -> None:
+        raise MessageTooLongError('Message exceeds the maximum size of '
+                                  f'{self._max_message_size} bytes')
+
+    def _receive(self, deadline: Optional[float]) -> None:
+        # Compact the pending bytes to the buffer beginning, or grow it
+        if len(self._buffer) - self._end < RECEIVE_CHUNK_SIZE:
+            if self._start > 0:
+                pending = self._end - self._start
+                self._buffer[:pending] = self._buffer[self._start:self._end]
+                self._scanned -= self._start
+                self._start, self._end = 0, pending
+
+            if len(self._buffer) - self._end < RECEIVE_CHUNK_SIZE:
+                self._buffer.extend(bytes(len(self._buffer)))
+
+        if deadline is None:
+            received = self._sock.recv_into(
+                memoryview(self._buffer)[self._end:])
+        else:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout('Message not received before timeout')
+
+            previous_timeout = self._sock.gettimeout()
+            self._sock.settimeout(remaining)
+            try:
+                received = self._sock.recv_into(
+                    memoryview(self._buffer)[self._end:])
+            finally:
+                self._sock.settimeout(previous_timeout)
+
+        if received == 0:
+            raise ConnectionResetError('Connection closed by the peer')
+
+        self._end += received
+
+
 def tcp_raw_write(sock: socket.socket, message: str, eom_w: str,
                   encoding: str) -> None:
     sock.sendall(bytes(f'{message}{eom_w}', encoding))
 
 
-def tcp_raw_query(sock: socket.socket, message: str, eom_w: str, eom_r: str,
-                  encoding: str) -> str:
+def tcp_raw_query(sock: socket.socket,
+                  reader: TcpStreamReader,
+                  message: str,
+                  eom_w: str,
+                  encoding: str,
+                  deadline: Optional[float] = None) -> str:
     sock.sendall(bytes(f'{message}{eom_w}', encoding))
-    return str(sock.recv(1024), encoding)[:-len(eom_r)]
+    return str(reader.read_message(deadline), encoding)
 
 
-def tcp_raw_read(sock: socket.socket, eom_r: str, encoding: str) -> str:
-    return str(sock.recv(1024), encoding)[:-len(eom_r)]
+def tcp_raw_read(reader: TcpStreamReader,
+                 encoding: str,
+                 deadline: Optional[float] = None) -> str:
+    return str(reader.read_message(deadline), encoding)
 
 
 class TcpInstrumentDriver(InstrumentDriver):
@@ -46,6 +216,22 @@ class TcpInstrumentDriver(InstrumentDriver):
                 'Missing port in Instrument Configuration')
 
         self._inst: Optional[socket.socket] = None
+        self._reader: Optional[TcpStreamReader] = None
+
+    def _reply_timeout(self) -> Optional[float]:
+        """ Time in seconds to wait for a reply, None to wait indefinitely """
+        return float(self._instrument.reply_timeout
+                     ) if self._instrument.reply_timeout is not None else None
+
+    def _new_reader(self, sock: socket.socket) -> TcpStreamReader:
+        """ Returns a reader of the instrument replies from the given socket
+        """
+        return TcpStreamReader(
+            sock,
+            bytes(self._instrument.terminator_read,
+                  self._instrument.encoding),
+            max_message_size=self._instrument.max_message_size,
+            timeout=self._reply_timeout())
 
     def _instrument_connect(self,
                             result: Optional[ServiceResponse] = None) -> None:
@@ -53,16 +239,26 @@ class TcpInstrumentDriver(InstrumentDriver):
             self._inst = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self._inst.connect(
                 (self._instrument.address, self._instrument.port))
+            self._reader = self._new_reader(self._inst)
+
+            if self._supervisor is not None:
+                # Let the system detect the loss of idle connections
+                self._inst.setsockopt(socket.SOL_SOCKET,
+                                      socket.SO_KEEPALIVE, 1)
 
             if result is not None and result.id in self._shared_memory_setter:
                 self._shared_memory[self._shared_memory_setter[result.id]] = 1
 
             if self._instrument.reply_timeout is not None:
-                self._inst.settimeout(float(self._instrument.reply_timeout))
+                self._inst.settimeout(self._reply_timeout())
 
             self._log_dev("Established connection to Instrument")
 
         except (ConnectionRefusedError, OSError):
+            if self._inst is not None:
+                self._inst.close()
+                self._inst = None
+
             error = 'Instrument is unreachable'
             if result is not None:
                 result.type = ParameterType.error
@@ -75,12 +271,37 @@ class TcpInstrumentDriver(InstrumentDriver):
         if self._inst is not None:
             self._inst.close()
             self._inst = None
+            self._reader = None
 
             if result is not None and result.id in self._shared_memory_setter:
                 self._shared_memory[self._shared_memory_setter[result.id]] = 0
             self._log_dev("Closed connection to Instrument")
 
-    def _process_inst_command(self, cmd_type: str, cmd: Any,
+    def _instrument_probe(self) -> bool:
+        if self._inst is None:
+            return False
+
+        try:
+            if self._probe_command is not None:
+                tcp_raw_query(self._inst, self._reader, self._probe_command,
+                              self._instrument.terminator_write,
+                              self._instrument.encoding)
+                return True
+
+            # Without probe command, check the connection has not been
+            # closed by the peer, without consuming any pending reply
+            timeout = self._inst.gettimeout()
+            self._inst.setblocking(False)
+            try:
+                return len(self._inst.recv(1, socket.MSG_PEEK)) > 0
+            except BlockingIOError:
+                return True
+            finally:
+                self._inst.settimeout(timeout)
+        except (OSError, MessageTooLongError):
+            return False
+
+    def _process_inst_command(self, cmd_type: str, cmd: InstrumentCommand,
                               service_request: ServiceRequest,
                               result: ServiceResponse) -> None:
         connection_attempts = 0
@@ -93,24 +314,33 @@ class TcpInstrumentDriver(InstrumentDriver):
                 try:
                     if cmd_type == 'query':
                         value = tcp_raw_query(
-                            self._inst, cmd.format(*service_request.args),
+                            self._inst, self._reader,
+                            cmd.render(service_request.args),
                             self._instrument.terminator_write,
-                            self._instrument.terminator_read,
-                            self._instrument.encoding)
+                            self._instrument.encoding,
+                            service_request.deadline)
 
-                        if service_request.type == ParameterType.set:
-                            self._shared_memory[self._shared_memory_setter[
-                                service_request.id]] = value
-                        else:
-                            result.value = value
+                        self._store_query_result(cmd, service_request, result,
+                                                 value)
 
                     elif cmd_type == 'write':
                         tcp_raw_write(self._inst,
-                                      cmd.format(*service_request.args),
+                                      cmd.render(service_request.args),
                                       self._instrument.terminator_write,
                                       self._instrument.encoding)
 
+                except MessageTooLongError as exc:
+                    result.type = ParameterType.error
+                    result.value = str(exc)
+                    self._log_error(result.value)
                 except (ConnectionRefusedError, OSError):
+                    if self._deadline_exceeded(service_request, result):
+                        return
+
+                    if self._supervisor is not None:
+                        self._connection_lost(result)
+                        return
+
                     self._instrument_disconnect()
                     self._instrument_connect()
                     continue
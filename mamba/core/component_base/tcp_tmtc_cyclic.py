@@ -7,44 +7,154 @@
 ############################################################################
 """ Single Port TCP controller base """
 
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple, Any
+from string import Formatter
+import itertools
 import socket
 import threading
+import time
 
+import numpy
+from rx.disposable import Disposable
 from stringparser import Parser
 
 from mamba.core.component_base import TcpInstrumentDriver
+from mamba.core.component_base.tcp_instrument_driver import \
+    TcpStreamReader, MessageTooLongError
+from mamba.core.component_base.instrument_driver import CommandPlan
 from mamba.core.context import Context
-from mamba.core.msg import ServiceResponse, ParameterType
+from mamba.core.exceptions import ComponentConfigException
+from mamba.core.msg import ServiceRequest, ServiceResponse, \
+    ParameterType, Empty
+from mamba.core.parameter_history import ParameterHistory
+from mamba.core.telemetry_throttle import TelemetryThrottle, PublishPolicy
+
+# Getter services of the parameter histories: id suffix, signature and
+# description
+HISTORY_SERVICES = {
+    'last': ([{
+        'count': {
+            'type': 'int'
+        }
+    }], 'Last samples of {key}, as timestamp and value rows'),
+    'range': ([{
+        'start': {
+            'type': 'float'
+        }
+    }, {
+        'end': {
+            'type': 'float'
+        }
+    }], 'Samples of {key} between two epoch times, as timestamp and value '
+        'rows'),
+    'stats': ([{
+        'window': {
+            'type': 'float'
+        }
+    }], 'Minimum, maximum and mean of {key} in the last window seconds'),
+}
+
+
+def literal_tag(tm_format: str) -> Optional[str]:
+    """ First word of a telemetry format, if it is literal text.
+
+    Returns:
+        The leading tag of the lines matching the format, None if the
+        format starts with a replacement field.
+    """
+    literal = ''
+
+    for text, field, _, _ in Formatter().parse(tm_format):
+        literal += text
+
+        if field is not None:
+            if ' ' not in literal:
+                return None
+            break
+
+    return literal.split(' ', 1)[0]
+
+
+class CyclicTmParser:
+    """ Parser of the cyclic telemetry lines of an instrument.
+
+    The formats are compiled once, and indexed by their leading tag, so
+    that every line is parsed only with the formats of its tag. Formats
+    starting with a replacement field are tried on every line.
+
+    Args:
+        cyclic_tm_mapping: Telemetry format of each parameter.
+    """
+    def __init__(self, cyclic_tm_mapping: Dict[str, str]) -> None:
+        self._index: Dict[str, List[Tuple[str, Parser]]] = {}
+        self._untagged: List[Tuple[str, Parser]] = []
+
+        for key, tm_format in cyclic_tm_mapping.items():
+            tag = literal_tag(tm_format)
+
+            if tag is None:
+                self._untagged.append((key, Parser(tm_format)))
+            else:
+                self._index.setdefault(tag, []).append(
+                    (key, Parser(tm_format)))
+
+        # Number of received lines not matching any format
+        self.unparsed: int = 0
+
+    def parse(self, line: str) -> List[Tuple[str, Any]]:
+        """ Parse a telemetry line.
+
+        Returns:
+            The parameters of the formats matching the line, with their
+            values.
+        """
+        values = []
+
+        for key, parser in itertools.chain(
+                self._index.get(line.split(' ', 1)[0], ()), self._untagged):
+            try:
+                values.append((key, parser(line)))
+            except ValueError:
+                continue
+
+        if not values:
+            self.unparsed += 1
+
+        return values
 
 
 class ThreadedCyclicTmHandler:
     def __init__(self, sock, eom, shared_memory, rx, log_info,
-                 cyclic_tm_mapping, provider):
+                 cyclic_tm_parser, provider, history):
+        reader = TcpStreamReader(sock, bytes(eom, 'utf-8'))
+
         while True:
             try:
-                # self.request is the TCP socket connected to the client
-                data = str(sock.recv(1024), 'utf-8')
-                if not data:
-                    break
+                messages = reader.read_messages()
+            except MessageTooLongError:
+                cyclic_tm_parser.unparsed += 1
+                continue
+            except OSError:
+                break
 
-                for cmd in data.split(eom)[:-1]:
-                    for key, val in cyclic_tm_mapping.items():
-                        try:
-                            shared_memory[key] = Parser(val)(cmd)
+            timestamp = time.time()
 
-                            result = ServiceResponse(provider=provider,
-                                                     id=key,
-                                                     type=ParameterType.get,
-                                                     value=shared_memory[key])
+            for message in messages:
+                for key, value in cyclic_tm_parser.parse(
+                        str(message, 'utf-8', 'replace')):
+                    shared_memory[key] = value
 
-                            rx['io_result'].on_next(result)
+                    if key in history:
+                        history[key].append(timestamp, value)
 
-                        except ValueError:
-                            continue
+                    result = ServiceResponse(provider=provider,
+                                             id=key,
+                                             type=ParameterType.get,
+                                             value=value)
 
-            except OSError:
-                break
+                    # Published to io_result by the component, according
+                    # to the parameter publish policy
+                    rx['io_result_raw'].on_next(result)
 
         log_info('Remote Cyclic TM socket connection has been closed')
 
@@ -66,8 +176,29 @@ class TcpTmTcCyclic(TcpInstrumentDriver):
         self._inst_cyclic_tm_thread: Optional[threading.Thread] = None
 
         self._cyclic_tm_mapping: Dict[str, str] = {}
+        self._cyclic_tm_parser = CyclicTmParser({})
         self._cyclic_tm_class = cyclic_tm_class
 
+        # Sample history of the parameters with a history block, and the
+        # parameter and kind of each history service
+        self._history: Dict[str, ParameterHistory] = {}
+        self._history_services: Dict[str, Tuple[str, str]] = {}
+
+        # Publish policy of the cyclic telemetries on io_result
+        self._publish_policies: Dict[str, PublishPolicy] = {}
+        self._throttle: Optional[TelemetryThrottle] = None
+        self._telemetry_route: Optional[Disposable] = None
+
+    def _close(self, rx_value: Optional[Empty] = None) -> None:
+        if self._telemetry_route is not None:
+            self._telemetry_route.dispose()
+            self._telemetry_route = None
+
+        if self._throttle is not None:
+            self._throttle.close()
+
+        super()._close(rx_value)
+
     def _instrument_connect(self,
                             result: Optional[ServiceResponse] = None) -> None:
         try:
@@ -78,6 +209,7 @@ class TcpTmTcCyclic(TcpInstrumentDriver):
 
             self._inst.connect(
                 (self._instrument.address, self._instrument.tc_port))
+            self._reader = self._new_reader(self._inst)
 
             self._inst_cyclic_tm = socket.socket(socket.AF_INET,
                                                  socket.SOCK_STREAM)
@@ -92,7 +224,7 @@ class TcpTmTcCyclic(TcpInstrumentDriver):
                 target=self._cyclic_tm_class,
                 args=(self._inst_cyclic_tm, self._instrument.terminator_read,
                       self._shared_memory, self._context.rx, self._log_info,
-                      self._cyclic_tm_mapping, self._name))
+                      self._cyclic_tm_parser, self._name, self._history))
 
             self._inst_cyclic_tm_thread.start()
 
@@ -117,12 +249,143 @@ class TcpTmTcCyclic(TcpInstrumentDriver):
             if len(tm_format) > 0:
                 self._cyclic_tm_mapping[key] = tm_format
 
+        # Compile the telemetry formats once, instead of on every line
+        self._cyclic_tm_parser = CyclicTmParser(self._cyclic_tm_mapping)
+
+        self._throttle = TelemetryThrottle(self._publish_policies,
+                                           self._publish_telemetry)
+
+        # Every received telemetry is published on io_result_raw, for the
+        # consumers of all the samples
+        self._telemetry_route = self._context.rx[
+            'io_result_raw'].subscribe_route(self._name,
+                                             self._received_telemetry)
+
+    def _register_services(self) -> None:
+        super()._register_services()
+
+        for key, parameter_info in self._configuration['parameters'].items():
+            cyclic_tm = parameter_info.get('cyclic_tm_client') or {}
+
+            if 'publish' in cyclic_tm:
+                self._publish_policies[key] = PublishPolicy.from_config(
+                    cyclic_tm['publish'], key, self._name)
+
+            if 'history' not in cyclic_tm:
+                continue
+
+            self._history[key] = ParameterHistory.from_config(
+                cyclic_tm['history'], key, self._name)
+
+            for kind, (signature, description) in HISTORY_SERVICES.items():
+                service_id = f'{key}_history_{kind}'
+
+                if (service_id, ParameterType.get) in self._parameter_info:
+                    raise ComponentConfigException(
+                        f'In service {self._name} : "{key}" history service '
+                        f'"{service_id}" conflicts with another parameter')
+
+                self._parameter_info[(service_id, ParameterType.get)] = {
+                    'description': description.format(key=key),
+                    'signature': [signature, 'ndarray'],
+                    'instrument_command': None,
+                    'type': ParameterType.get,
+                }
+                self._history_services[service_id] = (key, kind)
+
+        if self._publish_policies:
+            self._register_metric(
+                'cyclic_tm_dropped',
+                'Number of cyclic telemetry samples not published by the '
+                'max rate or deadband policies',
+                value_type='int')
+            self._register_metric(
+                'cyclic_tm_conflated',
+                'Number of cyclic telemetry samples replaced by a later '
+                'one before being published',
+                value_type='int')
+
+    def _received_telemetry(self, result: ServiceResponse) -> None:
+        """ Entry point for publishing the received cyclic telemetries on
+            io_result, according to their publish policy.
+
+            Args:
+                result: The received telemetry.
+        """
+        if result.id not in self._publish_policies:
+            self._context.rx['io_result'].on_next(result)
+            return
+
+        self._throttle.offer(result.id, result.value)
+
+        self._shared_memory.update(
+            cyclic_tm_dropped=self._throttle.dropped,
+            cyclic_tm_conflated=self._throttle.conflated)
+
+    def _publish_telemetry(self, key: str, value: Any) -> None:
+        self._context.rx['io_result'].on_next(
+            ServiceResponse(provider=self._name,
+                            id=key,
+                            type=ParameterType.get,
+                            value=value))
+
+    def _validated_plan(self, service_request: ServiceRequest,
+                        result: ServiceResponse) -> Optional[CommandPlan]:
+        if service_request.type == ParameterType.get and \
+                service_request.id in self._history_services:
+            self._serve_history(service_request, result)
+            return None
+
+        return super()._validated_plan(service_request, result)
+
+    def _serve_history(self, service_request: ServiceRequest,
+                       result: ServiceResponse) -> None:
+        """ Serve a history service from the parameter sample history.
+
+            Args:
+                service_request: The current service request.
+                result: The result to be published.
+        """
+        key, kind = self._history_services[service_request.id]
+        history = self._history[key]
+
+        try:
+            if kind == 'last':
+                (count, ) = service_request.args
+                timestamps, values = history.last(int(count))
+            elif kind == 'range':
+                start, end = service_request.args
+                timestamps, values = history.between(float(start), float(end))
+            else:
+                (window, ) = service_request.args
+                now = time.time()
+                stats = history.stats(now - float(window), now)
+
+                if stats is None:
+                    result.type = ParameterType.error
+                    result.value = f'No samples of {key} in the window'
+                    self._log_error(result.value)
+                else:
+                    result.value = stats
+                return
+        except ValueError:
+            result.type = ParameterType.error
+            result.value = 'Wrong number or arguments for ' \
+                           f'{service_request.id}.\n Expected: ' \
+                           f'{HISTORY_SERVICES[kind][0]};\n Received: ' \
+                           f'{service_request.args}'
+            self._log_error(result.value)
+            return
+
+        result.value = numpy.column_stack((timestamps, values))
+
     def _instrument_disconnect(self,
                                result: Optional[ServiceResponse] = None
                                ) -> None:
         if self._inst is not None:
             self._inst.close()
             self._inst = None
+            self._reader = None
 
         if self._inst_cyclic_tm is not None:
             self._inst_cyclic_tm.close()
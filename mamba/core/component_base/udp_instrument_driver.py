@@ -7,34 +7,201 @@
 ############################################################################
 """ UDP Instrument driver controller base """
 
-from typing import Optional, Any
+from typing import Optional, Dict, List
+import itertools
 import socket
+import threading
 
 from mamba.core.context import Context
 from mamba.core.exceptions import ComponentConfigException
 from mamba.core.component_base import InstrumentDriver
+from mamba.core.component_base.instrument_driver import InstrumentCommand
 from mamba.core.msg import ServiceRequest, \
     ServiceResponse, ParameterType
 
+DEFAULT_REPLY_TIMEOUT = 5
+MAX_DATAGRAM_SIZE = 65535
 
-def udp_raw_write(message: str, eom_w: str, encoding: str, ip: str,
-                  port: int) -> None:
-    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-        sock.sendto(bytes(f'{message}{eom_w}', encoding), (ip, port))
+# Prefix of the sequence tag of tagged queries and replies, e.g. '#12 IDN?'
+SEQUENCE_TAG_PREFIX = '#'
 
+# Period in seconds the receiver thread checks if the channel is closed
+RECEIVER_POLL_PERIOD = 0.5
 
-def udp_raw_query(message: str,
-                  eom_w: str,
-                  eom_r: str,
-                  encoding: str,
-                  ip: str,
-                  port: int,
-                  timeout: Optional[int] = None) -> str:
-    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-        sock.sendto(bytes(f'{message}{eom_w}', encoding), (ip, port))
-        timeout = 5 if timeout is None else timeout
-        sock.settimeout(float(timeout))
-        return str(sock.recv(1024), encoding)[:-len(eom_r)]
+
+def udp_raw_write(sock: socket.socket, message: str, eom_w: str,
+                  encoding: str) -> None:
+    sock.send(bytes(f'{message}{eom_w}', encoding))
+
+
+def udp_raw_read(sock: socket.socket, eom_r: str, encoding: str) -> str:
+    reply = str(sock.recv(MAX_DATAGRAM_SIZE), encoding)
+    return reply[:-len(eom_r)] if reply.endswith(eom_r) else reply
+
+
+class UdpDatagramChannel:
+    """ Connected datagram socket to an instrument, kept open between
+    commands.
+
+    Untagged queries are serialized, and the datagrams received before
+    sending a query, as late replies of timed out queries, are discarded.
+    With sequence tags, every query is prefixed with a unique tag that the
+    instrument echoes in its reply, so that several queries can be
+    outstanding at once and a receiver thread delivers every reply to its
+    query.
+
+    Args:
+        address: Instrument address.
+        port: Instrument port.
+        eom_w: Write terminator.
+        eom_r: Read terminator.
+        encoding: Messages encoding.
+        timeout: Maximum time in seconds to wait for a reply.
+        sequence_tag: Whether queries and replies carry a sequence tag.
+    """
+    def __init__(self,
+                 address: str,
+                 port: int,
+                 eom_w: str,
+                 eom_r: str,
+                 encoding: str,
+                 timeout: float = DEFAULT_REPLY_TIMEOUT,
+                 sequence_tag: bool = False) -> None:
+        self._eom_w = eom_w
+        self._eom_r = eom_r
+        self._encoding = encoding
+        self._timeout = timeout
+        self._sequence_tag = sequence_tag
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.connect((address, port))
+        self._sock.settimeout(RECEIVER_POLL_PERIOD if sequence_tag else
+                              timeout)
+
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Outstanding tagged queries, by tag: [reply event, reply]
+        self._tags = itertools.count(1)
+        self._pending: Dict[str, List] = {}
+        self._receiver: Optional[threading.Thread] = None
+
+        # Number of discarded stale or unexpected datagrams
+        self.discarded: int = 0
+
+        if sequence_tag:
+            self._receiver = threading.Thread(target=self._receive_replies)
+            self._receiver.daemon = True
+            self._receiver.start()
+
+    @property
+    def timeout(self) -> float:
+        """ Time in seconds to wait for a reply """
+        return self._timeout
+
+    def write(self, message: str) -> None:
+        """ Send a command without reply """
+        udp_raw_write(self._sock, message, self._eom_w, self._encoding)
+
+    def query(self, message: str, timeout: Optional[float] = None) -> str:
+        """ Send a command and return its reply.
+
+        Args:
+            message: The command.
+            timeout: Time in seconds to wait for the reply, if not the
+                     channel timeout.
+
+        Raises:
+            socket.timeout: The reply is not received before the timeout.
+            OSError: The instrument is not reachable.
+        """
+        if timeout is None:
+            timeout = self._timeout
+
+        if self._sequence_tag:
+            return self._tagged_query(message, timeout)
+
+        with self._lock:
+            self._discard_stale()
+            self._sock.settimeout(timeout)
+            try:
+                udp_raw_write(self._sock, message, self._eom_w,
+                              self._encoding)
+                return udp_raw_read(self._sock, self._eom_r, self._encoding)
+            finally:
+                self._sock.settimeout(self._timeout)
+
+    def close(self) -> None:
+        """ Close the socket and stop the receiver thread """
+        self._closed = True
+        self._sock.close()
+
+        if self._receiver is not None and \
+                self._receiver is not threading.current_thread():
+            self._receiver.join()
+
+    def _discard_stale(self) -> None:
+        self._sock.setblocking(False)
+
+        try:
+            while True:
+                self._sock.recv(MAX_DATAGRAM_SIZE)
+                self.discarded += 1
+        except (BlockingIOError, ConnectionRefusedError):
+            pass  # No more datagrams, or error of a previous datagram
+        finally:
+            self._sock.settimeout(self._timeout)
+
+    def _tagged_query(self, message: str, timeout: float) -> str:
+        tag = f'{SEQUENCE_TAG_PREFIX}{next(self._tags)}'
+        slot = [threading.Event(), None]
+
+        with self._lock:
+            self._pending[tag] = slot
+
+        try:
+            udp_raw_write(self._sock, f'{tag} {message}', self._eom_w,
+                          self._encoding)
+
+            if not slot[0].wait(timeout):
+                raise socket.timeout('Reply not received before timeout')
+
+            if isinstance(slot[1], Exception):
+                raise slot[1]
+
+            return slot[1]
+        finally:
+            with self._lock:
+                self._pending.pop(tag, None)
+
+    def _receive_replies(self) -> None:
+        while not self._closed:
+            try:
+                reply = udp_raw_read(self._sock, self._eom_r, self._encoding)
+            except socket.timeout:
+                continue
+            except OSError as exc:
+                if self._closed:
+                    return
+
+                # Wake up the outstanding queries, e.g. port unreachable
+                with self._lock:
+                    for slot in self._pending.values():
+                        slot[1] = exc
+                        slot[0].set()
+                continue
+
+            tag, _, value = reply.partition(' ')
+
+            with self._lock:
+                slot = self._pending.get(tag)
+
+                if slot is None:
+                    # Reply of an expired query or unexpected datagram
+                    self.discarded += 1
+                else:
+                    slot[1] = value
+                    slot[0].set()
 
 
 class UdpInstrumentDriver(InstrumentDriver):
@@ -51,8 +218,59 @@ class UdpInstrumentDriver(InstrumentDriver):
                 'Missing port in Instrument Configuration')
 
         self._inst = 1
+        self._channel: Optional[UdpDatagramChannel] = None
+        self._sequence_tag: bool = bool(
+            (self._configuration.get('instrument')
+             or {}).get('sequence_tag', False))
 
-    def _process_inst_command(self, cmd_type: str, cmd: Any,
+    def _instrument_connect(self,
+                            result: Optional[ServiceResponse] = None) -> None:
+        try:
+            self._channel = UdpDatagramChannel(
+                self._instrument.address,
+                self._instrument.port,
+                self._instrument.terminator_write,
+                self._instrument.terminator_read,
+                self._instrument.encoding,
+                timeout=float(self._instrument.reply_timeout
+                              or DEFAULT_REPLY_TIMEOUT),
+                sequence_tag=self._sequence_tag)
+
+            self._log_dev("Opened socket to Instrument")
+
+        except OSError:
+            error = 'Instrument is unreachable'
+            if result is not None:
+                result.type = ParameterType.error
+                result.value = error
+            self._log_error(error)
+
+    def _instrument_disconnect(self,
+                               result: Optional[ServiceResponse] = None
+                               ) -> None:
+        if self._channel is not None:
+            self._channel.close()
+            self._channel = None
+            self._log_dev("Closed socket to Instrument")
+
+    def _instrument_is_connected(self) -> bool:
+        return self._channel is not None
+
+    def _instrument_probe(self) -> bool:
+        if self._channel is None:
+            return False
+
+        if self._probe_command is None:
+            # Datagrams give no evidence of the instrument liveness
+            return True
+
+        try:
+            self._channel.query(self._probe_command)
+            return True
+        except OSError:
+            return False
+
+    def _process_inst_command(self, cmd_type: str, cmd: InstrumentCommand,
                               service_request: ServiceRequest,
                               result: ServiceResponse) -> None:
         connection_attempts = 0
@@ -62,30 +280,36 @@ class UdpInstrumentDriver(InstrumentDriver):
             connection_attempts += 1
 
             if self._inst is not None:
+                if self._channel is None:
+                    self._instrument_connect()
+
                 try:
+                    if self._channel is None:
+                        raise ConnectionRefusedError
+
                     if cmd_type == 'query':
-                        value = udp_raw_query(
-                            cmd.format(*service_request.args),
-                            self._instrument.terminator_write,
-                            self._instrument.terminator_read,
-                            self._instrument.encoding,
-                            self._instrument.address, self._instrument.port,
-                            self._instrument.reply_timeout)
-
-                        if service_request.type == ParameterType.set:
-                            self._shared_memory[self._shared_memory_setter[
-                                service_request.id]] = value
-                        else:
-                            result.value = value
+                        value = self._channel.query(
+                            cmd.render(service_request.args),
+                            self._request_timeout(service_request,
+                                                  self._channel.timeout))
+
+                        self._store_query_result(cmd, service_request, result,
+                                                 value)
 
                     elif cmd_type == 'write':
-                        udp_raw_write(cmd.format(*service_request.args),
-                                      self._instrument.terminator_write,
-                                      self._instrument.encoding,
-                                      self._instrument.address,
-                                      self._instrument.port)
+                        self._channel.write(cmd.render(service_request.args))
 
                 except (ConnectionRefusedError, OSError):
+                    # Late replies are discarded by the channel
+                    if self._deadline_exceeded(service_request,
+                                               result,
+                                               reset_connection=False):
+                        return
+
+                    if self._supervisor is not None:
+                        self._connection_lost(result)
+                        return
+
                     self._instrument_disconnect()
                     self._instrument_connect()
                     continue
@@ -9,15 +9,35 @@
 
 from typing import Optional
 import os
+import numpy
 import pyvisa
 
 from mamba.core.context import Context
 from mamba.core.component_base import InstrumentDriver
+from mamba.core.component_base.instrument_driver import InstrumentCommand
 from mamba.core.exceptions import ComponentConfigException
 from mamba.core.msg import ServiceRequest, Empty, \
     ServiceResponse, ParameterType
 from mamba.core.utils import path_from_string
 
+# VISA timeout of the instrument operations, in milliseconds
+DEFAULT_TIMEOUT = 3000
+
+# Element formats of the binary block transfers, by NumPy data type name
+BINARY_DATATYPES = {
+    'int8': 'b',
+    'uint8': 'B',
+    'int16': 'h',
+    'uint16': 'H',
+    'int32': 'i',
+    'uint32': 'I',
+    'int64': 'q',
+    'uint64': 'Q',
+    'float32': 'f',
+    'float64': 'd',
+}
+BYTE_ORDERS = ('little', 'big')
+
 
 def get_visa_sim_file(sim_path: Optional[str],
                       config_folder: str) -> Optional[str]:
@@ -52,6 +72,11 @@ class VisaInstrumentDriver(InstrumentDriver):
         self._simulation_file = get_visa_sim_file(self._instrument.visa_sim,
                                                   self._config_folder)
 
+        for (service_id, _), plan in self._command_plans.items():
+            for cmd in plan.commands:
+                if cmd.kind == 'query_binary':
+                    self._validate_binary_query(service_id, cmd)
+
     def _instrument_connect(self,
                             result: Optional[ServiceResponse] = None) -> None:
         if self._instrument.visa_sim:
@@ -74,7 +99,7 @@ class VisaInstrumentDriver(InstrumentDriver):
                 self._log_error(error)
 
         if self._inst is not None:
-            self._inst.timeout = 3000  # Default timeout
+            self._inst.timeout = DEFAULT_TIMEOUT
 
             if result is not None and result.id in self._shared_memory_setter:
                 self._shared_memory[self._shared_memory_setter[result.id]] = 1
@@ -91,25 +116,62 @@ class VisaInstrumentDriver(InstrumentDriver):
                 self._shared_memory[self._shared_memory_setter[result.id]] = 0
             self._log_dev("Closed connection to Instrument")
 
-    def _process_inst_command(self, cmd_type: str, cmd: str,
+    def _validate_binary_query(self, service_id: str,
+                               cmd: InstrumentCommand) -> None:
+        if not isinstance(cmd.command, dict) or 'command' not in cmd.command:
+            raise ComponentConfigException(
+                f'In service {self._name} : "{service_id}" binary query '
+                f'has no command')
+
+        if cmd.command.get('dtype', 'float32') not in BINARY_DATATYPES:
+            raise ComponentConfigException(
+                f'In service {self._name} : "{service_id}" binary query '
+                f'dtype shall be one of: {", ".join(BINARY_DATATYPES)}')
+
+        if cmd.command.get('byte_order', 'little') not in BYTE_ORDERS:
+            raise ComponentConfigException(
+                f'In service {self._name} : "{service_id}" binary query '
+                f'byte_order shall be one of: {", ".join(BYTE_ORDERS)}')
+
+    def _process_inst_command(self, cmd_type: str, cmd: InstrumentCommand,
                               service_request: ServiceRequest,
                               result: ServiceResponse) -> None:
         if self._inst is not None:
+            if service_request.deadline is not None:
+                # Wait for the instrument until the request deadline at most
+                self._inst.timeout = max(
+                    1,
+                    int(1000 * self._request_timeout(
+                        service_request, DEFAULT_TIMEOUT / 1000)))
+
             try:
-                self._log_dev(cmd.format(*service_request.args))
+                if cmd_type == 'query_binary':
+                    message = cmd.render_field('command', service_request.args)
+                else:
+                    message = cmd.render(service_request.args)
+
+                self._log_dev(message)
 
                 if cmd_type == 'query':
-                    value = self._inst.query(
-                        cmd.format(*service_request.args)).replace(' ', '_')
+                    value = self._inst.query(message).replace(' ', '_')
+
+                    self._store_query_result(cmd, service_request, result,
+                                             value)
+
+                elif cmd_type == 'query_binary':
+                    # IEEE-488.2 definite length block, read into an array
+                    value = self._inst.query_binary_values(
+                        message,
+                        datatype=BINARY_DATATYPES[cmd.command.get(
+                            'dtype', 'float32')],
+                        is_big_endian=cmd.command.get('byte_order') == 'big',
+                        container=numpy.array)
 
-                    if service_request.type == ParameterType.set:
-                        self._shared_memory[self._shared_memory_setter[
-                            service_request.id]] = value
-                    else:
-                        result.value = value
+                    self._store_query_result(cmd, service_request, result,
+                                             value)
 
                 elif cmd_type == 'write':
-                    self._inst.write(cmd.format(*service_request.args))
+                    self._inst.write(message)
 
             except OSError:
                 result.type = ParameterType.error
@@ -117,9 +179,13 @@ class VisaInstrumentDriver(InstrumentDriver):
                                ' instrument'
                 self._log_error(result.value)
             except pyvisa.errors.VisaIOError:
-                result.type = ParameterType.error
-                result.value = 'Query timeout'
-                self._log_error(result.value)
+                if not self._deadline_exceeded(service_request, result):
+                    result.type = ParameterType.error
+                    result.value = 'Query timeout'
+                    self._log_error(result.value)
+            finally:
+                if self._inst is not None:
+                    self._inst.timeout = DEFAULT_TIMEOUT
         else:
             result.type = ParameterType.error
             result.value = 'Not possible to perform command before ' \
@@ -8,15 +8,37 @@
 """ TCP Instrument driver controller base """
 
 from typing import Optional
-import xmlrpc
+import xmlrpc.client
 
 from mamba.core.context import Context
 from mamba.core.exceptions import ComponentConfigException
 from mamba.core.component_base import InstrumentDriver
+from mamba.core.component_base.instrument_driver import InstrumentCommand, \
+    CommandPlan
 from mamba.core.msg import ServiceRequest, \
     ServiceResponse, ParameterType
 
 
+class TimeoutTransport(xmlrpc.client.Transport):
+    """ XML-RPC transport with a socket timeout, that can be changed
+    between calls.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+
+        # Socket timeout in seconds of the next calls, None to block
+        self.timeout: Optional[float] = None
+
+    def make_connection(self, host):
+        conn = super().make_connection(host)
+        conn.timeout = self.timeout
+
+        if conn.sock is not None:
+            conn.sock.settimeout(self.timeout)
+
+        return conn
+
+
 class XmlRpcInstrumentDriver(InstrumentDriver):
     """ VISA Instrument driver controller class """
     def __init__(self,
@@ -30,12 +52,22 @@ class XmlRpcInstrumentDriver(InstrumentDriver):
             raise ComponentConfigException(
                 'Missing port in Instrument Configuration')
 
+        # Whether command plans are sent in one system.multicall request
+        self._multicall: bool = bool(
+            (self._configuration.get('instrument')
+             or {}).get('multicall', False))
+
+        # Transport keeping the connection alive between calls
+        self._transport: Optional[TimeoutTransport] = None
+
     def _instrument_connect(self,
                             result: Optional[ServiceResponse] = None) -> None:
         try:
             server_addr = f'http://{self._instrument.address}:' \
                           f'{self._instrument.port}'
-            self._inst = xmlrpc.client.ServerProxy(server_addr)
+            self._transport = TimeoutTransport()
+            self._inst = xmlrpc.client.ServerProxy(server_addr,
+                                                   transport=self._transport)
 
             if result is not None and result.id in self._shared_memory_setter:
                 self._shared_memory[self._shared_memory_setter[result.id]] = 1
@@ -52,6 +84,10 @@ class XmlRpcInstrumentDriver(InstrumentDriver):
     def _instrument_disconnect(self,
                                result: Optional[ServiceResponse] = None
                                ) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
         if self._inst is not None:
             self._inst = None
 
@@ -59,24 +95,62 @@ class XmlRpcInstrumentDriver(InstrumentDriver):
                 self._shared_memory[self._shared_memory_setter[result.id]] = 0
             self._log_dev("Closed connection to Instrument")
 
-    def _process_inst_command(self, cmd_type: str, cmd: str,
+    def _process_inst_plan(self, plan: CommandPlan,
+                           service_request: ServiceRequest,
+                           result: ServiceResponse) -> None:
+        if not self._multicall or len(plan.commands) < 2:
+            super()._process_inst_plan(plan, service_request, result)
+            return
+
+        if self._inst is None:
+            result.type = ParameterType.error
+            result.value = 'Not possible to perform command before ' \
+                           'connection is established'
+            self._log_error(result.value)
+            return
+
+        self._transport.timeout = self._request_timeout(service_request, None)
+        multicall = xmlrpc.client.MultiCall(self._inst)
+
+        for inst_cmd in plan.commands:
+            getattr(multicall, inst_cmd.kind)(
+                inst_cmd.render(service_request.args))
+
+        try:
+            for inst_cmd, value in zip(plan.commands, multicall()):
+                if inst_cmd.kind == 'query':
+                    self._store_query_result(inst_cmd, service_request,
+                                             result, value)
+        except (OSError, xmlrpc.client.Fault):
+            if self._deadline_exceeded(service_request, result):
+                return
+
+            result.type = ParameterType.error
+            result.value = 'Not possible to communicate to the' \
+                           ' instrument'
+            self._log_error(result.value)
+
+    def _process_inst_command(self, cmd_type: str, cmd: InstrumentCommand,
                               service_request: ServiceRequest,
                               result: ServiceResponse) -> None:
         if self._inst is not None:
+            self._transport.timeout = self._request_timeout(
+                service_request, None)
+
             try:
                 if cmd_type == 'query':
-                    value = self._inst.query(cmd.format(*service_request.args))
+                    value = self._inst.query(cmd.render(service_request.args))
 
-                    if service_request.type == ParameterType.set:
-                        self._shared_memory[self._shared_memory_setter[
-                            service_request.id]] = value
-                    else:
-                        result.value = value
+                    self._store_query_result(cmd, service_request, result,
+                                             value)
 
                 elif cmd_type == 'write':
-                    self._inst.write(cmd.format(*service_request.args))
+                    self._inst.write(cmd.render(service_request.args))
+
+            except OSError:
+                if self._deadline_exceeded(service_request, result):
+                    return
 
-            except ConnectionRefusedError:
                 result.type = ParameterType.error
                 result.value = 'Not possible to communicate to the' \
                                ' instrument'
@@ -0,0 +1,222 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" Background reconnection and liveness probes of instrument connections """
+
+from typing import Optional, Dict, Callable, Any
+import enum
+import random
+import threading
+import time
+
+from mamba.core.exceptions import ComponentConfigException
+
+
+class ConnectionState(enum.Enum):
+    disconnected = 0
+    connected = 1
+    reconnecting = 2
+
+
+class ConnectionSupervisor:
+    """ Reconnects a lost instrument connection in a dedicated thread, with
+    capped exponential backoff and jitter, and probes the liveness of the
+    established connection.
+
+    The connection changes requested by the user shall be done holding the
+    supervisor lock, and notified with connected, lost or disconnected.
+
+    Args:
+        reconnect: Function closing and opening again the connection.
+                   Returns whether the connection has been established.
+        probe: Function checking the liveness of the connection, called
+               every probe interval while connected.
+        on_state: Function called with every new connection state.
+        initial_delay: Seconds before the first reconnection attempt.
+        max_delay: Maximum seconds between reconnection attempts.
+        jitter: Fraction of the delay randomly added or subtracted to it,
+                to avoid synchronized reconnections.
+        probe_interval: Seconds between liveness probes. None to disable.
+        name: Name of the supervisor thread.
+    """
+    def __init__(self,
+                 reconnect: Callable[[], bool],
+                 probe: Callable[[], None],
+                 on_state: Callable[[ConnectionState], None],
+                 initial_delay: float = 0.5,
+                 max_delay: float = 30,
+                 jitter: float = 0.2,
+                 probe_interval: Optional[float] = None,
+                 name: Optional[str] = None) -> None:
+        self._reconnect = reconnect
+        self._probe = probe
+        self._on_state = on_state
+        self._initial_delay = initial_delay
+        self._max_delay = max_delay
+        self._jitter = jitter
+        self._probe_interval = probe_interval
+        self._name = name
+
+        # Held while the connection is being changed
+        self.lock = threading.Lock()
+
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+
+        self._delay = initial_delay
+        self._next_attempt = 0.0
+        self._next_probe = 0.0
+
+        self.state = ConnectionState.disconnected
+        self.attempts: int = 0
+
+    def connected(self) -> None:
+        """ Notify the connection has been established """
+        with self._condition:
+            self._delay = self._initial_delay
+            if self._probe_interval is not None:
+                self._next_probe = time.monotonic() + self._probe_interval
+                self._start()
+            changed = self._set_state(ConnectionState.connected)
+
+        if changed:
+            self._on_state(ConnectionState.connected)
+
+    def lost(self) -> None:
+        """ Notify the connection has been lost, or could not be
+        established, to reconnect in background.
+        """
+        with self._condition:
+            if self.state == ConnectionState.reconnecting:
+                return
+
+            self._next_attempt = time.monotonic() + self._backoff()
+            self._start()
+            changed = self._set_state(ConnectionState.reconnecting)
+
+        if changed:
+            self._on_state(ConnectionState.reconnecting)
+
+    def disconnected(self) -> None:
+        """ Notify the connection has been closed on purpose """
+        with self._condition:
+            changed = self._set_state(ConnectionState.disconnected)
+
+        if changed:
+            self._on_state(ConnectionState.disconnected)
+
+    def close(self) -> None:
+        """ Stop the supervisor thread """
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+
+    def _set_state(self, state: ConnectionState) -> bool:
+        changed = state != self.state
+        self.state = state
+        self._condition.notify()
+        return changed
+
+    def _backoff(self) -> float:
+        """ Returns the delay before the next attempt, and doubles it """
+        delay = self._delay * (1 + self._jitter * random.uniform(-1, 1))
+        self._delay = min(self._delay * 2, self._max_delay)
+        return delay
+
+    def _start(self) -> None:
+        if self._thread is None and not self._closing:
+            self._thread = threading.Thread(target=self._run,
+                                            name=self._name)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _next_event(self) -> Optional[float]:
+        if self.state == ConnectionState.reconnecting:
+            return self._next_attempt
+        if self.state == ConnectionState.connected and \
+                self._probe_interval is not None:
+            return self._next_probe
+        return None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closing:
+                    next_event = self._next_event()
+                    now = time.monotonic()
+
+                    if next_event is not None and next_event <= now:
+                        break
+
+                    self._condition.wait(
+                        None if next_event is None else next_event - now)
+
+                if self._closing:
+                    return
+
+                state = self.state
+                if state == ConnectionState.connected:
+                    self._next_probe = now + self._probe_interval
+
+            if state == ConnectionState.connected:
+                self._probe()
+            else:
+                self._attempt()
+
+    def _attempt(self) -> None:
+        with self.lock:
+            # The user may have connected or disconnected meanwhile
+            if self.state != ConnectionState.reconnecting:
+                return
+
+            self.attempts += 1
+
+            if self._reconnect():
+                self.connected()
+                return
+
+        with self._condition:
+            self._next_attempt = time.monotonic() + self._backoff()
+
+    @staticmethod
+    def from_config(config: Dict[str, Any],
+                    reconnect: Callable[[], bool],
+                    probe: Callable[[], None],
+                    on_state: Callable[[ConnectionState], None],
+                    name: Optional[str] = None) -> 'ConnectionSupervisor':
+        """ Create a supervisor from the 'reconnect' block of an instrument
+        configuration.
+        """
+        try:
+            initial_delay = float(config.get('initial_delay', 0.5))
+            max_delay = float(config.get('max_delay', 30))
+            jitter = float(config.get('jitter', 0.2))
+            probe_interval = float(
+                config['probe_interval']) if config.get(
+                    'probe_interval') is not None else None
+        except (TypeError, ValueError):
+            raise ComponentConfigException(
+                'Reconnect delays, jitter and probe interval shall be '
+                'numeric')
+
+        if initial_delay <= 0 or max_delay < initial_delay or \
+                not 0 <= jitter < 1 or (probe_interval is not None
+                                        and probe_interval <= 0):
+            raise ComponentConfigException(
+                'Reconnect delays and probe interval shall be positive, '
+                'max_delay not lower than initial_delay and jitter lower '
+                'than 1')
+
+        return ConnectionSupervisor(reconnect=reconnect,
+                                    probe=probe,
+                                    on_state=on_state,
+                                    initial_delay=initial_delay,
+                                    max_delay=max_delay,
+                                    jitter=jitter,
+                                    probe_interval=probe_interval,
+                                    name=name)
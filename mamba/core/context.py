@@ -7,9 +7,11 @@
 ############################################################################
 """Application context that is shared between component"""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import threading
 
 from mamba.core.subject_factory import SubjectFactory
+from mamba.core.event_loop import EventLoop
 
 
 class Context:
@@ -18,6 +20,23 @@ class Context:
         self._memory: Dict[str, Any] = {}
         self.rx = SubjectFactory()
 
+        # Event loop shared by the asyncio components, started on first use
+        self._event_loop: Optional[EventLoop] = None
+        self._event_loop_lock = threading.Lock()
+
+    def event_loop(self) -> EventLoop:
+        """Returns the asyncio event loop shared by the components of the
+        application. It is started on first use.
+
+        Returns:
+            The running event loop.
+        """
+        with self._event_loop_lock:
+            if self._event_loop is None or not self._event_loop.is_running():
+                self._event_loop = EventLoop()
+
+            return self._event_loop
+
     def get(self, parameter: str) -> Any:
         """Returns the value of a context parameter, or None if it
         doesn´t exists.
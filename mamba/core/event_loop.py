@@ -0,0 +1,77 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" asyncio event loop shared by the components of an application """
+
+from typing import Any, Awaitable, Optional
+import asyncio
+import concurrent.futures
+import threading
+
+
+class EventLoop:
+    """ asyncio event loop running in a dedicated thread.
+
+    Coroutines are submitted from any other thread, and run concurrently in
+    the loop thread.
+
+    Args:
+        name: Name of the loop thread.
+    """
+    def __init__(self, name: Optional[str] = 'mamba_event_loop') -> None:
+        self.loop = asyncio.new_event_loop()
+
+        self._thread = threading.Thread(target=self._run, name=name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self, coroutine: Awaitable) -> concurrent.futures.Future:
+        """ Schedule a coroutine in the loop.
+
+        Returns:
+            The future of the coroutine result.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self,
+            coroutine: Awaitable,
+            timeout: Optional[float] = None) -> Any:
+        """ Run a coroutine in the loop and wait for its result.
+
+        Raises:
+            RuntimeError: Called from the loop thread, that would wait for
+                          itself.
+        """
+        if self.in_loop_thread():
+            coroutine.close()
+            raise RuntimeError('Blocking call from the event loop thread')
+
+        if not self.is_running():
+            coroutine.close()
+            raise RuntimeError('Event loop is stopped')
+
+        return self.submit(coroutine).result(timeout)
+
+    def in_loop_thread(self) -> bool:
+        """ Whether the caller is running in the loop thread """
+        return threading.current_thread() is self._thread
+
+    def is_running(self) -> bool:
+        """ Whether the loop thread is running """
+        return self._thread.is_alive()
+
+    def stop(self) -> None:
+        """ Stop the loop and wait for its thread to finish """
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+        if not self.in_loop_thread():
+            self._thread.join()
+            self.loop.close()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
@@ -7,16 +7,29 @@
 ############################################################################
 
 from typing import List, Any, Optional
+import itertools
+
 from mamba.core.msg.parameter_info import ParameterType
 
+# Process wide sequence of request identifiers
+_request_ids = itertools.count(1)
+
 
 class ServiceRequest:
     def __init__(self,
                  id: str,
                  type: ParameterType,
                  provider: Optional[str] = None,
-                 args: List[Any] = []) -> None:
+                 args: List[Any] = [],
+                 request_id: Optional[int] = None,
+                 deadline: Optional[float] = None) -> None:
         self.id = id
         self.provider = provider
         self.type = type
         self.args = args
+        self.request_id = next(
+            _request_ids) if request_id is None else request_id
+
+        # Absolute time.monotonic() time after which the request is not
+        # answered anymore, None to wait indefinitely
+        self.deadline = deadline
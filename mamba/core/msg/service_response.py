@@ -14,8 +14,10 @@ class ServiceResponse:
                  id: str,
                  provider: Optional[str] = None,
                  value: Optional[Any] = None,
-                 type: Optional[Any] = None):
+                 type: Optional[Any] = None,
+                 request_id: Optional[int] = None):
         self.id = id
         self.provider = provider
         self.value = value
         self.type = type
+        self.request_id = request_id
@@ -0,0 +1,185 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" Fixed capacity history of the samples of a numeric parameter """
+
+from typing import Optional, List, Tuple, Any
+import threading
+
+import numpy
+
+from mamba.core.exceptions import ComponentConfigException
+
+
+class ParameterHistory:
+    """ Ring buffer of the last samples of a numeric parameter.
+
+    Timestamps and values are stored in arrays allocated at creation, the
+    oldest samples are overwritten when the history is full. Samples are
+    expected in timestamp order.
+
+    Args:
+        capacity: Maximum number of samples kept.
+        width: Number of values of each sample. Samples of vector parameters
+               may be given as strings of space separated values.
+    """
+    def __init__(self, capacity: int, width: int = 1) -> None:
+        self._capacity = capacity
+        self._width = width
+
+        self._timestamps = numpy.zeros(capacity)
+        self._values = numpy.zeros(capacity if width == 1 else (capacity,
+                                                                width))
+        self._next = 0  # Index of the next sample
+        self._count = 0  # Number of samples stored
+        self._lock = threading.Lock()
+
+        # Number of samples that could not be converted to numbers
+        self.rejected: int = 0
+
+    @property
+    def capacity(self) -> int:
+        """ Maximum number of samples kept """
+        return self._capacity
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, value: Any) -> None:
+        """ Store a sample, overwriting the oldest one if full """
+        if self._width > 1 and isinstance(value, str):
+            value = value.split()
+
+        with self._lock:
+            try:
+                self._values[self._next] = value
+            except (TypeError, ValueError):
+                self.rejected += 1
+                return
+
+            self._timestamps[self._next] = timestamp
+            self._next = (self._next + 1) % self._capacity
+            self._count = min(self._count + 1, self._capacity)
+
+    def last(self, count: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """ The last samples, oldest first.
+
+        Returns:
+            The timestamps and the values of the samples.
+        """
+        with self._lock:
+            count = max(0, min(count, self._count))
+            first = self._count - count
+
+            return self._copy(first, self._count)
+
+    def between(self, start: float,
+                end: float) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """ The samples with timestamp in [start, end], oldest first.
+
+        Returns:
+            The timestamps and the values of the samples.
+        """
+        with self._lock:
+            return self._copy(*self._range(start, end))
+
+    def stats(self, start: float, end: float) -> Optional[numpy.ndarray]:
+        """ Minimum, maximum and mean of the samples with timestamp in
+        [start, end].
+
+        Returns:
+            The statistics, one row per statistic if the samples are
+            vectors. None if there is no sample in the window.
+        """
+        with self._lock:
+            first, last = self._range(start, end)
+
+            if first == last:
+                return None
+
+            segments = [
+                self._values[begin:stop]
+                for begin, stop in self._ring_slices(first, last)
+            ]
+
+            minimum = numpy.minimum.reduce(
+                [segment.min(axis=0) for segment in segments])
+            maximum = numpy.maximum.reduce(
+                [segment.max(axis=0) for segment in segments])
+            total = sum(segment.sum(axis=0) for segment in segments)
+
+            return numpy.array([minimum, maximum, total / (last - first)])
+
+    def _range(self, start: float, end: float) -> Tuple[int, int]:
+        """ Chronological positions of the samples in [start, end] """
+        positions = []
+
+        for bound, side in [(start, 'left'), (end, 'right')]:
+            position = 0
+            for begin, stop in self._ring_slices(0, self._count):
+                offset = int(
+                    numpy.searchsorted(self._timestamps[begin:stop], bound,
+                                       side))
+                position += offset
+                if offset < stop - begin:
+                    break
+            positions.append(position)
+
+        return positions[0], max(positions)
+
+    def _ring_slices(self, first: int, last: int) -> List[Tuple[int, int]]:
+        """ Buffer slices of the chronological positions [first, last) """
+        oldest = (self._next - self._count) % self._capacity
+        begin = oldest + first
+        stop = oldest + last
+
+        if stop <= self._capacity:
+            return [(begin, stop)]
+        if begin >= self._capacity:
+            return [(begin - self._capacity, stop - self._capacity)]
+
+        return [(begin, self._capacity), (0, stop - self._capacity)]
+
+    def _copy(self, first: int,
+              last: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """ Copy of the samples of the chronological positions
+        [first, last) """
+        if first >= last:
+            return self._timestamps[:0].copy(), self._values[:0].copy()
+
+        slices = self._ring_slices(first, last)
+
+        return (numpy.concatenate(
+            [self._timestamps[begin:stop] for begin, stop in slices]),
+                numpy.concatenate(
+                    [self._values[begin:stop] for begin, stop in slices]))
+
+    @staticmethod
+    def from_config(config: Optional[dict], key: str,
+                    component_name: str) -> 'ParameterHistory':
+        """ Create the history of a parameter from its 'history' block.
+
+        Raises:
+            ComponentConfigException: The capacity or width are not
+                                      positive integers.
+        """
+        config = config or {}
+
+        try:
+            capacity = int(config['capacity'])
+            width = int(config.get('width', 1))
+        except (KeyError, TypeError, ValueError):
+            raise ComponentConfigException(
+                f'In service {component_name} : "{key}" history shall have '
+                f'an integer capacity and width')
+
+        if capacity <= 0 or width <= 0:
+            raise ComponentConfigException(
+                f'In service {component_name} : "{key}" history capacity '
+                f'and width shall be positive')
+
+        return ParameterHistory(capacity, width)
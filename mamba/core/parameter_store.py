@@ -0,0 +1,260 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" Thread safe store of the parameter values of a component """
+
+from typing import Optional, Dict, List, Any, Callable, Iterator, \
+    Iterable, NamedTuple, Mapping, MutableMapping
+import threading
+import time
+
+
+class ParameterValue(NamedTuple):
+    """ Value of a parameter slot.
+
+    Args:
+        value: The parameter value.
+        version: Store version of the last change of the value.
+        timestamp: Time of the last write of the value, in seconds since
+                   the epoch.
+    """
+    value: Any
+    version: int
+    timestamp: float
+
+
+class _Subscription(NamedTuple):
+    callback: Callable[[Dict[str, ParameterValue]], None]
+    keys: Optional[frozenset]
+
+
+class ParameterStore(MutableMapping):
+    """ Parameter values of a component, shared by the threads serving its
+    requests and the threads receiving the instrument telemetries.
+
+    The store behaves as a dictionary of values. Each slot also keeps the
+    declared value type, the store version of its last change and the time
+    of its last write. The store version is incremented on every change,
+    so consumers can skip the values that did not change since the version
+    they last read.
+
+    Args:
+        clock: Time source of the write timestamps, in seconds.
+    """
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._version = 0
+
+        self._slots: Dict[str, ParameterValue] = {}
+        self._types: Dict[str, Optional[str]] = {}
+        self._subscriptions: List[_Subscription] = []
+
+    @property
+    def version(self) -> int:
+        """ Version of the last change of the store """
+        return self._version
+
+    def declare(self,
+                key: str,
+                value: Any = None,
+                value_type: Optional[str] = None) -> None:
+        """ Create a parameter slot with its initial value.
+
+        Args:
+            key: Parameter identifier.
+            value: Initial value of the parameter.
+            value_type: Declared type of the parameter value, as in the
+                        service signatures.
+        """
+        with self._lock:
+            self._types[key] = value_type
+            changes = self._write({key: value})
+
+        self._notify(changes)
+
+    def slot_type(self, key: str) -> Optional[str]:
+        """ Declared type of a parameter slot, None if undeclared """
+        return self._types.get(key)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._slots[key].value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self._lock:
+            changes = self._write({key: value})
+
+        self._notify(changes)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            del self._slots[key]
+            self._types.pop(key, None)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._slots))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slots
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+
+        return self.values_snapshot() == dict(other.items())
+
+    def __repr__(self) -> str:
+        return f'ParameterStore({self.values_snapshot()!r})'
+
+    def update(self, *args, **kwargs) -> None:  # type: ignore
+        """ Write several parameters at once. Readers of a snapshot see
+            either none or all of the new values.
+        """
+        values = dict(*args, **kwargs)
+
+        with self._lock:
+            changes = self._write(values)
+
+        self._notify(changes)
+
+    def modify(self, key: str, function: Callable[[Any], Any]) -> Any:
+        """ Replace a parameter value with a function of its current value,
+            without other writes in between.
+
+            Returns:
+                The new value.
+        """
+        with self._lock:
+            value = function(self._slots[key].value)
+            changes = self._write({key: value})
+
+        self._notify(changes)
+        return value
+
+    def get_value(self, key: str) -> ParameterValue:
+        """ Value of a parameter with its version and timestamp.
+
+            Raises:
+                KeyError: The parameter has no slot.
+        """
+        return self._slots[key]
+
+    def snapshot(self,
+                 keys: Optional[Iterable[str]] = None
+                 ) -> Dict[str, ParameterValue]:
+        """ Values of several parameters, read at once.
+
+            Args:
+                keys: Parameters to read, all of them if None. Parameters
+                      without slot are ignored.
+        """
+        with self._lock:
+            if keys is None:
+                return dict(self._slots)
+
+            return {
+                key: self._slots[key]
+                for key in keys if key in self._slots
+            }
+
+    def values_snapshot(self,
+                        keys: Optional[Iterable[str]] = None
+                        ) -> Dict[str, Any]:
+        """ As snapshot, without the versions and timestamps """
+        return {
+            key: slot.value
+            for key, slot in self.snapshot(keys).items()
+        }
+
+    def changed_since(self,
+                      version: int,
+                      keys: Optional[Iterable[str]] = None
+                      ) -> Dict[str, ParameterValue]:
+        """ Parameters changed after a store version.
+
+            Args:
+                version: Store version of the previous read.
+                keys: Parameters to check, all of them if None.
+        """
+        return {
+            key: slot
+            for key, slot in self.snapshot(keys).items()
+            if slot.version > version
+        }
+
+    def subscribe(self,
+                  callback: Callable[[Dict[str, ParameterValue]], None],
+                  keys: Optional[Iterable[str]] = None) -> Callable[[], None]:
+        """ Call a function with the parameters changed by every write.
+            Writes that do not change the value are not notified.
+
+            The callback runs in the writer thread, after the store is
+            released, and shall not block.
+
+            Args:
+                callback: Called with the changed parameter values.
+                keys: Parameters of interest, all of them if None.
+
+            Returns:
+                Function cancelling the subscription.
+        """
+        subscription = _Subscription(
+            callback, frozenset(keys) if keys is not None else None)
+
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._subscriptions = [
+                    sub for sub in self._subscriptions
+                    if sub is not subscription
+                ]
+
+        return unsubscribe
+
+    def _write(self, values: Dict[str, Any]) -> Dict[str, ParameterValue]:
+        """ Write values holding the lock, and return the changed ones """
+        timestamp = self._clock()
+        changes: Dict[str, ParameterValue] = {}
+
+        for key, value in values.items():
+            slot = self._slots.get(key)
+
+            if slot is not None and slot.value == value and \
+                    type(slot.value) is type(value):
+                # Refresh the timestamp, the version is kept
+                self._slots[key] = slot._replace(timestamp=timestamp)
+                continue
+
+            if not changes:
+                self._version += 1
+
+            changes[key] = ParameterValue(value, self._version, timestamp)
+
+        self._slots.update(changes)
+        return changes
+
+    def _notify(self, changes: Dict[str, ParameterValue]) -> None:
+        if not changes:
+            return
+
+        for subscription in self._subscriptions:
+            if subscription.keys is None:
+                subscription.callback(changes)
+            else:
+                selected = {
+                    key: slot
+                    for key, slot in changes.items()
+                    if key in subscription.keys
+                }
+                if selected:
+                    subscription.callback(selected)
@@ -0,0 +1,164 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" Cache of instrument getter replies, with time to live """
+
+from typing import Optional, Dict, Tuple, Set, Any, NamedTuple, Callable
+import threading
+import time
+
+from mamba.core.exceptions import ComponentConfigException
+
+
+class CachePolicy(NamedTuple):
+    """ Cache configuration of a getter.
+
+    Args:
+        ttl: Seconds a reply is served without querying the instrument.
+        max_staleness: Seconds after the reply an expired reply may still
+                       be served, if the instrument query fails.
+    """
+    ttl: float
+    max_staleness: float
+
+
+class ResponseCache:
+    """ Replies of the instrument getters, by service id.
+
+    Args:
+        policies: Cache policy of each cached getter id.
+        invalidations: Getter ids invalidated by each setter id.
+        clock: Monotonic time source, in seconds.
+    """
+    def __init__(self,
+                 policies: Dict[str, CachePolicy],
+                 invalidations: Dict[str, Set[str]],
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self._policies = policies
+        self._invalidations = invalidations
+        self._clock = clock
+
+        # Cached replies, by getter id: (time of the reply, reply)
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.stale_hits: int = 0
+
+    def is_cached(self, getter_id: str) -> bool:
+        """ Whether the replies of a getter are cached """
+        return getter_id in self._policies
+
+    def lookup(self, getter_id: str) -> Tuple[bool, Any]:
+        """ Look up a reply younger than its time to live.
+
+        Returns:
+            Whether the reply was found, and the reply.
+        """
+        with self._lock:
+            entry = self._entries.get(getter_id)
+
+            if entry is not None and self._clock() - entry[0] < \
+                    self._policies[getter_id].ttl:
+                self.hits += 1
+                return True, entry[1]
+
+            self.misses += 1
+            return False, None
+
+    def lookup_stale(self, getter_id: str) -> Tuple[bool, Any]:
+        """ Look up an expired reply younger than its maximum staleness, to
+        be served when the instrument can not be queried.
+
+        Returns:
+            Whether the reply was found, and the reply.
+        """
+        with self._lock:
+            entry = self._entries.get(getter_id)
+
+            if entry is not None and self._clock() - entry[0] < \
+                    self._policies[getter_id].max_staleness:
+                self.stale_hits += 1
+                return True, entry[1]
+
+            return False, None
+
+    def store(self, getter_id: str, value: Any) -> None:
+        """ Store the last reply of a getter """
+        with self._lock:
+            self._entries[getter_id] = (self._clock(), value)
+
+    def invalidate(self, setter_id: str) -> None:
+        """ Discard the replies invalidated by a setter """
+        getter_ids = self._invalidations.get(setter_id)
+
+        if getter_ids:
+            with self._lock:
+                for getter_id in getter_ids:
+                    self._entries.pop(getter_id, None)
+
+    def clear(self) -> None:
+        """ Discard all the replies """
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def from_parameters(parameters: Dict[str, dict],
+                        component_name: str) -> Optional['ResponseCache']:
+        """ Create the cache from the 'cache' blocks of the parameters of a
+        component configuration.
+
+        Returns:
+            The response cache, or None if no parameter is cached.
+        """
+        policies: Dict[str, CachePolicy] = {}
+        invalidations: Dict[str, Set[str]] = {}
+
+        def setter_id(key: str) -> str:
+            setter = (parameters.get(key) or {}).get('set') or {}
+            return (setter.get('alias') or key).lower()
+
+        for key, parameter_info in parameters.items():
+            cache = parameter_info.get('cache')
+            if cache is None:
+                continue
+
+            getter = parameter_info.get('get') or {}
+
+            if getter.get('instrument_command') is None:
+                raise ComponentConfigException(
+                    f'In service {component_name} : "{key}" cache is only '
+                    f'allowed for getters with instrument command')
+
+            try:
+                ttl = float(cache['ttl'])
+                max_staleness = float(cache.get('max_staleness', ttl))
+            except (KeyError, TypeError, ValueError):
+                raise ComponentConfigException(
+                    f'In service {component_name} : "{key}" cache shall '
+                    f'have a numeric ttl and max_staleness')
+
+            if ttl < 0 or max_staleness < ttl:
+                raise ComponentConfigException(
+                    f'In service {component_name} : "{key}" cache ttl '
+                    f'shall be positive, and max_staleness not lower than '
+                    f'ttl')
+
+            getter_id = (getter.get('alias') or key).lower()
+            policies[getter_id] = CachePolicy(ttl=ttl,
+                                              max_staleness=max_staleness)
+
+            for invalidator in [key] + list(
+                    cache.get('invalidated_by') or []):
+                invalidations.setdefault(setter_id(invalidator),
+                                         set()).add(getter_id)
+
+        if not policies:
+            return None
+
+        return ResponseCache(policies, invalidations)
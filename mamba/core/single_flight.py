@@ -0,0 +1,59 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" Coalescing of identical requests in flight """
+
+from typing import Dict, Hashable, List
+import threading
+
+
+class SingleFlight:
+    """ Requests in flight, by request key. An identical request received
+    while another one is in flight is attached to it instead of being
+    executed, and answered with its result.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+        # Requests attached to each request in flight, by request key
+        self._flights: Dict[Hashable, List[int]] = {}
+        self._keys: Dict[int, Hashable] = {}
+
+        self.coalesced: int = 0
+
+    def join(self, key: Hashable, request_id: int) -> bool:
+        """ Register a request.
+
+        Returns:
+            Whether the request shall be executed. If not, it has been
+            attached to the identical request in flight.
+        """
+        with self._lock:
+            attached = self._flights.get(key)
+
+            if attached is not None:
+                attached.append(request_id)
+                self.coalesced += 1
+                return False
+
+            self._flights[key] = []
+            self._keys[request_id] = key
+            return True
+
+    def complete(self, request_id: int) -> List[int]:
+        """ Finish the flight of an executed request.
+
+        Returns:
+            The identifiers of the requests attached to it.
+        """
+        with self._lock:
+            key = self._keys.pop(request_id, None)
+
+            if key is None:
+                return []
+
+            return self._flights.pop(key)
@@ -7,24 +7,75 @@
 ############################################################################
 """ The Mamba implementation of a RxPy Reactive Factory """
 
-from typing import Dict
+from typing import Dict, Any, Callable, Tuple
+import threading
 
 from rx.subject import Subject
+from rx.disposable import Disposable
+
+
+class RoutedSubject(Subject):
+    """ A Subject that, besides broadcasting every value to its observers,
+    delivers it directly to the handlers registered for the value routing
+    key. The routing key is read from the given value attribute, so that
+    finding the handlers of a value is a single dictionary lookup,
+    independently of the number of registered routes.
+    """
+    def __init__(self, route_attribute: str = 'provider') -> None:
+        super().__init__()
+        self._route_attribute = route_attribute
+        self._routes: Dict[Any, Tuple[Callable[[Any], None], ...]] = {}
+        self._routes_lock = threading.Lock()
+
+    def subscribe_route(self, route_key: Any,
+                        on_next: Callable[[Any], None]) -> Disposable:
+        """ Registers a handler for the values with the given routing key.
+
+        Args:
+            route_key: Routing key of the values to be handled.
+            on_next: Handler to be called with every routed value.
+
+        Returns:
+            A disposable to unregister the handler.
+        """
+        with self._routes_lock:
+            self._routes[route_key] = self._routes.get(route_key,
+                                                       ()) + (on_next, )
+
+        def dispose() -> None:
+            with self._routes_lock:
+                handlers = tuple(handler
+                                 for handler in self._routes.get(route_key, ())
+                                 if handler is not on_next)
+                if len(handlers) > 0:
+                    self._routes[route_key] = handlers
+                else:
+                    self._routes.pop(route_key, None)
+
+        return Disposable(dispose)
+
+    def _on_next_core(self, value: Any) -> None:
+        # Route handlers are stored as immutable tuples, no lock is needed
+        for handler in self._routes.get(
+                getattr(value, self._route_attribute, None), ()):
+            handler(value)
+
+        super()._on_next_core(value)
 
 
 class SubjectFactory:
     """ The Subject Factory object lets you handle subjects by a string name
     """
     def __init__(self) -> None:
-        self._factory: Dict[str, Subject] = {}
+        self._factory: Dict[str, RoutedSubject] = {}
 
-    def __getitem__(self, key: str) -> Subject:
+    def __getitem__(self, key: str) -> RoutedSubject:
         """ Registers a given subject by id.
             Note: It creates an empty one if it does not exists
         Args:
             key: Subject identifier.
         """
         if key not in self._factory:
-            self._factory[key] = Subject()
+            self._factory[key] = RoutedSubject()
 
         return self._factory[key]
@@ -0,0 +1,347 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" Append-only on-disk archive of numeric telemetry samples.
+
+Every parameter is archived in its own directory, <provider>/<parameter>,
+as a sequence of chunks. A chunk is a pair of columnar files of float64
+samples, <first sample time in microseconds>.time and .value, that are
+only appended. A new chunk is started when the chunk is full, and by every
+new writer, so that the chunks of previous sessions are never modified.
+"""
+
+from typing import Optional, Dict, List, Tuple, Any, BinaryIO
+from collections import deque
+import os
+import threading
+import time
+
+import numpy
+
+TIME_SUFFIX = '.time'
+VALUE_SUFFIX = '.value'
+SAMPLE_DTYPE = numpy.dtype('<f8')
+
+
+class _Chunk:
+    """ Open chunk of a parameter """
+    def __init__(self, directory: str, first_timestamp: float) -> None:
+        name = f'{int(first_timestamp * 1e6):016d}'
+        path = os.path.join(directory, name)
+
+        # A chunk of the same microsecond is continued
+        self.time_file: BinaryIO = open(path + TIME_SUFFIX, 'ab')
+        self.value_file: BinaryIO = open(path + VALUE_SUFFIX, 'ab')
+        self.samples = self.time_file.tell() // SAMPLE_DTYPE.itemsize
+
+    def write(self, timestamps: numpy.ndarray, values: numpy.ndarray) -> None:
+        self.time_file.write(timestamps.tobytes())
+        self.value_file.write(values.tobytes())
+        self.samples += len(timestamps)
+
+    def flush(self) -> None:
+        self.time_file.flush()
+        self.value_file.flush()
+
+    def sync(self) -> None:
+        self.flush()
+        for file in (self.time_file, self.value_file):
+            os.fsync(file.fileno())
+
+    def close(self) -> None:
+        self.sync()
+        self.time_file.close()
+        self.value_file.close()
+
+
+class ArchiveWriter:
+    """ Writes the telemetry samples to the archive in a background thread,
+    so that appending a sample never waits for the disk.
+
+    Args:
+        directory: Root directory of the archive.
+        chunk_samples: Maximum number of samples of a chunk.
+        fsync_interval: Seconds between the synchronizations of the written
+                        samples to the disk.
+        max_pending: Maximum number of samples waiting to be written. The
+                     samples exceeding it are dropped.
+    """
+    def __init__(self,
+                 directory: str,
+                 chunk_samples: int = 1000000,
+                 fsync_interval: float = 1.0,
+                 max_pending: int = 1000000) -> None:
+        self._directory = directory
+        self._chunk_samples = chunk_samples
+        self._fsync_interval = fsync_interval
+        self._max_pending = max_pending
+
+        # Samples waiting to be written: (timestamp, provider, parameter,
+        # value). Appended without lock, deque operations are atomic
+        self._pending: deque = deque()
+        self._wake_up = threading.Event()
+        self._closing = False
+
+        # Held by the writer thread while writing a batch
+        self._batch_lock = threading.Lock()
+
+        self._chunks: Dict[Tuple[str, str], _Chunk] = {}
+        self._thread: Optional[threading.Thread] = None
+
+        # Samples written, dropped by a full queue, and not numeric
+        self.written: int = 0
+        self.dropped: int = 0
+        self.rejected: int = 0
+
+    def start(self) -> None:
+        """ Start the writer thread """
+        os.makedirs(self._directory, exist_ok=True)
+
+        self._thread = threading.Thread(target=self._write_loop,
+                                        name='telemetry_archive')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def append(self, timestamp: float, provider: str, parameter: str,
+               value: Any) -> None:
+        """ Queue a sample to be written """
+        if len(self._pending) >= self._max_pending:
+            self.dropped += 1
+            return
+
+        self._pending.append((timestamp, provider, parameter, value))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """ Wait until the queued samples are written, and readable from
+        the archive.
+
+        Returns:
+            Whether the samples were written before the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while len(self._pending) > 0:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            self._wake_up.set()
+            time.sleep(0.001)
+
+        # The last batch may still be in write
+        with self._batch_lock:
+            return True
+
+    def close(self) -> None:
+        """ Write the queued samples, and close the archive files """
+        self._closing = True
+        self._wake_up.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _write_loop(self) -> None:
+        last_sync = time.monotonic()
+
+        while True:
+            closing = self._closing
+            self._wake_up.wait(min(self._fsync_interval, 0.1))
+            self._wake_up.clear()
+
+            with self._batch_lock:
+                self._write_pending()
+
+                if closing or time.monotonic() - last_sync >= \
+                        self._fsync_interval:
+                    for chunk in self._chunks.values():
+                        chunk.sync()
+                    last_sync = time.monotonic()
+
+            if closing and len(self._pending) == 0:
+                break
+
+        for chunk in self._chunks.values():
+            chunk.close()
+        self._chunks.clear()
+
+    def _write_pending(self) -> None:
+        """ Write the queued samples, grouped by parameter """
+        batches: Dict[Tuple[str, str], Tuple[List[float], List[Any]]] = {}
+
+        for _ in range(len(self._pending)):
+            timestamp, provider, parameter, value = self._pending.popleft()
+
+            timestamps, values = batches.setdefault((provider, parameter),
+                                                    ([], []))
+            timestamps.append(timestamp)
+            values.append(value)
+
+        for key, (timestamps, values) in batches.items():
+            try:
+                value_array = numpy.array(values, dtype=SAMPLE_DTYPE)
+                time_array = numpy.array(timestamps, dtype=SAMPLE_DTYPE)
+            except (TypeError, ValueError):
+                time_array, value_array = self._numeric_samples(
+                    timestamps, values)
+
+            if value_array.ndim != 1:
+                self.rejected += len(values)
+                continue
+
+            self._write(key, time_array, value_array)
+
+        # The written samples are readable before being synchronized
+        for key in batches:
+            chunk = self._chunks.get(key)
+            if chunk is not None:
+                chunk.flush()
+
+    def _numeric_samples(
+            self, timestamps: List[float],
+            values: List[Any]) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """ Keep the samples with a numeric scalar value """
+        numeric_timestamps = []
+        numeric_values = []
+
+        for timestamp, value in zip(timestamps, values):
+            try:
+                numeric_values.append(float(value))
+                numeric_timestamps.append(timestamp)
+            except (TypeError, ValueError):
+                self.rejected += 1
+
+        return (numpy.array(numeric_timestamps, dtype=SAMPLE_DTYPE),
+                numpy.array(numeric_values, dtype=SAMPLE_DTYPE))
+
+    def _write(self, key: Tuple[str, str], timestamps: numpy.ndarray,
+               values: numpy.ndarray) -> None:
+        start = 0
+
+        while start < len(timestamps):
+            chunk = self._chunks.get(key)
+
+            if chunk is None or chunk.samples >= self._chunk_samples:
+                if chunk is not None:
+                    chunk.close()
+
+                directory = os.path.join(self._directory, *key)
+                os.makedirs(directory, exist_ok=True)
+                chunk = self._chunks[key] = _Chunk(directory,
+                                                   timestamps[start])
+
+            stop = min(len(timestamps),
+                       start + self._chunk_samples - chunk.samples)
+            chunk.write(timestamps[start:stop], values[start:stop])
+            self.written += stop - start
+            start = stop
+
+
+class TelemetryArchive:
+    """ Reader of an archive. The chunk files are memory mapped, only the
+    samples of the requested range are read from disk.
+
+    Args:
+        directory: Root directory of the archive.
+    """
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+
+    def parameters(self) -> List[Tuple[str, str]]:
+        """ The archived parameters, as (provider, parameter) """
+        parameters = []
+
+        if not os.path.isdir(self._directory):
+            return parameters
+
+        for provider in sorted(os.listdir(self._directory)):
+            provider_dir = os.path.join(self._directory, provider)
+            if not os.path.isdir(provider_dir):
+                continue
+
+            for parameter in sorted(os.listdir(provider_dir)):
+                if os.path.isdir(os.path.join(provider_dir, parameter)):
+                    parameters.append((provider, parameter))
+
+        return parameters
+
+    def read(self,
+             provider: str,
+             parameter: str,
+             start: Optional[float] = None,
+             end: Optional[float] = None
+             ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """ The samples of a parameter with timestamp in [start, end].
+
+        Returns:
+            The timestamps and the values of the samples, oldest first.
+        """
+        time_arrays = []
+        value_arrays = []
+
+        chunks = self._chunks(provider, parameter)
+
+        for index, (first, path) in enumerate(chunks):
+            if end is not None and first > end:
+                break
+
+            # The chunk ends before the first sample of the next one
+            if start is not None and index + 1 < len(chunks) and \
+                    chunks[index + 1][0] < start:
+                continue
+
+            timestamps, values = self._map(path)
+
+            begin = 0 if start is None else int(
+                numpy.searchsorted(timestamps, start, 'left'))
+            stop = len(timestamps) if end is None else int(
+                numpy.searchsorted(timestamps, end, 'right'))
+
+            if stop > begin:
+                time_arrays.append(numpy.array(timestamps[begin:stop]))
+                value_arrays.append(numpy.array(values[begin:stop]))
+
+        if not time_arrays:
+            return (numpy.zeros(0, dtype=SAMPLE_DTYPE),
+                    numpy.zeros(0, dtype=SAMPLE_DTYPE))
+
+        return numpy.concatenate(time_arrays), numpy.concatenate(value_arrays)
+
+    def _chunks(self, provider: str,
+                parameter: str) -> List[Tuple[float, str]]:
+        """ The chunks of a parameter, as (first timestamp, path without
+        suffix), oldest first.
+        """
+        directory = os.path.join(self._directory, provider, parameter)
+
+        if not os.path.isdir(directory):
+            return []
+
+        return sorted((int(name[:-len(TIME_SUFFIX)]) / 1e6,
+                       os.path.join(directory, name[:-len(TIME_SUFFIX)]))
+                      for name in os.listdir(directory)
+                      if name.endswith(TIME_SUFFIX))
+
+    @staticmethod
+    def _map(path: str) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """ Memory map the complete samples of a chunk. The samples of a
+        chunk interrupted while being written are ignored.
+        """
+        samples = min(
+            os.path.getsize(path + suffix)
+            for suffix in (TIME_SUFFIX, VALUE_SUFFIX)) // SAMPLE_DTYPE.itemsize
+
+        if samples == 0:
+            empty = numpy.zeros(0, dtype=SAMPLE_DTYPE)
+            return empty, empty
+
+        return (numpy.memmap(path + TIME_SUFFIX,
+                             dtype=SAMPLE_DTYPE,
+                             mode='r',
+                             shape=(samples, )),
+                numpy.memmap(path + VALUE_SUFFIX,
+                             dtype=SAMPLE_DTYPE,
+                             mode='r',
+                             shape=(samples, )))
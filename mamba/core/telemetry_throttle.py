@@ -0,0 +1,212 @@
+############################################################################
+#
+# Copyright (c) Mamba Developers. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#
+############################################################################
+""" Rate limiting and decimation of the published telemetry samples """
+
+from typing import Optional, Dict, List, Tuple, Any, Callable, NamedTuple
+import heapq
+import threading
+import time
+
+from mamba.core.exceptions import ComponentConfigException
+
+# Marks the parameters without pending sample
+_NO_SAMPLE = object()
+
+
+class PublishPolicy(NamedTuple):
+    """ Publish policy of the telemetry samples of a parameter.
+
+    Args:
+        min_interval: Minimum seconds between published samples, 0 if the
+                      rate is not limited.
+        deadband: Numeric changes smaller than the deadband, from the last
+                  published sample, are not published.
+        conflate: Whether the last sample received too early is published
+                  when the interval expires, instead of being dropped.
+    """
+    min_interval: float
+    deadband: float
+    conflate: bool
+
+    @staticmethod
+    def from_config(config: Optional[dict], key: str,
+                    component_name: str) -> 'PublishPolicy':
+        """ Create the policy of a parameter from its 'publish' block.
+
+        Raises:
+            ComponentConfigException: The max rate or deadband are not
+                                      positive numbers.
+        """
+        config = config or {}
+
+        try:
+            max_rate = float(config['max_rate']) if config.get(
+                'max_rate') is not None else None
+            deadband = float(config.get('deadband') or 0)
+        except (TypeError, ValueError):
+            raise ComponentConfigException(
+                f'In service {component_name} : "{key}" publish max_rate '
+                f'and deadband shall be numeric')
+
+        if (max_rate is not None and max_rate <= 0) or deadband < 0:
+            raise ComponentConfigException(
+                f'In service {component_name} : "{key}" publish max_rate '
+                f'shall be positive, and deadband not negative')
+
+        return PublishPolicy(
+            min_interval=1 / max_rate if max_rate is not None else 0,
+            deadband=deadband,
+            conflate=bool(config.get('conflate', True)))
+
+
+class _ParameterState:
+    __slots__ = ['last_time', 'last_value', 'pending']
+
+    def __init__(self) -> None:
+        self.last_time: Optional[float] = None
+        self.last_value: Any = _NO_SAMPLE
+        self.pending: Any = _NO_SAMPLE
+
+
+class TelemetryThrottle:
+    """ Applies the publish policy of each parameter to its telemetry
+    samples. Samples of parameters without policy are published
+    immediately.
+
+    The conflated samples are published by a flush thread, started with
+    the first conflated sample.
+
+    Args:
+        policies: Publish policy of each parameter.
+        publish: Called with every sample to be published, one at a time.
+        clock: Monotonic time source, in seconds.
+    """
+    def __init__(self,
+                 policies: Dict[str, PublishPolicy],
+                 publish: Callable[[str, Any], None],
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self._policies = policies
+        self._publish = publish
+        self._clock = clock
+
+        self._states = {key: _ParameterState() for key in policies}
+        self._flushes: List[Tuple[float, str]] = []
+        self._condition = threading.Condition(threading.RLock())
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        # Samples not published, by the deadband or the max rate
+        self.dropped: int = 0
+
+        # Samples replaced by a later one before being published
+        self.conflated: int = 0
+
+    def offer(self, key: str, value: Any) -> None:
+        """ Publish a sample, or retain it, according to the parameter
+            publish policy.
+        """
+        policy = self._policies.get(key)
+
+        if policy is None:
+            self._publish(key, value)
+            return
+
+        with self._condition:
+            state = self._states[key]
+
+            if self._within_deadband(policy, state, value):
+                self.dropped += 1
+
+                if state.pending is not _NO_SAMPLE:
+                    # The retained sample is older than the dropped one
+                    state.pending = _NO_SAMPLE
+                    self.dropped += 1
+                return
+
+            now = self._clock()
+
+            if state.last_time is None or \
+                    now - state.last_time >= policy.min_interval:
+                if state.pending is not _NO_SAMPLE:
+                    state.pending = _NO_SAMPLE
+                    self.conflated += 1
+
+                self._publish_sample(key, state, value, now)
+            elif policy.conflate:
+                if state.pending is _NO_SAMPLE:
+                    heapq.heappush(
+                        self._flushes,
+                        (state.last_time + policy.min_interval, key))
+                    self._start_flush_thread()
+                    self._condition.notify()
+                else:
+                    self.conflated += 1
+
+                state.pending = value
+            else:
+                self.dropped += 1
+
+    def close(self) -> None:
+        """ Stop the flush thread. Retained samples are not published """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+    @staticmethod
+    def _within_deadband(policy: PublishPolicy, state: _ParameterState,
+                         value: Any) -> bool:
+        if policy.deadband == 0 or state.last_value is _NO_SAMPLE:
+            return False
+
+        try:
+            return abs(float(value) - float(state.last_value)) < \
+                policy.deadband
+        except (TypeError, ValueError):
+            # Not numeric samples are not filtered
+            return False
+
+    def _publish_sample(self, key: str, state: _ParameterState, value: Any,
+                        now: float) -> None:
+        state.last_time = now
+        state.last_value = value
+        self._publish(key, value)
+
+    def _start_flush_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._flush_pending)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _flush_pending(self) -> None:
+        """ Loop publishing the retained samples when their interval
+            expires.
+        """
+        with self._condition:
+            while not self._closed:
+                now = self._clock()
+
+                while self._flushes and self._flushes[0][0] <= now:
+                    _, key = heapq.heappop(self._flushes)
+                    state = self._states[key]
+
+                    if state.pending is _NO_SAMPLE:
+                        continue
+
+                    due = state.last_time + self._policies[key].min_interval
+
+                    if due > now:
+                        # Retained after a later publication
+                        heapq.heappush(self._flushes, (due, key))
+                        continue
+
+                    value = state.pending
+                    state.pending = _NO_SAMPLE
+                    self._publish_sample(key, state, value, now)
+
+                self._condition.wait(self._flushes[0][0] -
+                                     now if self._flushes else None)
@@ -14,6 +14,7 @@ from subprocess import check_output, CalledProcessError
 
 from tempfile import TemporaryFile
 
+from mamba.core.component_base.instrument_driver import InstrumentCommand
 from mamba.core.context import Context
 from mamba.core.exceptions import ComponentConfigException
 from mamba.core.component_base import InstrumentDriver
@@ -42,23 +43,20 @@ class ScriptInstrumentDriver(InstrumentDriver):
         super().initialize()
         self._inst = 0
 
-    def _process_inst_command(self, cmd_type: str, cmd: str,
+    def _process_inst_command(self, cmd_type: str, cmd: InstrumentCommand,
                               service_request: ServiceRequest,
                               result: ServiceResponse) -> None:
 
-        self._log_dev(cmd.format(*service_request.args))
+        self._log_dev(cmd.render(service_request.args))
 
         if cmd_type == 'query':
-            value = eval(cmd.format(*service_request.args))
+            value = eval(cmd.render(service_request.args))
 
-            if service_request.type == ParameterType.set:
-                self._shared_memory[self._shared_memory_setter[
-                    service_request.id]] = value
-            else:
-                result.value = value
+            self._store_query_result(cmd, service_request, result,
+                                     value)
 
         elif cmd_type == 'write':
-            eval(cmd.format(*service_request.args))
+            eval(cmd.render(service_request.args))
 
         elif cmd_type == 'python_script' or cmd_type == 'bash_script':
             script_cmd = None
@@ -74,16 +72,12 @@ class ScriptInstrumentDriver(InstrumentDriver):
             if script_cmd is not None:
                 (code, output) = _get_out([
                             script_cmd
-                        ] + cmd.format(*service_request.args).split(' '))
+                        ] + cmd.render(service_request.args).split(' '))
 
                 output = output.decode('utf-8')
 
-                if service_request.type == ParameterType.set:
-                    if code != 0:
-                        result.type = ParameterType.error
-                        result.value = f'Return code {code}'
+                if service_request.type == ParameterType.set and code != 0:
+                    result.type = ParameterType.error
+                    result.value = f'Return code {code}'
 
-                    self._shared_memory[self._shared_memory_setter[
-                        service_request.id]] = output
-                else:
-                    result.value = output
+                self._store_query_result(cmd, service_request, result, output)
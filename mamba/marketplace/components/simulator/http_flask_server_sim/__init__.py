@@ -9,8 +9,10 @@
 
 import os
 import threading
-import http.client
+import socketserver
 from typing import Optional, Dict, Union
+from wsgiref.simple_server import make_server, WSGIServer, \
+    WSGIRequestHandler, ServerHandler
 
 from flask import Flask, request, make_response, jsonify, abort
 from rx import operators as op
@@ -41,6 +43,17 @@ def query_parameter():
     return str(params_dict[parameter])
 
 
+@app.route('/batch', methods=['GET'])
+def query_batch():
+    parameters = request.args.getlist('param', type=str)
+
+    if len(parameters) == 0 or any(parameter not in params_dict
+                                   for parameter in parameters):
+        abort(404)
+
+    return jsonify([str(params_dict[parameter]) for parameter in parameters])
+
+
 @app.route('/write', methods=['PUT'])
 def write_parameter():
     parameter = request.args.get('param', default='', type=str)
@@ -54,17 +67,54 @@ def write_parameter():
     return "OK"
 
 
-def shutdown_server():
-    func = request.environ.get('werkzeug.server.shutdown')
-    if func is None:
-        raise RuntimeError('Not running with the Werkzeug Server')
-    func()
+class KeepAliveServerHandler(ServerHandler):
+    """ WSGI handler answering with HTTP/1.1 responses """
+    http_version = '1.1'
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """ WSGI request handler serving several requests per connection.
+
+    The Werkzeug development server closes the connection after every
+    response, so the simulator is served by this handler to be able to
+    test keep-alive clients.
+    """
+    protocol_version = 'HTTP/1.1'
 
+    # Headers and body are written separately, do not delay the body
+    disable_nagle_algorithm = True
 
-@app.route('/shutdown', methods=['POST'])
-def shutdown():
-    shutdown_server()
-    return 'Server shutting down...'
+    def handle(self) -> None:
+        try:
+            self._handle_requests()
+        except ConnectionError:
+            pass  # Connection closed by the client
+
+    def _handle_requests(self) -> None:
+        while True:
+            self.raw_requestline = self.rfile.readline(65537)
+            if len(self.raw_requestline) > 65536 or \
+                    not self.parse_request():
+                return
+
+            handler = KeepAliveServerHandler(self.rfile,
+                                             self.wfile,
+                                             self.get_stderr(),
+                                             self.get_environ(),
+                                             multithread=True)
+            handler.request_handler = self
+            handler.run(self.server.get_app())
+
+            if self.close_connection:
+                return
+
+    def log_message(self, *args) -> None:
+        pass  # Requests are not logged
+
+
+class ThreadingWsgiServer(socketserver.ThreadingMixIn, WSGIServer):
+    """ WSGI server handling every connection in its own thread """
+    daemon_threads = True
 
 
 class FlaskServerMock(InstrumentDriver):
@@ -75,6 +125,7 @@ class FlaskServerMock(InstrumentDriver):
         super().__init__(os.path.dirname(__file__), context, local_config)
 
         self._flask_server_thread: Optional[threading.Thread] = None
+        self._flask_server: Optional[ThreadingWsgiServer] = None
 
     def initialize(self) -> None:
         global app
@@ -84,10 +135,21 @@ class FlaskServerMock(InstrumentDriver):
         for key, parameter_info in self._configuration['parameters'].items():
             params_dict[key] = parameter_info.get('initial_value')
 
+        try:
+            self._flask_server = make_server(
+                '127.0.0.1',
+                self._instrument.port,
+                app,
+                server_class=ThreadingWsgiServer,
+                handler_class=KeepAliveRequestHandler)
+        except OSError as exc:
+            self._log_error(f'Flask Server could not be started: {exc}')
+            return
+
         # Start a thread with the server -- that thread will then start one
-        # more thread for each request
+        # more thread for each connection
         self._flask_server_thread = threading.Thread(
-            target=lambda: app.run(port=self._instrument.port))
+            target=self._flask_server.serve_forever)
 
         # Exit the server thread when the main thread terminates
         self._flask_server_thread.daemon = True
@@ -97,11 +159,7 @@ class FlaskServerMock(InstrumentDriver):
 
     def _close(self, rx_value: Optional[Empty] = None) -> None:
         """ Entry point for closing the component """
-        if self._flask_server_thread is not None:
-            try:
-                conn = http.client.HTTPConnection(self._instrument.address,
-                                                  self._instrument.port)
-
-                conn.request("POST", "/shutdown")
-            except OSError:
-                pass
+        if self._flask_server is not None:
+            self._flask_server.shutdown()
+            self._flask_server.server_close()
+            self._flask_server = None
@@ -12,6 +12,7 @@ import time
 import threading
 import socketserver
 from typing import Optional, Dict
+from functools import partial
 import queue
 
 from stringparser import Parser
@@ -23,6 +24,13 @@ from mamba.core.component_base import InstrumentDriver
 cyclic_tm_delay = 10
 
 
+def set_link_field(value: str, link: int, field: str) -> str:
+    """ Replace the field of a link in a space separated telemetry """
+    fields = value.split(" ")
+    fields[link] = field
+    return " ".join(fields)
+
+
 class H8823GatewayTmTcMock(InstrumentDriver):
     """ Simple TCP Server Mock """
     def __init__(self,
@@ -138,8 +146,12 @@ class ThreadedCyclicTmHandler(socketserver.BaseRequestHandler):
                         f'SPWG_TM_SPW_RX_TICK_CTR 6 7 8 9'
                         f'{self.server.eom_w}'.encode(self.server.encoding))
                 else:
+                    # Every cycle publishes the values of one instant
+                    telemetries = self.server.telemetries.values_snapshot(
+                        self.server.telemetry_map)
+
                     for key, value in self.server.telemetry_map.items():
-                        socket_tm = value.format(self.server.telemetries[key])
+                        socket_tm = value.format(telemetries[key])
                         self.server.log_dev(
                             fr' - Publish socket cyclic TM: {socket_tm}')
                         self.request.sendall(
@@ -213,18 +225,18 @@ class ThreadedTcpHandler(socketserver.BaseRequestHandler):
                                 or key == 'spw_link_autostart'
                                 or key == 'spw_link_timecode_enabled'
                                 or key == 'spw_link_start'):
-                            value_split = self.server.telemetries[key].split(
-                                " ")
                             status = 1 if args[0] == 'ENA' else 0
-                            value_split[int(args[1])] = str(status)
-                            self.server.telemetries[key] = " ".join(
-                                value_split)
+                            self.server.telemetries.modify(
+                                key,
+                                partial(set_link_field,
+                                        link=int(args[1]),
+                                        field=str(status)))
                         elif key == 'spw_link_tx_rate':
-                            value_split = self.server.telemetries[key].split(
-                                " ")
-                            value_split[int(args[0])] = str(args[1])
-                            self.server.telemetries[key] = " ".join(
-                                value_split)
+                            self.server.telemetries.modify(
+                                key,
+                                partial(set_link_field,
+                                        link=int(args[0]),
+                                        field=str(args[1])))
                         elif key == 'tm_period':
                             global cyclic_tm_delay
                             cyclic_tm_delay = int(args[0])
@@ -16,6 +16,8 @@ from typing import Optional, Dict
 from mamba.core.msg import Empty
 from mamba.core.context import Context
 from mamba.core.component_base import InstrumentDriver
+from mamba.core.component_base.tcp_instrument_driver import \
+    TcpStreamReader, MessageTooLongError
 
 
 class CyclicTmTcpMock(InstrumentDriver):
@@ -106,8 +108,12 @@ class ThreadedCyclicTmHandler(socketserver.BaseRequestHandler):
         # Send  telemetries
         while self.server.do_run:
             try:
+                # Every cycle publishes the values of one instant
+                telemetries = self.server.telemetries.values_snapshot(
+                    self.server.telemetry_map)
+
                 for key, value in self.server.telemetry_map.items():
-                    socket_tm = value.format(self.server.telemetries[key])
+                    socket_tm = value.format(telemetries[key])
                     self.server.log_dev(
                         fr' - Publish socket cyclic TM: {socket_tm}')
                     self.request.sendall(
@@ -146,14 +152,22 @@ class ThreadedTcpHandler(socketserver.BaseRequestHandler):
     client.
     """
     def handle(self):
+        # self.request is the TCP socket connected to the client
+        reader = TcpStreamReader(
+            self.request, bytes(self.server.eom_r, self.server.encoding))
+
         # Server to receive remote commands
         while self.server.do_run:
-            # self.request is the TCP socket connected to the client
-            data = str(self.request.recv(1024), self.server.encoding)
-            if not data:
+            try:
+                messages = reader.read_messages()
+            except MessageTooLongError:
+                self.server.telemetries['syst_err'] = '1,_Command_Error'
+                continue
+            except OSError:
                 break
 
-            for cmd in data.split(self.server.eom_r)[:-1]:
+            for message in messages:
+                cmd = str(message, self.server.encoding)
                 self.server.log_dev(fr' - Received socket TC: {cmd}')
                 cmd = cmd.split(" ")
                 if len(cmd) >= 2:
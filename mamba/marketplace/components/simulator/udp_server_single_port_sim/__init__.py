@@ -15,6 +15,8 @@ from typing import Optional
 from mamba.core.msg import Empty
 from mamba.core.context import Context
 from mamba.core.component_base import InstrumentDriver
+from mamba.core.component_base.udp_instrument_driver import \
+    SEQUENCE_TAG_PREFIX
 
 
 class SinglePortUdpMock(InstrumentDriver):
@@ -74,6 +76,13 @@ class ThreadedUdpHandler(socketserver.BaseRequestHandler):
 
         for cmd in data.split(self.server.eom_r)[:-1]:
             self.server.log_dev(fr' - Received socket TC: {cmd}')
+
+            # Sequence tags of tagged queries are echoed in the reply
+            tag = ''
+            if cmd.startswith(SEQUENCE_TAG_PREFIX):
+                tag, _, cmd = cmd.partition(' ')
+                tag = f'{tag} '
+
             cmd = cmd.split(" ")
             if len(cmd) >= 2:
                 key = cmd[0].lower()
@@ -91,7 +100,7 @@ class ThreadedUdpHandler(socketserver.BaseRequestHandler):
                 if key in self.server.telemetries:
                     socket.sendto(
                         bytes(
-                            f'{self.server.telemetries[key]}'
+                            f'{tag}{self.server.telemetries[key]}'
                             f'{self.server.eom_w}', self.server.encoding),
                         self.client_address)
 
@@ -99,7 +108,7 @@ class ThreadedUdpHandler(socketserver.BaseRequestHandler):
                         self.server.telemetries['syst_err'] = '0,_No_Error'
                 else:
                     socket.sendto(
-                        bytes(f'KeyError{self.server.eom_w}',
+                        bytes(f'{tag}KeyError{self.server.eom_w}',
                               self.server.encoding), self.client_address)
 
                     self.server.telemetries['syst_err'] = '1,_Command_Error'
@@ -8,6 +8,7 @@
 """ Component for simulating XMLRPC server equipment """
 
 import os
+import socketserver
 import threading
 from typing import Optional
 
@@ -24,11 +25,19 @@ class RequestHandler(SimpleXMLRPCRequestHandler):
     rpc_paths = ('/RPC2', )
 
 
+class KeepAliveRequestHandler(RequestHandler):
+    """ Request handler keeping the client connections alive between calls.
+    Only used by the threaded server, a single threaded server would not
+    serve other clients while a connection is kept alive. """
+    protocol_version = 'HTTP/1.1'
+
+
 class MockXMLRPCServer(SimpleXMLRPCServer):
     def __init__(self, address, tm_dict, request_handler=RequestHandler):
         super().__init__(address, request_handler)
 
         self.register_introspection_functions()
+        self.register_multicall_functions()
         self._tm_dict = tm_dict
 
         def raw_write(tm):
@@ -43,6 +52,12 @@ class MockXMLRPCServer(SimpleXMLRPCServer):
                                'query')
 
 
+class ThreadedMockXMLRPCServer(socketserver.ThreadingMixIn,
+                               MockXMLRPCServer):
+    """ XMLRPC Mock Server handling every connection in its own thread """
+    daemon_threads = True
+
+
 class XmlRpcMock(InstrumentDriver):
     """ XMLRPC Server Mock """
     def __init__(self,
@@ -61,15 +76,26 @@ class XmlRpcMock(InstrumentDriver):
         if self._server_thread is not None:
             self._server_thread.join()
 
+        if self._server is not None:
+            # Release the port, do not wait for garbage collection
+            self._server.server_close()
+
     def initialize(self) -> None:
         for key, parameter_info in self._configuration['parameters'].items():
             self._shared_memory[key] = parameter_info.get('initial_value')
 
+        if self._configuration['instrument'].get('threaded'):
+            server_class = ThreadedMockXMLRPCServer
+            request_handler = KeepAliveRequestHandler
+        else:
+            server_class = MockXMLRPCServer
+            request_handler = RequestHandler
+
         # Create the XMLRPC server, binding to host and port
-        self._server = MockXMLRPCServer(address=(self._instrument.address,
-                                                 self._instrument.port),
-                                        tm_dict=self._shared_memory,
-                                        request_handler=RequestHandler)
+        self._server = server_class(address=(self._instrument.address,
+                                             self._instrument.port),
+                                    tm_dict=self._shared_memory,
+                                    request_handler=request_handler)
 
         # Start a thread with the server -- that thread will then start one
         # more thread for each request
@@ -7,12 +7,14 @@
 ############################################################################
 """ Single Port TCP controller base """
 
-from typing import Optional, Dict, Any
+from typing import Optional
 import os
 import struct
 import socket
 
 from mamba.core.component_base import TcpInstrumentDriver
+from mamba.core.component_base.instrument_driver import InstrumentCommand, \
+    CommandPlan
 from mamba.core.context import Context
 from mamba.core.rmap_utils.rmap_common \
     import RMAP, rmap_bytes_to_dict
@@ -54,7 +56,20 @@ class H8823SpwRmapController(TcpInstrumentDriver):
         # Initialize instrument configuration
         self._rmap = RMAP(self._configuration.get('rmap'))
 
-    def _process_inst_command(self, cmd_type: str, cmd: Dict[str, Any],
+    def _process_inst_plan(self, plan: CommandPlan,
+                           service_request: ServiceRequest,
+                           result: ServiceResponse) -> None:
+        try:
+            super()._process_inst_plan(plan, service_request, result)
+        finally:
+            # Restore the socket timeout shortened by the request deadline
+            if self._inst is not None:
+                try:
+                    self._inst.settimeout(self._reply_timeout())
+                except OSError:
+                    pass  # Closed socket, restored on reconnection
+
+    def _process_inst_command(self, cmd_type: str, cmd: InstrumentCommand,
                               service_request: ServiceRequest,
                               result: ServiceResponse) -> None:
 
@@ -66,10 +81,15 @@ class H8823SpwRmapController(TcpInstrumentDriver):
 
             if self._inst is not None:
                 try:
+                    # The replies are read directly from the socket
+                    self._inst.settimeout(
+                        self._request_timeout(service_request,
+                                              self._reply_timeout()))
+
                     if cmd_type == 'query':
                         try:
                             raw_cmd = bytes.fromhex(
-                                cmd.format(*service_request.args))
+                                cmd.render(service_request.args))
                             rmap_raw_write(self._inst, raw_cmd)
                             self._shared_memory['last_raw_cmd'] = raw_cmd.hex(
                             ).upper()
@@ -81,18 +101,15 @@ class H8823SpwRmapController(TcpInstrumentDriver):
 
                         raw_reply = rmap_raw_reply(self._inst).hex().upper()
 
-                        if service_request.type == ParameterType.set:
-                            self._shared_memory[self._shared_memory_setter[
-                                service_request.id]] = raw_reply
-                        else:
-                            result.value = raw_reply
+                        self._store_query_result(cmd, service_request, result,
+                                                 raw_reply)
 
                         self._shared_memory['last_raw_reply'] = raw_reply
 
                     elif cmd_type == 'write':
                         try:
                             raw_cmd = bytes.fromhex(
-                                cmd.format(*service_request.args))
+                                cmd.render(service_request.args))
                             rmap_raw_write(self._inst, raw_cmd)
                             self._shared_memory['last_raw_cmd'] = raw_cmd.hex()
                         except ValueError:
@@ -102,27 +119,24 @@ class H8823SpwRmapController(TcpInstrumentDriver):
                             return
 
                     elif cmd_type == 'rmap':
+                        code = cmd.command['command_code']
+                        size = cmd.command.get('size')
+                        args = service_request.args
+
                         try:
                             rmap_cmd = self._rmap.get_rmap_cmd(
-                                write=cmd['command_code'].get('write', 0),
-                                verify=cmd['command_code'].get('verify', 0),
-                                reply=cmd['command_code'].get('reply', 0),
-                                inc=cmd['command_code'].get(
-                                    'increment_address', 0),
-                                address=int(
-                                    cmd['address'].format(
-                                        *service_request.args), 16),
-                                size=cmd.get('size')
-                                if isinstance(cmd.get('size'), int) else int(
-                                    cmd.get(
-                                        'size',
-                                        '0').format(*service_request.args)),
-                                data_hex_str=cmd.get(
-                                    'body', '').format(*service_request.args),
+                                write=code.get('write', 0),
+                                verify=code.get('verify', 0),
+                                reply=code.get('reply', 0),
+                                inc=code.get('increment_address', 0),
+                                address=int(cmd.render_field('address', args),
+                                            16),
+                                size=size if isinstance(size, int) else int(
+                                    cmd.render_field('size', args, '0')),
+                                data_hex_str=cmd.render_field('body', args),
                                 extended_addr=int(
-                                    cmd.get(
-                                        'extended_addr',
-                                        '0').format(*service_request.args)),
+                                    cmd.render_field('extended_addr', args,
+                                                     '0')),
                             )
                         except ValueError:
                             result.type = ParameterType.error
@@ -134,7 +148,7 @@ class H8823SpwRmapController(TcpInstrumentDriver):
                         self._shared_memory['last_raw_cmd'] = rmap_cmd.hex(
                         ).upper()
 
-                        if cmd['command_code'].get('reply', 0) == 1:
+                        if code.get('reply', 0) == 1:
                             raw_reply = rmap_raw_reply(self._inst)
                             self._shared_memory[
                                 'last_raw_reply'] = raw_reply.hex().upper()
@@ -145,17 +159,20 @@ class H8823SpwRmapController(TcpInstrumentDriver):
                                 result.type = ParameterType.error
                                 result.value = 'RMAP Reply error'
 
-                            if cmd['command_code'].get('write', 0) == 0:
+                            if code.get('write', 0) == 0:
                                 res = reply['data'].hex().upper()
 
-                                if service_request.type == ParameterType.set:
-                                    self._shared_memory[
-                                        self._shared_memory_setter[
-                                            service_request.id]] = res
-                                else:
-                                    result.value = res
+                                self._store_query_result(
+                                    cmd, service_request, result, res)
 
                 except (ConnectionRefusedError, OSError):
+                    if self._deadline_exceeded(service_request, result):
+                        return
+
+                    if self._supervisor is not None:
+                        self._connection_lost(result)
+                        return
+
                     self._instrument_disconnect()
                     self._instrument_connect()
                     continue
@@ -9,60 +9,54 @@
 
 from typing import Optional
 import os
-
-from stringparser import Parser
+import time
 
 from mamba.core.component_base import TcpTmTcCyclic
+from mamba.core.component_base.tcp_instrument_driver import \
+    TcpStreamReader, MessageTooLongError
 from mamba.core.context import Context
 from mamba.core.msg import ServiceResponse, ParameterType
 
 
 class ThreadedCyclicTmHandler:
     def __init__(self, sock, eom, shared_memory, rx, log_info,
-                 cyclic_tm_mapping, provider):
-        half_tm = ''
+                 cyclic_tm_parser, provider, history):
+        reader = TcpStreamReader(sock, bytes(eom, 'utf-8'))
+
         while True:
             try:
-                # self.request is the TCP socket connected to the client
-                data = str(sock.recv(1024), 'utf-8')
-                if not data:
-                    break
-
-                if half_tm != '':
-                    data = half_tm + data
+                messages = reader.read_messages()
+            except MessageTooLongError:
+                cyclic_tm_parser.unparsed += 1
+                continue
+            except OSError:
+                break
 
-                data_split = data.split(eom)
+            timestamp = time.time()
 
-                if data[-1] != eom:
-                    if len(data_split) > 0:
-                        half_tm = data_split[-1]
-                    else:
-                        half_tm = data
-                else:
-                    half_tm = ''
+            for message in messages:
+                raw_cmd = str(message, 'utf-8', 'replace')
 
-                data_split = data_split[:-1]
+                if '_TC_' in raw_cmd:  # Filter TC echos
+                    continue
 
-                for raw_cmd in data_split:
-                    if '_TC_' in raw_cmd:  # Filter TC echos
-                        continue
-                    cmd = raw_cmd.split(' ', 1)[1]
-                    for key, val in cyclic_tm_mapping.items():
-                        try:
-                            shared_memory[key] = Parser(val)(cmd)
+                # Remove the timestamp of the telemetry
+                _, _, cmd = raw_cmd.partition(' ')
 
-                            result = ServiceResponse(provider=provider,
-                                                     id=key,
-                                                     type=ParameterType.get,
-                                                     value=shared_memory[key])
+                for key, value in cyclic_tm_parser.parse(cmd):
+                    shared_memory[key] = value
 
-                            rx['io_result'].on_next(result)
+                    if key in history:
+                        history[key].append(timestamp, value)
 
-                        except ValueError:
-                            continue
+                    result = ServiceResponse(provider=provider,
+                                             id=key,
+                                             type=ParameterType.get,
+                                             value=value)
 
-            except OSError:
-                break
+                    # Published to io_result by the component, according
+                    # to the parameter publish policy
+                    rx['io_result_raw'].on_next(result)
 
         log_info('Remote Cyclic TM socket connection has been closed')
 
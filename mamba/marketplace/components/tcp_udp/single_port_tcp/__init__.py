@@ -10,11 +10,11 @@
 from typing import Optional
 import os
 
-from mamba.core.component_base import TcpInstrumentDriver
+from mamba.core.component_base import AsyncTcpInstrumentDriver
 from mamba.core.context import Context
 
 
-class SinglePortTcpController(TcpInstrumentDriver):
+class SinglePortTcpController(AsyncTcpInstrumentDriver):
     """ Simple TCP controller base class """
     def __init__(self,
                  context: Context,
@@ -10,11 +10,11 @@
 from typing import Optional
 import os
 
-from mamba.core.component_base import UdpInstrumentDriver
+from mamba.core.component_base import AsyncUdpInstrumentDriver
 from mamba.core.context import Context
 
 
-class SinglePortUdpController(UdpInstrumentDriver):
+class SinglePortUdpController(AsyncUdpInstrumentDriver):
     """ Simple UDP controller base class """
     def __init__(self,
                  context: Context,
@@ -13,7 +13,8 @@ import os
 
 from mamba.core.component_base import TcpInstrumentDriver
 from mamba.core.component_base.tcp_instrument_driver import \
-    tcp_raw_write, tcp_raw_read
+    tcp_raw_write, tcp_raw_read, MessageTooLongError
+from mamba.core.component_base.instrument_driver import InstrumentCommand
 from mamba.core.context import Context
 from mamba.core.msg import ServiceResponse, ParameterType, ServiceRequest
 
@@ -47,6 +48,12 @@ class TwoPortsTcpController(TcpInstrumentDriver):
 
             self._inst_tm.connect(
                 (self._instrument.address, self._instrument.tm_port))
+            self._reader = self._new_reader(self._inst_tm)
+
+            if self._instrument.reply_timeout is not None:
+                self._inst.settimeout(float(self._instrument.reply_timeout))
+                self._inst_tm.settimeout(float(
+                    self._instrument.reply_timeout))
 
             if result is not None and result.id in self._shared_memory_setter:
                 self._shared_memory[self._shared_memory_setter[result.id]] = 1
@@ -70,13 +77,14 @@ class TwoPortsTcpController(TcpInstrumentDriver):
         if self._inst_tm is not None:
             self._inst_tm.close()
             self._inst_tm = None
+            self._reader = None
 
         if result is not None and result.id in self._shared_memory_setter:
             self._shared_memory[self._shared_memory_setter[result.id]] = 0
 
         self._log_dev("Closed connection to Instrument")
 
-    def _process_inst_command(self, cmd_type: str, cmd: str,
+    def _process_inst_command(self, cmd_type: str, cmd: InstrumentCommand,
                               service_request: ServiceRequest,
                               result: ServiceResponse) -> None:
         connection_attempts = 0
@@ -89,27 +97,35 @@ class TwoPortsTcpController(TcpInstrumentDriver):
                 try:
                     if cmd_type == 'query':
                         tcp_raw_write(self._inst,
-                                      cmd.format(*service_request.args),
+                                      cmd.render(service_request.args),
                                       self._instrument.terminator_write,
                                       self._instrument.encoding)
 
-                        value = tcp_raw_read(self._inst_tm,
-                                             self._instrument.terminator_read,
-                                             self._instrument.encoding)
+                        value = tcp_raw_read(self._reader,
+                                             self._instrument.encoding,
+                                             service_request.deadline)
 
-                        if service_request.type == ParameterType.set:
-                            self._shared_memory[self._shared_memory_setter[
-                                service_request.id]] = value
-                        else:
-                            result.value = value
+                        self._store_query_result(cmd, service_request, result,
+                                                 value)
 
                     elif cmd_type == 'write':
                         tcp_raw_write(self._inst,
-                                      cmd.format(*service_request.args),
+                                      cmd.render(service_request.args),
                                       self._instrument.terminator_write,
                                       self._instrument.encoding)
 
+                except MessageTooLongError as exc:
+                    result.type = ParameterType.error
+                    result.value = str(exc)
+                    self._log_error(result.value)
                 except (ConnectionRefusedError, OSError):
+                    if self._deadline_exceeded(service_request, result):
+                        return
+
+                    if self._supervisor is not None:
+                        self._connection_lost(result)
+                        return
+
                     self._instrument_disconnect()
                     self._instrument_connect()
                     continue
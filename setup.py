@@ -71,6 +71,7 @@ setup(
     install_requires=[
         'PySide2==5.14.2.2',
         'Rx>=3.1.0',
+        'numpy>=1.16',
         'PyVISA>=1.10.1',
         'PyVISA-sim>=0.3',
         'PyVISA-py>=0.4.0',
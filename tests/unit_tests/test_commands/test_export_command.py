@@ -0,0 +1,80 @@
+from tempfile import mkdtemp
+from os.path import join
+from shutil import rmtree
+
+import numpy
+
+from mamba.core.telemetry_archive import ArchiveWriter
+from mamba.core.testing.utils import get_testenv, cmd_exec, cmd_exec_output
+
+
+class TestClass:
+    def setup_method(self):
+        """ setup_method called for every method """
+        self.temp_path = mkdtemp()
+        self.cwd = self.temp_path
+        self.archive_path = join(self.temp_path, 'archive')
+        self.env = get_testenv()
+
+        writer = ArchiveWriter(self.archive_path)
+        writer.start()
+        for index in range(5):
+            writer.append(1000.0 + index, 'power_supply', 'voltage', index)
+            writer.append(1000.5 + index, 'power_supply', 'current', 0.5)
+        writer.close()
+
+    def teardown_method(self):
+        """ teardown_method called for every method """
+        rmtree(self.temp_path)
+
+    def test_export_help(self):
+        assert cmd_exec(self, 'mamba', 'export', '-h') == 0
+        output = cmd_exec_output(self, 'mamba', 'export', '-h')
+        assert 'usage' in output
+        assert 'mamba export' in output
+        assert '--help' in output
+
+    def test_export_non_existing(self):
+        assert cmd_exec(self, 'mamba', 'export', 'non_existing') == 1
+        assert 'Unable to find telemetry archive' in cmd_exec_output(
+            self, 'mamba', 'export', 'non_existing')
+
+        assert cmd_exec(self, 'mamba', 'export', 'archive', '-i',
+                        'unknown') == 1
+
+    def test_export_csv(self):
+        assert cmd_exec(self, 'mamba', 'export', 'archive', '-i', 'voltage',
+                        '--start', '1001', '--end', '1003') == 0
+        assert cmd_exec_output(self, 'mamba', 'export', 'archive', '-i',
+                               'voltage', '--start', '1001', '--end',
+                               '1003') == (
+                                   'timestamp,provider,parameter,value\n'
+                                   '1001.0,power_supply,voltage,1.0\n'
+                                   '1002.0,power_supply,voltage,2.0\n'
+                                   '1003.0,power_supply,voltage,3.0\n')
+
+        assert cmd_exec(self, 'mamba', 'export', 'archive', '-o',
+                        'export.csv') == 0
+        with open(join(self.temp_path, 'export.csv')) as file:
+            lines = file.read().splitlines()
+
+        assert len(lines) == 11
+        assert lines[1] == '1000.5,power_supply,current,0.5'
+
+    def test_export_npz(self):
+        assert cmd_exec(self, 'mamba', 'export', 'archive', '-f', 'npz') == 1
+
+        assert cmd_exec(self, 'mamba', 'export', 'archive', '-f', 'npz',
+                        '--end', '1002', '-o', 'export.npz') == 0
+
+        with numpy.load(join(self.temp_path, 'export.npz')) as arrays:
+            assert sorted(arrays.files) == [
+                'power_supply.current.time', 'power_supply.current.value',
+                'power_supply.voltage.time', 'power_supply.voltage.value'
+            ]
+            assert arrays['power_supply.voltage.value'].tolist() == [
+                0.0, 1.0, 2.0
+            ]
+            assert arrays['power_supply.current.time'].tolist() == [
+                1000.5, 1001.5
+            ]
@@ -625,6 +625,118 @@ class TestClass:
 
         time.sleep(1)
 
+    def test_keep_alive_connection_pool(self):
+        # Start Mock
+        mock = FlaskServerMock(self.context,
+                               local_config={'instrument': {
+                                   'port': 9302
+                               }})
+        mock.initialize()
+
+        time.sleep(1)
+
+        dummy_test_class = CallbackTestClass()
+
+        # Subscribe to the topic that shall be published
+        self.context.rx['io_result'].pipe(
+            op.filter(
+                lambda value: isinstance(value, ServiceResponse))).subscribe(
+                    dummy_test_class.test_func_1)
+
+        component = HttpController(self.context,
+                                   local_config={
+                                       'instrument': {
+                                           'port': 9302
+                                       },
+                                       'parameters': {
+                                           'all_params': {
+                                               'type': 'str',
+                                               'description':
+                                               'Batched queries',
+                                               'get': {
+                                                   'instrument_command': [{
+                                                       'query':
+                                                       'parameter_1'
+                                                   }, {
+                                                       'query':
+                                                       'parameter_3'
+                                                   }]
+                                               },
+                                           }
+                                       }
+                                   })
+        component.initialize()
+
+        # 1 - Test connection reused between commands, responses drained
+        for value in ['5', '6', '7']:
+            self.context.rx['io_service_request'].on_next(
+                ServiceRequest(provider='http_controller',
+                               id='parameter_1',
+                               type=ParameterType.set,
+                               args=[value]))
+
+            self.context.rx['io_service_request'].on_next(
+                ServiceRequest(provider='http_controller',
+                               id='parameter_1',
+                               type=ParameterType.get,
+                               args=[]))
+
+            time.sleep(.1)
+
+            assert dummy_test_class.func_1_last_value.value == value
+
+        assert dummy_test_class.func_1_times_called == 6
+        assert component._pool.opened == 1
+
+        # 2 - Test batched queries, last reply is published
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='http_controller',
+                           id='all_params',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 7
+        assert dummy_test_class.func_1_last_value.id == 'all_params'
+        assert dummy_test_class.func_1_last_value.type == ParameterType.get
+        assert dummy_test_class.func_1_last_value.value == '3'
+
+        # 3 - Test recovery of a dead connection
+        component._pool._idle.queue[0].sock.close()
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='http_controller',
+                           id='parameter_1',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 8
+        assert dummy_test_class.func_1_last_value.type == ParameterType.get
+        assert dummy_test_class.func_1_last_value.value == '7'
+        assert component._pool.reconnected == 1
+        assert component._pool.opened == 2
+
+        # 4 - Test HTTP errors
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='http_controller',
+                           id='raw_query',
+                           type=ParameterType.set,
+                           args=['NOT_EXISTING']))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 9
+        assert dummy_test_class.func_1_last_value.type == ParameterType.error
+        assert dummy_test_class.func_1_last_value.value == \
+            'Instrument replied with HTTP status 404'
+
+        self.context.rx['quit'].on_next(Empty())
+
+        time.sleep(1)
+
     def test_service_invalid_info(self):
         with pytest.raises(ComponentConfigException) as excinfo:
             HttpController(self.context,
@@ -825,6 +825,100 @@ class TestClass:
         assert '"new_param" Command for GET does not have a Query' in str(
             excinfo.value)
 
+    def test_multicall_command_plan(self):
+        # Start Mock
+        mock = XmlRpcMock(self.context,
+                          local_config={
+                              'instrument': {
+                                  'port': 9303,
+                                  'threaded': True
+                              }
+                          })
+        mock.initialize()
+
+        dummy_test_class = CallbackTestClass()
+
+        # Subscribe to the topic that shall be published
+        self.context.rx['io_result'].pipe(
+            op.filter(
+                lambda value: isinstance(value, ServiceResponse))).subscribe(
+                    dummy_test_class.test_func_1)
+
+        component = XmlRpcController(self.context,
+                                     local_config={
+                                         'instrument': {
+                                             'port': 9303
+                                         },
+                                         'parameters': {
+                                             'new_param': {
+                                                 'type': 'str',
+                                                 'description':
+                                                 'New parameter description',
+                                                 'get': {
+                                                     'instrument_command': [{
+                                                         'write':
+                                                         'parameter_1 5'
+                                                     }, {
+                                                         'query':
+                                                         'parameter_2'
+                                                     }, {
+                                                         'query':
+                                                         'parameter_1'
+                                                     }]
+                                                 },
+                                             }
+                                         }
+                                     })
+        component.initialize()
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='xmlrpc_controller',
+                           id='connect',
+                           type=ParameterType.set,
+                           args=['1']))
+
+        # Count the HTTP requests sent through the persistent transport
+        requests = []
+        transport_request = component._transport.request
+
+        def count_request(*args, **kwargs):
+            requests.append(args[1])
+            return transport_request(*args, **kwargs)
+
+        component._transport.request = count_request
+
+        # Whole command plan sent in one request
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='xmlrpc_controller',
+                           id='new_param',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 2
+        assert dummy_test_class.func_1_last_value.id == 'new_param'
+        assert dummy_test_class.func_1_last_value.type == ParameterType.get
+        assert dummy_test_class.func_1_last_value.value == '5'
+        assert len(requests) == 1
+
+        # Single commands are sent directly
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='xmlrpc_controller',
+                           id='parameter_2',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 3
+        assert dummy_test_class.func_1_last_value.value == '2'
+        assert len(requests) == 2
+
+        self.context.rx['quit'].on_next(Empty())
+
+        time.sleep(.1)
+
     def test_quit_observer(self):
         """ Test component quit observer """
         class Test:
@@ -92,6 +92,20 @@ class TestClass:
         assert response.reason == 'OK'
         assert response.read() == b'33'
 
+        conn_2.request("GET", "/batch?param=parameter_3&param=parameter_1")
+        response = conn_2.getresponse()
+        assert response.status == 200
+        assert response.reason == 'OK'
+        assert response.read() == b'["33","11"]\n'
+
+        conn_2.request("GET", "/batch?param=parameter_3&param=wrong")
+        response = conn_2.getresponse()
+        assert response.status == 404
+        assert response.read() == b'{"error":"Not found"}\n'
+
+        # Connection kept alive between requests
+        assert not response.will_close
+
         self.mock._close()
 
     def test_error_handling(self):
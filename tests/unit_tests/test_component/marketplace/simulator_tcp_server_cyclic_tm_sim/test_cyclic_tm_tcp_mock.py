@@ -107,8 +107,8 @@ class TestClass:
 
                 assert received == 'PARAMETER_1 1\nPARAMETER_2 2\nPARAMETER_3 3\n'
 
-                # Test wrong message ending
-                sock.sendall(bytes('PARAMETER_1 4\n', "utf-8"))
+                # Test message without terminator is not executed
+                sock.sendall(bytes('PARAMETER_1 ', "utf-8"))
 
                 time.sleep(.1)
 
@@ -118,23 +118,23 @@ class TestClass:
                 received = str(sock_tm.recv(1024), "utf-8")
                 assert received == 'PARAMETER_1 1\nPARAMETER_2 2\nPARAMETER_3 3\n'
 
-                # Test wrong number or parameters
-                sock.sendall(bytes('PARAMETER_1\n', "utf-8"))
+                # Test message completed in a later segment
+                sock.sendall(bytes('4\r\n', "utf-8"))
 
                 # Test cyclic telemetry reception
                 time.sleep(5)
                 # Receive data from the server and shut down
                 received = str(sock_tm.recv(1024), "utf-8")
-                assert received == 'PARAMETER_1 1\nPARAMETER_2 2\nPARAMETER_3 3\n'
+                assert received == 'PARAMETER_1 4\nPARAMETER_2 2\nPARAMETER_3 3\n'
 
                 # Test wrong number or parameters
-                sock.sendall(bytes('PARAMETER_5 1234\r\n', "utf-8"))
+                sock.sendall(bytes('PARAMETER_1\r\nPARAMETER_5 1234\r\n', "utf-8"))
 
                 # Test cyclic telemetry reception
                 time.sleep(5)
                 # Receive data from the server and shut down
                 received = str(sock_tm.recv(1024), "utf-8")
-                assert received == 'PARAMETER_1 1\nPARAMETER_2 2\nPARAMETER_3 3\n'
+                assert received == 'PARAMETER_1 4\nPARAMETER_2 2\nPARAMETER_3 3\n'
 
                 sock.sendall(bytes('SYST:ERR?\r\n', "utf-8"))
 
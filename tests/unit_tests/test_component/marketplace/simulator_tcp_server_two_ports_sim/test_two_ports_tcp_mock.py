@@ -122,19 +122,19 @@ class TestClass:
                 received = str(sock_tm.recv(1024), "utf-8")
                 assert received == '1\n2\n3\n'
 
-                # Test wrong message ending
-                sock_tc.sendall(bytes('PARAMETER_1 4\n', "utf-8"))
+                # Test message split across segments
+                sock_tc.sendall(bytes('PARAMETER_1 ', "utf-8"))
 
                 time.sleep(.1)
 
-                sock_tc.sendall(bytes('PARAMETER_1?\r\n', "utf-8"))
+                sock_tc.sendall(bytes('4\r\nPARAMETER_1?\r\n', "utf-8"))
 
                 # Receive data from the server and shut down
                 received = str(sock_tm.recv(1024), "utf-8")
-                assert received == '1\n'
+                assert received == '4\n'
 
                 # Test wrong number or parameters
-                sock_tc.sendall(bytes('PARAMETER_1\n', "utf-8"))
+                sock_tc.sendall(bytes('PARAMETER_1\r\n', "utf-8"))
 
                 time.sleep(.1)
 
@@ -142,7 +142,7 @@ class TestClass:
 
                 # Receive data from the server and shut down
                 received = str(sock_tm.recv(1024), "utf-8")
-                assert received == '1\n'
+                assert received == '4\n'
 
                 # Test wrong number or parameters
                 sock_tc.sendall(bytes('PARAMETER_5 1234\r\n', "utf-8"))
@@ -45,3 +45,31 @@ class TestClass:
             assert client.query('parameter_4') == 'key-error'
 
         self.mock._close()
+
+    def test_multicall_threaded(self):
+        self.mock = XmlRpcMock(Context(),
+                               local_config={
+                                   'instrument': {
+                                       'port': 8906,
+                                       'threaded': True
+                                   }
+                               })
+        self.mock.initialize()
+
+        with xmlrpc.client.ServerProxy('http://localhost:8906') as client:
+            multicall = xmlrpc.client.MultiCall(client)
+            multicall.write('parameter_1 11')
+            multicall.query('parameter_1')
+            multicall.query('idn')
+
+            assert tuple(multicall()) == (0, '11',
+                                          'Mamba Framework,XMLRPC Mock,1.0')
+
+            # Concurrent client served while the connection is kept alive
+            with xmlrpc.client.ServerProxy(
+                    'http://localhost:8906') as client_2:
+                assert client_2.query('parameter_1') == '11'
+
+            assert client.query('parameter_2') == '2'
+
+        self.mock._close()
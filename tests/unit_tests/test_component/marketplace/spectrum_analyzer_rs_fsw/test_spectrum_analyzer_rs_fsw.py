@@ -2,6 +2,7 @@ import os
 import pytest
 import copy
 import time
+import numpy
 from tempfile import NamedTemporaryFile
 
 from rx import operators as op
@@ -529,7 +530,26 @@ class TestClass:
         assert dummy_test_class.func_1_last_value.type == ParameterType.get
         assert dummy_test_class.func_1_last_value.value == '0,_No_Error'
 
-        # 11 - Test disconnection to the instrument
+        # 11 - Test binary trace transfer
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(
+                provider='r&s_fsw_signal_and_spectrum_analyzer_controller',
+                id='trace_data',
+                type=ParameterType.get))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 11
+        assert dummy_test_class.func_1_last_value.id == 'trace_data'
+        assert dummy_test_class.func_1_last_value.type == ParameterType.get
+        assert isinstance(dummy_test_class.func_1_last_value.value,
+                          numpy.ndarray)
+        assert dummy_test_class.func_1_last_value.value.dtype == numpy.float32
+        assert dummy_test_class.func_1_last_value.value.tolist() == [
+            2.0, 2.5, 3.0
+        ]
+
+        # 12 - Test disconnection to the instrument
         self.context.rx['io_service_request'].on_next(
             ServiceRequest(
                 provider='r&s_fsw_signal_and_spectrum_analyzer_controller',
@@ -540,7 +560,7 @@ class TestClass:
         time.sleep(.1)
 
         assert component._inst is None
-        assert dummy_test_class.func_1_times_called == 11
+        assert dummy_test_class.func_1_times_called == 12
         assert dummy_test_class.func_1_last_value.id == 'connect'
         assert dummy_test_class.func_1_last_value.type == ParameterType.set
         assert dummy_test_class.func_1_last_value.value is None
@@ -555,7 +575,7 @@ class TestClass:
         time.sleep(.1)
 
         assert component._inst is None
-        assert dummy_test_class.func_1_times_called == 12
+        assert dummy_test_class.func_1_times_called == 13
         assert dummy_test_class.func_1_last_value.id == 'connected'
         assert dummy_test_class.func_1_last_value.type == ParameterType.get
         assert dummy_test_class.func_1_last_value.value == 0
@@ -694,6 +714,30 @@ class TestClass:
         assert '"new_param" Command for GET does not have a Query' in str(
             excinfo.value)
 
+        with pytest.raises(ComponentConfigException) as excinfo:
+            SpectrumAnalyzerRsFsw(self.context,
+                                  local_config={
+                                      'parameters': {
+                                          'new_param': {
+                                              'type': 'ndarray',
+                                              'description':
+                                              'New parameter description',
+                                              'get': {
+                                                  'instrument_command': [{
+                                                      'query_binary': {
+                                                          'command':
+                                                          'TRAC:DATA?',
+                                                          'dtype': 'float16'
+                                                      }
+                                                  }]
+                                              },
+                                          }
+                                      }
+                                  }).initialize()
+
+        assert '"new_param" binary query dtype shall be one of' in str(
+            excinfo.value)
+
     def test_connection_cases_normal_fail(self):
         dummy_test_class = CallbackTestClass()
 
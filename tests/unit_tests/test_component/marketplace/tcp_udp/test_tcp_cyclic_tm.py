@@ -937,6 +937,237 @@ class TestClass:
 
         time.sleep(1)
 
+    def test_history_services(self):
+        mock = CyclicTmTcpMock(self.context,
+                               local_config={
+                                   'instrument': {
+                                       'port': {
+                                           'tc': 21364,
+                                           'tm': 21365
+                                       },
+                                       'cyclic_tm': 0.02
+                                   }
+                               })
+        mock.initialize()
+
+        component = CyclicTmTcpController(
+            self.context,
+            local_config={
+                'instrument': {
+                    'port': {
+                        'tc': 21364,
+                        'tm': 21365
+                    }
+                },
+                'parameters': {
+                    'parameter_1': {
+                        'cyclic_tm_client': {
+                            'history': {
+                                'capacity': 10
+                            }
+                        }
+                    }
+                }
+            })
+        component.initialize()
+
+        assert component._parameter_info[(
+            'parameter_1_history_last', ParameterType.get)] == {
+                'description': 'Last samples of parameter_1, as timestamp '
+                'and value rows',
+                'signature': [[{
+                    'count': {
+                        'type': 'int'
+                    }
+                }], 'ndarray'],
+                'instrument_command': None,
+                'type': ParameterType.get
+            }
+        assert ('parameter_1_history_range',
+                ParameterType.get) in component._parameter_info
+        assert ('parameter_1_history_stats',
+                ParameterType.get) in component._parameter_info
+        assert ('parameter_2_history_last',
+                ParameterType.get) not in component._parameter_info
+
+        dummy_test_class = CallbackTestClass()
+        self.context.rx['io_result'].pipe(
+            op.filter(lambda value: isinstance(value, ServiceResponse) and
+                      'history' in value.id)).subscribe(
+                          dummy_test_class.test_func_1)
+
+        def request(service_id, args):
+            self.context.rx['io_service_request'].on_next(
+                ServiceRequest(provider='cyclic_telemetry_tcp_controller',
+                               id=service_id,
+                               type=ParameterType.get,
+                               args=args))
+            time.sleep(.05)
+            return dummy_test_class.func_1_last_value
+
+        start = time.time()
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='cyclic_telemetry_tcp_controller',
+                           id='connect',
+                           type=ParameterType.set,
+                           args=['1']))
+
+        time.sleep(.1)
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='cyclic_telemetry_tcp_controller',
+                           id='parameter_1',
+                           type=ParameterType.set,
+                           args=['5']))
+
+        time.sleep(.5)
+
+        history = component._history['parameter_1']
+        assert len(history) == 10
+
+        # Last samples, as timestamp and value rows
+        result = request('parameter_1_history_last', ['3'])
+        assert result.type == ParameterType.get
+        assert result.value.shape == (3, 2)
+        assert list(result.value[:, 1]) == [5, 5, 5]
+        assert start < result.value[0, 0] <= result.value[2, 0] < time.time()
+
+        result = request('parameter_1_history_range',
+                         [str(result.value[1, 0]),
+                          str(time.time())])
+        assert result.type == ParameterType.get
+        assert result.value.shape[0] >= 2
+        assert list(result.value[:2, 1]) == [5, 5]
+
+        result = request('parameter_1_history_range', ['0', str(start)])
+        assert result.value.shape == (0, 2)
+
+        result = request('parameter_1_history_stats', ['0.1'])
+        assert result.type == ParameterType.get
+        assert list(result.value) == [5, 5, 5]
+
+        result = request('parameter_1_history_stats', ['1', '2'])
+        assert result.type == ParameterType.error
+        assert 'Wrong number or arguments for parameter_1_history_stats' \
+            in result.value
+
+        result = request('parameter_1_history_last', ['many'])
+        assert result.type == ParameterType.error
+
+        self.context.rx['quit'].on_next(Empty())
+        time.sleep(.1)
+
+        # No samples are received after the disconnection
+        result = request('parameter_1_history_stats', ['0.05'])
+        assert result.type == ParameterType.error
+        assert result.value == 'No samples of parameter_1 in the window'
+
+    def test_publish_policy(self):
+        mock = CyclicTmTcpMock(self.context,
+                               local_config={
+                                   'instrument': {
+                                       'port': {
+                                           'tc': 21366,
+                                           'tm': 21367
+                                       },
+                                       'cyclic_tm': 0.01
+                                   }
+                               })
+        mock.initialize()
+
+        component = CyclicTmTcpController(
+            self.context,
+            local_config={
+                'instrument': {
+                    'port': {
+                        'tc': 21366,
+                        'tm': 21367
+                    }
+                },
+                'parameters': {
+                    'parameter_1': {
+                        'cyclic_tm_client': {
+                            'publish': {
+                                'max_rate': 5
+                            }
+                        }
+                    },
+                    'parameter_2': {
+                        'cyclic_tm_client': {
+                            'publish': {
+                                'deadband': 1
+                            }
+                        }
+                    }
+                }
+            })
+        component.initialize()
+
+        assert ('cyclic_tm_dropped',
+                ParameterType.get) in component._parameter_info
+        assert ('cyclic_tm_conflated',
+                ParameterType.get) in component._parameter_info
+
+        raw = {'parameter_1': 0, 'parameter_2': 0, 'parameter_3': 0}
+        published = {'parameter_1': 0, 'parameter_2': 0, 'parameter_3': 0}
+
+        def count(counter, result):
+            if result.id in counter:
+                counter[result.id] += 1
+
+        self.context.rx['io_result_raw'].subscribe(
+            lambda result: count(raw, result))
+        self.context.rx['io_result'].subscribe(
+            lambda result: count(published, result))
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='cyclic_telemetry_tcp_controller',
+                           id='connect',
+                           type=ParameterType.set,
+                           args=['1']))
+
+        time.sleep(.5)
+
+        self.context.rx['quit'].on_next(Empty())
+        time.sleep(.1)
+
+        # All the samples are in the raw stream
+        assert raw['parameter_1'] > 20
+        assert published['parameter_3'] == raw['parameter_3']
+
+        # Max rate of 5 Hz, the last sample is published at the interval
+        assert 2 <= published['parameter_1'] <= 4
+
+        # The value does not change, only the first sample is published
+        assert published['parameter_2'] == 1
+
+        dropped = component._shared_memory['cyclic_tm_dropped']
+        conflated = component._shared_memory['cyclic_tm_conflated']
+
+        assert dropped == raw['parameter_2'] - 1
+        assert conflated >= raw['parameter_1'] - published['parameter_1'] - 1
+
+    def test_history_wrong_config(self):
+        for history in [{}, {'capacity': 'many'}, {'capacity': 0},
+                        {'capacity': 10, 'width': -1}]:
+            component = CyclicTmTcpController(
+                Context(),
+                local_config={
+                    'parameters': {
+                        'parameter_1': {
+                            'cyclic_tm_client': {
+                                'history': history
+                            }
+                        }
+                    }
+                })
+
+            with pytest.raises(ComponentConfigException) as excinfo:
+                component.initialize()
+
+            assert '"parameter_1" history' in str(excinfo.value)
+
     def test_quit_observer(self):
         """ Test component quit observer """
         class Test:
@@ -2,6 +2,8 @@ import os
 import pytest
 import copy
 import time
+import socket
+import threading
 
 from rx import operators as op
 
@@ -16,6 +18,63 @@ component_path = os.path.join('marketplace', 'components', 'tcp_udp',
                               'single_port_tcp')
 
 
+class FakeInstrument:
+    """ Instrument replying 'alive' to every command, after a delay, that
+    can be stopped and started again.
+    """
+    def __init__(self, port, delay=0):
+        self.port = port
+        self.delay = delay
+        self.server = None
+        self.connections = []
+        self.commands = 0
+
+    def start(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(('0.0.0.0', self.port))
+        self.server.listen()
+        threading.Thread(target=self._accept, args=[self.server],
+                         daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown(socket.SHUT_RDWR)
+        self.server.close()
+
+        for connection in self.connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # Already closed by the client
+            connection.close()
+        self.connections = []
+
+    def _accept(self, server):
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+
+            self.connections.append(connection)
+            threading.Thread(target=self._reply, args=[connection],
+                             daemon=True).start()
+
+    def _reply(self, connection):
+        while True:
+            try:
+                data = connection.recv(1024)
+                if not data:
+                    return
+
+                for _ in data.split(b'\r\n')[:-1]:
+                    self.commands += 1
+                    time.sleep(self.delay)
+                    connection.sendall(b'alive\n')
+            except OSError:
+                return
+
+
 class TestClass:
     def setup_class(self):
         """ setup_class called once for the class """
@@ -957,6 +1016,707 @@ class TestClass:
 
         time.sleep(1)
 
+    def test_io_service_request_queue_mode(self):
+        """ Test component io_service_request observer in queue mode """
+        # Start Mock
+        mock = SinglePortTcpMock(self.context,
+                                 local_config={'instrument': {
+                                     'port': 21351
+                                 }})
+        mock.initialize()
+
+        # Start Test
+        component = SinglePortTcpController(
+            self.context,
+            local_config={
+                'instrument': {
+                    'port': 21351
+                },
+                'execution': {
+                    'mode': 'queue',
+                    'queue_size': 8
+                }
+            })
+        component.initialize()
+        dummy_test_class = CallbackTestClass()
+
+        assert ('command_queue_length',
+                ParameterType.get) in component._parameter_info
+        assert component._shared_memory['command_queue_length'] == 0
+
+        # Subscribe to the topic that shall be published
+        self.context.rx['io_result'].pipe(
+            op.filter(
+                lambda value: isinstance(value, ServiceResponse))).subscribe(
+                    dummy_test_class.test_func_1)
+
+        # 1 - Commands are executed in the worker thread
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='connect',
+                           type=ParameterType.set,
+                           args=['1']))
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='idn',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 2
+        assert dummy_test_class.func_1_last_value.id == 'idn'
+        assert dummy_test_class.func_1_last_value.type == ParameterType.get
+        assert dummy_test_class.func_1_last_value.value == 'Mamba Framework,Single Port TCP Mock,1.0'
+
+        # 2 - Metrics are served from memory
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='command_queue_length',
+                           type=ParameterType.get,
+                           args=[]))
+
+        assert dummy_test_class.func_1_times_called == 3
+        assert dummy_test_class.func_1_last_value.id == 'command_queue_length'
+        assert dummy_test_class.func_1_last_value.type == ParameterType.get
+        assert dummy_test_class.func_1_last_value.value == 0
+
+        self.context.rx['quit'].on_next(Empty())
+
+        time.sleep(1)
+
+    def test_io_service_request_long_reply(self):
+        """ Test replies longer than a single receive and maximum size """
+        # Start Mock
+        mock = SinglePortTcpMock(self.context,
+                                 local_config={'instrument': {
+                                     'port': 21352
+                                 }})
+        mock.initialize()
+
+        # Start Test
+        component = SinglePortTcpController(self.context,
+                                            local_config={
+                                                'instrument': {
+                                                    'port': 21352,
+                                                    'max_message_size': 8192
+                                                }
+                                            })
+        component.initialize()
+        dummy_test_class = CallbackTestClass()
+
+        assert component._instrument.max_message_size == 8192
+
+        # Subscribe to the topic that shall be published
+        self.context.rx['io_result'].pipe(
+            op.filter(
+                lambda value: isinstance(value, ServiceResponse))).subscribe(
+                    dummy_test_class.test_func_1)
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='connect',
+                           type=ParameterType.set,
+                           args=['1']))
+
+        # 1 - Reply longer than the receive chunk
+        long_value = '1' * 5000
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='parameter_1',
+                           type=ParameterType.set,
+                           args=[long_value]))
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='parameter_1',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 3
+        assert dummy_test_class.func_1_last_value.type == ParameterType.get
+        assert dummy_test_class.func_1_last_value.value == long_value
+
+        # 2 - Reply longer than the maximum message size
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='parameter_1',
+                           type=ParameterType.set,
+                           args=['2' * 10000]))
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='parameter_1',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 5
+        assert dummy_test_class.func_1_last_value.type == ParameterType.error
+        assert dummy_test_class.func_1_last_value.value == \
+               'Message exceeds the maximum size of 8192 bytes'
+
+        # 3 - The rest of the long reply does not leak into the next query
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='idn',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 6
+        assert dummy_test_class.func_1_last_value.type == ParameterType.get
+        assert dummy_test_class.func_1_last_value.value == \
+               'Mamba Framework,Single Port TCP Mock,1.0'
+
+        self.context.rx['quit'].on_next(Empty())
+
+        time.sleep(1)
+
+    def test_response_cache(self):
+        mock = SinglePortTcpMock(self.context,
+                                 local_config={'instrument': {
+                                     'port': 21355
+                                 }})
+        mock.initialize()
+
+        dummy_test_class = CallbackTestClass()
+
+        # Subscribe to the topic that shall be published
+        self.context.rx['io_result'].pipe(
+            op.filter(
+                lambda value: isinstance(value, ServiceResponse))).subscribe(
+                    dummy_test_class.test_func_1)
+
+        component = SinglePortTcpController(
+            self.context,
+            local_config={
+                'instrument': {
+                    'port': 21355
+                },
+                'parameters': {
+                    'parameter_1': {
+                        'cache': {
+                            'ttl': 0.5,
+                            'max_staleness': 60,
+                            'invalidated_by': ['clear']
+                        }
+                    }
+                }
+            })
+        component.initialize()
+
+        assert ('cache_hits', ParameterType.get) in component._parameter_info
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='connect',
+                           type=ParameterType.set,
+                           args=['1']))
+
+        time.sleep(.1)
+
+        # 1 - The first reply is queried to the instrument and cached
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='parameter_1',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_last_value.value == '1'
+
+        mock._shared_memory['parameter_1'] = '7'
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='parameter_1',
+                           type=ParameterType.get,
+                           args=[],
+                           request_id=3))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 3
+        assert dummy_test_class.func_1_last_value.type == ParameterType.get
+        assert dummy_test_class.func_1_last_value.value == '1'
+        assert dummy_test_class.func_1_last_value.request_id == 3
+        assert component._shared_memory['cache_hits'] == 1
+        assert component._shared_memory['cache_misses'] == 1
+
+        # 2 - A setter invalidates the cached reply
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='clear',
+                           type=ParameterType.set,
+                           args=[]))
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='parameter_1',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 5
+        assert dummy_test_class.func_1_last_value.value == '7'
+        assert component._shared_memory['cache_misses'] == 2
+
+        # 3 - An expired reply is queried again
+        mock._shared_memory['parameter_1'] = '8'
+        time.sleep(.5)
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='parameter_1',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 6
+        assert dummy_test_class.func_1_last_value.value == '8'
+        assert component._shared_memory['cache_misses'] == 3
+
+        # 4 - The expired reply is served if the instrument is not reachable
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='connect',
+                           type=ParameterType.set,
+                           args=['0']))
+
+        time.sleep(.6)
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='parameter_1',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 8
+        assert dummy_test_class.func_1_last_value.type == ParameterType.get
+        assert dummy_test_class.func_1_last_value.value == '8'
+        assert component._shared_memory['cache_stale_hits'] == 1
+
+        # 5 - Reconnecting discards the cached replies
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='connect',
+                           type=ParameterType.set,
+                           args=['1']))
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='connect',
+                           type=ParameterType.set,
+                           args=['0']))
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='parameter_1',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 11
+        assert dummy_test_class.func_1_last_value.type == \
+               ParameterType.error
+        assert component._shared_memory['cache_stale_hits'] == 1
+
+        self.context.rx['quit'].on_next(Empty())
+
+        time.sleep(1)
+
+    def test_coalesced_get_requests(self):
+        mock = SinglePortTcpMock(self.context,
+                                 local_config={'instrument': {
+                                     'port': 21356
+                                 }})
+        mock.initialize()
+
+        results = []
+
+        # Subscribe to the topic that shall be published
+        self.context.rx['io_result'].pipe(
+            op.filter(lambda value: isinstance(value, ServiceResponse))
+        ).subscribe(results.append)
+
+        component = SinglePortTcpController(
+            self.context,
+            local_config={
+                'instrument': {
+                    'port': 21356
+                },
+                'execution': {
+                    'mode': 'queue'
+                }
+            })
+        component.initialize()
+
+        assert component._coalesced_getters == {
+            'idn', 'parameter_1', 'parameter_2', 'parameter_3'
+        }
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='connect',
+                           type=ParameterType.set,
+                           args=['1']))
+
+        # 1 - Identical getters in flight are answered with one query
+        requests = [
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id=param_id,
+                           type=ParameterType.get,
+                           args=[])
+            for param_id in ['idn', 'idn', 'sys_err', 'sys_err', 'idn']
+        ]
+
+        for request in requests:
+            self.context.rx['io_service_request'].on_next(request)
+
+        time.sleep(.2)
+
+        assert len(results) == 6
+        assert sorted(result.request_id for result in results[1:]) == \
+               sorted(request.request_id for request in requests)
+        assert all(result.type == ParameterType.get
+                   for result in results[1:])
+        assert [
+            result.value for result in results if result.id == 'idn'
+        ] == ['Mamba Framework,Single Port TCP Mock,1.0'] * 3
+        assert component._shared_memory['coalesced_requests'] == 2
+
+        # 2 - Requests received after the result are executed again
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='idn',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert len(results) == 7
+        assert component._shared_memory['coalesced_requests'] == 2
+        assert component._single_flight._flights == {}
+
+        self.context.rx['quit'].on_next(Empty())
+
+        time.sleep(1)
+
+    def test_background_reconnection(self):
+        instrument = FakeInstrument(21357)
+        instrument.start()
+
+        results = []
+
+        # Subscribe to the topic that shall be published
+        self.context.rx['io_result'].pipe(
+            op.filter(lambda value: isinstance(value, ServiceResponse))
+        ).subscribe(results.append)
+
+        component = SinglePortTcpController(
+            self.context,
+            local_config={
+                'instrument': {
+                    'port': 21357,
+                    'reconnect': {
+                        'initial_delay': 0.1,
+                        'max_delay': 0.2,
+                        'probe_interval': 0.1
+                    }
+                }
+            })
+        component.initialize()
+
+        assert component._shared_memory['connection_state'] == \
+               'disconnected'
+
+        def request(param_id, param_type=ParameterType.get, args=[]):
+            self.context.rx['io_service_request'].on_next(
+                ServiceRequest(provider='single_port_tcp_controller',
+                               id=param_id,
+                               type=param_type,
+                               args=args))
+            time.sleep(.05)
+            return results[-1]
+
+        def states():
+            return [
+                result.value for result in results
+                if result.id == 'connection_state'
+            ]
+
+        # 1 - The connection state is published
+        assert request('connect', ParameterType.set, ['1']).type == \
+               ParameterType.set
+        assert request('idn').value == 'alive'
+        assert component._shared_memory['connection_state'] == 'connected'
+        assert states() == ['connected']
+
+        # 2 - The probes detect the connection loss
+        instrument.stop()
+        time.sleep(.2)
+
+        assert component._shared_memory['connection_state'] == \
+               'reconnecting'
+        assert states() == ['connected', 'reconnecting']
+
+        # 3 - Requests fail fast during the outage
+        start = time.monotonic()
+        result = request('idn')
+
+        assert time.monotonic() - start < 0.1
+        assert result.type == ParameterType.error
+        assert result.value == 'Instrument is unreachable, reconnecting'
+
+        time.sleep(.3)
+
+        assert component._shared_memory['reconnect_attempts'] >= 2
+
+        # 4 - The instrument is reconnected in background
+        instrument.start()
+        time.sleep(.4)
+
+        assert component._shared_memory['connection_state'] == 'connected'
+        assert states() == ['connected', 'reconnecting', 'connected']
+        assert request('idn').value == 'alive'
+
+        # 5 - Disconnected instruments are not reconnected
+        request('connect', ParameterType.set, ['0'])
+        attempts = component._shared_memory['reconnect_attempts']
+        time.sleep(.3)
+
+        assert component._shared_memory['connection_state'] == \
+               'disconnected'
+        assert component._shared_memory['reconnect_attempts'] == attempts
+
+        instrument.stop()
+        self.context.rx['quit'].on_next(Empty())
+
+    def test_request_deadline(self):
+        instrument = FakeInstrument(21358, delay=0.3)
+        instrument.start()
+
+        results = []
+
+        # Subscribe to the topic that shall be published
+        self.context.rx['io_result'].pipe(
+            op.filter(lambda value: isinstance(value, ServiceResponse))
+        ).subscribe(results.append)
+
+        component = SinglePortTcpController(
+            self.context, local_config={'instrument': {
+                'port': 21358
+            }})
+        component.initialize()
+
+        def request(param_id, param_type=ParameterType.get, args=[],
+                    timeout=None, wait=.05):
+            self.context.rx['io_service_request'].on_next(
+                ServiceRequest(provider='single_port_tcp_controller',
+                               id=param_id,
+                               type=param_type,
+                               args=args,
+                               deadline=None if timeout is None else
+                               time.monotonic() + timeout))
+            time.sleep(wait)
+            return results[-1]
+
+        request('connect', ParameterType.set, ['1'])
+
+        # 1 - The instrument is not waited for after the deadline
+        start = time.monotonic()
+        result = request('idn', timeout=0.1, wait=0.5)
+
+        assert result.type == ParameterType.error
+        assert result.value == 'Timeout'
+        assert len(results) == 2
+
+        # 2 - The late reply is not taken as the reply of the next request
+        result = request('idn', timeout=1, wait=0.5)
+
+        assert result.type == ParameterType.get
+        assert result.value == 'alive'
+
+        # 3 - Expired requests are not sent to the instrument
+        commands = instrument.commands
+        result = request('idn', timeout=0)
+
+        assert result.type == ParameterType.error
+        assert result.value == 'Timeout'
+        assert instrument.commands == commands
+
+        # 4 - Without deadline, the reply timeout applies
+        assert request('idn', wait=0.5).value == 'alive'
+
+        instrument.stop()
+        self.context.rx['quit'].on_next(Empty())
+
+    def test_async_execution_mode(self):
+        instruments = [FakeInstrument(21359, delay=0.2),
+                       FakeInstrument(21360, delay=0.2)]
+        for instrument in instruments:
+            instrument.start()
+
+        results = []
+
+        # Subscribe to the topic that shall be published
+        self.context.rx['io_result'].pipe(
+            op.filter(lambda value: isinstance(value, ServiceResponse))
+        ).subscribe(results.append)
+
+        components = [
+            SinglePortTcpController(self.context,
+                                    local_config={
+                                        'name': f'tcp_{index}',
+                                        'instrument': {
+                                            'port': instrument.port
+                                        },
+                                        'execution': {
+                                            'mode': 'async'
+                                        }
+                                    })
+            for index, instrument in enumerate(instruments)
+        ]
+        for component in components:
+            component.initialize()
+
+        assert components[0]._event_loop is self.context.event_loop()
+
+        def request(provider, param_id, param_type=ParameterType.get,
+                    args=[], timeout=None):
+            self.context.rx['io_service_request'].on_next(
+                ServiceRequest(provider=provider,
+                               id=param_id,
+                               type=param_type,
+                               args=args,
+                               deadline=None if timeout is None else
+                               time.monotonic() + timeout))
+
+        # 1 - Connection changes are executed before returning
+        for index in range(2):
+            request(f'tcp_{index}', 'connect', ParameterType.set, ['1'])
+
+        assert [result.type for result in results] == [ParameterType.set] * 2
+        assert all(component._shared_memory['connected'] == 1
+                   for component in components)
+
+        # 2 - Requests do not block the requester, and the instruments are
+        # accessed concurrently
+        results.clear()
+        start = time.monotonic()
+
+        for index in range(2):
+            request(f'tcp_{index}', 'idn')
+
+        assert time.monotonic() - start < 0.1
+        assert results == []
+
+        time.sleep(0.3)
+
+        assert sorted(result.provider for result in results) == \
+               ['tcp_0', 'tcp_1']
+        assert all(result.value == 'alive' for result in results)
+
+        # 3 - The commands of an instrument are executed one at a time
+        results.clear()
+
+        for _ in range(2):
+            request('tcp_0', 'sys_err')
+
+        time.sleep(0.3)
+
+        assert len(results) == 1
+
+        time.sleep(0.2)
+
+        assert [result.value for result in results] == ['alive', 'alive']
+
+        # 4 - The request deadline applies
+        results.clear()
+        request('tcp_0', 'idn', timeout=0.1)
+        time.sleep(0.15)
+
+        assert results[-1].type == ParameterType.error
+        assert results[-1].value == 'Timeout'
+
+        time.sleep(0.2)
+        request('tcp_0', 'idn')
+        time.sleep(0.3)
+
+        assert results[-1].value == 'alive'
+
+        # 5 - Values are served from memory
+        request('tcp_0', 'connect', ParameterType.set, ['0'])
+        request('tcp_0', 'connected')
+
+        assert results[-1].value == 0
+
+        request('tcp_0', 'idn')
+        time.sleep(0.05)
+
+        assert results[-1].type == ParameterType.error
+        assert results[-1].value == 'Not possible to perform command ' \
+                                    'before connection is established'
+
+        for instrument in instruments:
+            instrument.stop()
+        self.context.rx['quit'].on_next(Empty())
+
+    def test_async_execution_mode_long_reply(self):
+        instrument = FakeInstrument(21361)
+        instrument.start()
+
+        results = []
+
+        # Subscribe to the topic that shall be published
+        self.context.rx['io_result'].pipe(
+            op.filter(lambda value: isinstance(value, ServiceResponse))
+        ).subscribe(results.append)
+
+        component = SinglePortTcpController(self.context,
+                                            local_config={
+                                                'instrument': {
+                                                    'port': 21361,
+                                                    'max_message_size': 3
+                                                },
+                                                'execution': {
+                                                    'mode': 'async'
+                                                }
+                                            })
+        component.initialize()
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_tcp_controller',
+                           id='connect',
+                           type=ParameterType.set,
+                           args=['1']))
+
+        # The long replies are discarded up to their terminator
+        for _ in range(2):
+            self.context.rx['io_service_request'].on_next(
+                ServiceRequest(provider='single_port_tcp_controller',
+                               id='idn',
+                               type=ParameterType.get,
+                               args=[]))
+            time.sleep(.1)
+
+            assert results[-1].type == ParameterType.error
+            assert results[-1].value == 'Message exceeds the maximum size ' \
+                                        'of 3 bytes'
+
+        instrument.stop()
+        self.context.rx['quit'].on_next(Empty())
+
     def test_quit_observer(self):
         """ Test component quit observer """
         class Test:
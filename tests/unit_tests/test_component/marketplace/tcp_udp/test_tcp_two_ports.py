@@ -925,6 +925,72 @@ class TestClass:
 
         time.sleep(1)
 
+    def test_io_service_request_long_reply(self):
+        """ Test replies longer than a single receive """
+        # Start Mock
+        mock = TwoPortsTcpMock(self.context,
+                               local_config={
+                                   'instrument': {
+                                       'port': {
+                                           'tc': 21353,
+                                           'tm': 21354
+                                       }
+                                   }
+                               })
+        mock.initialize()
+
+        # Start Test
+        component = TwoPortsTcpController(self.context,
+                                          local_config={
+                                              'instrument': {
+                                                  'port': {
+                                                      'tc': 21353,
+                                                      'tm': 21354
+                                                  },
+                                                  'reply_timeout': 2
+                                              }
+                                          })
+        component.initialize()
+        dummy_test_class = CallbackTestClass()
+
+        # Subscribe to the topic that shall be published
+        self.context.rx['io_result'].pipe(
+            op.filter(
+                lambda value: isinstance(value, ServiceResponse))).subscribe(
+                    dummy_test_class.test_func_1)
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='two_ports_tcp_controller',
+                           id='connect',
+                           type=ParameterType.set,
+                           args=['1']))
+
+        assert component._inst_tm.gettimeout() == 2
+
+        long_value = '1' * 5000
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='two_ports_tcp_controller',
+                           id='parameter_1',
+                           type=ParameterType.set,
+                           args=[long_value]))
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='two_ports_tcp_controller',
+                           id='parameter_1',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 3
+        assert dummy_test_class.func_1_last_value.type == ParameterType.get
+        assert dummy_test_class.func_1_last_value.value == long_value
+
+        self.context.rx['quit'].on_next(Empty())
+
+        time.sleep(1)
+
     def test_quit_observer(self):
         """ Test component quit observer """
         class Test:
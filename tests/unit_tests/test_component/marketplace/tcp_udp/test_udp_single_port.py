@@ -615,6 +615,169 @@ class TestClass:
 
         time.sleep(1)
 
+    def test_sequence_tag_queries(self):
+        """ Test replies matched to queries by sequence tag """
+        # Start Mock
+        mock = SinglePortUdpMock(self.context)
+        mock.initialize()
+
+        # Start Test
+        component = SinglePortUdpController(
+            self.context, local_config={'instrument': {
+                'sequence_tag': True
+            }})
+        component.initialize()
+        dummy_test_class = CallbackTestClass()
+
+        # Subscribe to the topic that shall be published
+        self.context.rx['io_result'].pipe(
+            op.filter(
+                lambda value: isinstance(value, ServiceResponse))).subscribe(
+                    dummy_test_class.test_func_1)
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_udp_controller',
+                           id='idn',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 1
+        assert dummy_test_class.func_1_last_value.value == \
+            'Mamba Framework,Single Port UDP Mock,1.0'
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_udp_controller',
+                           id='parameter_1',
+                           type=ParameterType.set,
+                           args=['3']))
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_udp_controller',
+                           id='parameter_1',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.1)
+
+        assert dummy_test_class.func_1_times_called == 3
+        assert dummy_test_class.func_1_last_value.id == 'parameter_1'
+        assert dummy_test_class.func_1_last_value.value == '3'
+
+        self.context.rx['quit'].on_next(Empty())
+
+        time.sleep(1)
+
+    def test_async_execution_mode(self):
+        """ Test queries executed in the shared event loop """
+        # Start Mock
+        mock = SinglePortUdpMock(self.context,
+                                 local_config={'instrument': {
+                                     'port': 21362
+                                 }})
+        mock.initialize()
+
+        # Start Test
+        components = [
+            SinglePortUdpController(self.context,
+                                    local_config={
+                                        'name': f'udp_{index}',
+                                        'instrument': {
+                                            'port': 21362,
+                                            'sequence_tag': sequence_tag
+                                        },
+                                        'execution': {
+                                            'mode': 'async'
+                                        }
+                                    })
+            for index, sequence_tag in enumerate([False, True])
+        ]
+        for component in components:
+            component.initialize()
+
+        results = []
+
+        # Subscribe to the topic that shall be published
+        self.context.rx['io_result'].pipe(
+            op.filter(lambda value: isinstance(value, ServiceResponse))
+        ).subscribe(results.append)
+
+        for provider in ['udp_0', 'udp_1']:
+            self.context.rx['io_service_request'].on_next(
+                ServiceRequest(provider=provider,
+                               id='parameter_1',
+                               type=ParameterType.set,
+                               args=['3']))
+
+            self.context.rx['io_service_request'].on_next(
+                ServiceRequest(provider=provider,
+                               id='idn',
+                               type=ParameterType.get,
+                               args=[]))
+
+            self.context.rx['io_service_request'].on_next(
+                ServiceRequest(provider=provider,
+                               id='parameter_1',
+                               type=ParameterType.get,
+                               args=[]))
+
+            time.sleep(.1)
+
+            assert [(result.id, result.value) for result in results] == [
+                ('parameter_1', None),
+                ('idn', 'Mamba Framework,Single Port UDP Mock,1.0'),
+                ('parameter_1', '3'),
+            ]
+            assert all(result.provider == provider for result in results)
+
+            results.clear()
+
+        assert components[0]._replies.discarded == 0
+        assert components[0]._transport is not None
+
+        self.context.rx['quit'].on_next(Empty())
+
+        assert components[0]._transport is None
+
+        time.sleep(1)
+
+    def test_async_execution_mode_wo_instrument(self):
+        """ Test queries executed in the event loop without reply """
+        component = SinglePortUdpController(self.context,
+                                            local_config={
+                                                'instrument': {
+                                                    'port': 21363,
+                                                    'reply_timeout': 0.1
+                                                },
+                                                'execution': {
+                                                    'mode': 'async'
+                                                }
+                                            })
+        component.initialize()
+        dummy_test_class = CallbackTestClass()
+
+        # Subscribe to the topic that shall be published
+        self.context.rx['io_result'].pipe(
+            op.filter(
+                lambda value: isinstance(value, ServiceResponse))).subscribe(
+                    dummy_test_class.test_func_1)
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='single_port_udp_controller',
+                           id='idn',
+                           type=ParameterType.get,
+                           args=[]))
+
+        time.sleep(.5)
+
+        assert dummy_test_class.func_1_times_called == 1
+        assert dummy_test_class.func_1_last_value.type == ParameterType.error
+        assert dummy_test_class.func_1_last_value.value == \
+            'Not possible to communicate to the instrument'
+
+        self.context.rx['quit'].on_next(Empty())
+
     def test_service_invalid_info(self):
         with pytest.raises(ComponentConfigException) as excinfo:
             SinglePortUdpController(self.context,
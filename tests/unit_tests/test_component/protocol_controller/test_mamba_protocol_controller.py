@@ -1,10 +1,11 @@
 import pytest
 import os
+import time
 
 from mamba.core.context import Context
 from mamba.component.protocol_controller import MambaProtocolController
 from mamba.core.testing.utils import CallbackTestClass
-from mamba.core.msg import ServiceResponse, ServiceRequest, ParameterInfo, ParameterType
+from mamba.core.msg import ServiceResponse, ServiceRequest, ParameterInfo, ParameterType, Empty
 from mamba.core.exceptions import ComponentConfigException
 
 
@@ -33,10 +34,11 @@ class TestClass:
 
         # Test default configuration
         assert component._configuration == {
-            'name': 'mamba_protocol_controller'
+            'name': 'mamba_protocol_controller',
+            'request_timeout': 10
         }
         assert component._provider_params == {}
-        assert component._io_result_subs is None
+        assert component._pending_requests == {}
 
     def test_component_observer_io_service_signature(self):
         """ Test component external interface """
@@ -314,3 +316,186 @@ class TestClass:
         assert dummy_test_class.func_2_last_value.id == 'TEST_TC_WRONG'
         assert dummy_test_class.func_2_last_value.type == ParameterType.error
         assert dummy_test_class.func_2_last_value.value == 'Not recognized command'
+
+    def test_component_observer_io_result(self):
+        """ Test matching of IO results with the in-flight requests """
+        dummy_test_class = CallbackTestClass()
+        component = MambaProtocolController(self.context)
+        component.initialize()
+
+        self.context.rx['io_service_signature'].on_next([
+            ParameterInfo(provider='test_provider',
+                          param_id='test_param_1',
+                          param_type=ParameterType.get,
+                          signature=[[], 'str'],
+                          description='custom command get 1'),
+            ParameterInfo(provider='test_provider_2',
+                          param_id='test_param_2',
+                          param_type=ParameterType.get,
+                          signature=[[], 'str'],
+                          description='custom command get 2')
+        ])
+
+        self.context.rx['io_service_request'].subscribe(
+            dummy_test_class.test_func_1)
+        self.context.rx['tm'].subscribe(dummy_test_class.test_func_2)
+
+        # Two requests in flight at the same time
+        self.context.rx['tc'].on_next(
+            ServiceRequest(id='test_provider_test_param_1',
+                           type=ParameterType.get,
+                           args=[]))
+        request_1 = dummy_test_class.func_1_last_value
+
+        self.context.rx['tc'].on_next(
+            ServiceRequest(id='test_provider_2_test_param_2',
+                           type=ParameterType.get,
+                           args=[]))
+        request_2 = dummy_test_class.func_1_last_value
+
+        assert request_1.request_id != request_2.request_id
+        assert len(component._pending_requests) == 2
+
+        # Unsolicited results are not forwarded
+        self.context.rx['io_result'].on_next(
+            ServiceResponse(provider='test_provider',
+                            id='test_param_1',
+                            type=ParameterType.get,
+                            value='cyclic'))
+
+        assert dummy_test_class.func_2_times_called == 0
+
+        # Results are matched to its request, in any order
+        self.context.rx['io_result'].on_next(
+            ServiceResponse(provider='test_provider_2',
+                            id='test_param_2',
+                            type=ParameterType.get,
+                            value='value_2',
+                            request_id=request_2.request_id))
+
+        assert dummy_test_class.func_2_times_called == 1
+        assert dummy_test_class.func_2_last_value.value == 'value_2'
+        assert len(component._pending_requests) == 1
+
+        self.context.rx['io_result'].on_next(
+            ServiceResponse(provider='test_provider',
+                            id='test_param_1',
+                            type=ParameterType.get,
+                            value='value_1',
+                            request_id=request_1.request_id))
+
+        assert dummy_test_class.func_2_times_called == 2
+        assert dummy_test_class.func_2_last_value.value == 'value_1'
+        assert component._pending_requests == {}
+
+        # Duplicated results are not forwarded
+        self.context.rx['io_result'].on_next(
+            ServiceResponse(provider='test_provider',
+                            id='test_param_1',
+                            type=ParameterType.get,
+                            value='value_1',
+                            request_id=request_1.request_id))
+
+        assert dummy_test_class.func_2_times_called == 2
+
+    def test_component_request_timeout(self):
+        """ Test unanswered requests are answered with a timeout error """
+        dummy_test_class = CallbackTestClass()
+        component = MambaProtocolController(
+            self.context, local_config={'request_timeout': 0.1})
+        component.initialize()
+
+        self.context.rx['io_service_signature'].on_next([
+            ParameterInfo(provider='test_provider',
+                          param_id='test_param_1',
+                          param_type=ParameterType.get,
+                          signature=[[], 'str'],
+                          description='custom command get 1')
+        ])
+
+        self.context.rx['io_service_request'].subscribe(
+            dummy_test_class.test_func_1)
+        self.context.rx['tm'].subscribe(dummy_test_class.test_func_2)
+
+        logs = []
+        self.context.rx['log'].subscribe(logs.append)
+
+        self.context.rx['tc'].on_next(
+            ServiceRequest(id='test_provider_test_param_1',
+                           type=ParameterType.get,
+                           args=[]))
+
+        assert dummy_test_class.func_2_times_called == 0
+
+        time.sleep(.3)
+
+        assert dummy_test_class.func_2_times_called == 1
+        assert dummy_test_class.func_2_last_value.id == \
+               'test_provider_test_param_1'
+        assert dummy_test_class.func_2_last_value.type == ParameterType.error
+        assert dummy_test_class.func_2_last_value.value == 'Timeout'
+        assert component._pending_requests == {}
+
+        # Late results are discarded
+        self.context.rx['io_result'].on_next(
+            ServiceResponse(
+                provider='test_provider',
+                id='test_param_1',
+                type=ParameterType.get,
+                value='value_1',
+                request_id=dummy_test_class.func_1_last_value.request_id))
+
+        assert dummy_test_class.func_2_times_called == 1
+        assert logs[-1].msg == 'Discarded late result of expired ' \
+            f'request {dummy_test_class.func_1_last_value.request_id}: ' \
+            'test_provider_test_param_1'
+        assert component._expired_requests == {}
+
+        self.context.rx['quit'].on_next(Empty())
+
+    def test_component_request_deadline(self):
+        """ Test the request deadline is propagated to the IO services """
+        dummy_test_class = CallbackTestClass()
+        component = MambaProtocolController(self.context)
+        component.initialize()
+
+        self.context.rx['io_service_signature'].on_next([
+            ParameterInfo(provider='test_provider',
+                          param_id='test_param_1',
+                          param_type=ParameterType.get,
+                          signature=[[], 'str'],
+                          description='custom command get 1')
+        ])
+
+        self.context.rx['io_service_request'].subscribe(
+            dummy_test_class.test_func_1)
+        self.context.rx['tm'].subscribe(dummy_test_class.test_func_2)
+
+        # 1 - Without telecommand deadline, the request timeout applies
+        start = time.monotonic()
+        self.context.rx['tc'].on_next(
+            ServiceRequest(id='test_provider_test_param_1',
+                           type=ParameterType.get,
+                           args=[]))
+
+        assert start + 10 <= dummy_test_class.func_1_last_value.deadline \
+               <= time.monotonic() + 10
+
+        # 2 - A shorter telecommand deadline is kept
+        deadline = time.monotonic() + 0.1
+        self.context.rx['tc'].on_next(
+            ServiceRequest(id='test_provider_test_param_1',
+                           type=ParameterType.get,
+                           args=[],
+                           deadline=deadline))
+
+        assert dummy_test_class.func_1_last_value.deadline == deadline
+
+        time.sleep(.3)
+
+        assert dummy_test_class.func_2_times_called == 1
+        assert dummy_test_class.func_2_last_value.type == ParameterType.error
+        assert dummy_test_class.func_2_last_value.value == 'Timeout'
+        assert len(component._pending_requests) == 1
+
+        self.context.rx['quit'].on_next(Empty())
@@ -1,4 +1,6 @@
 import pytest
+import time
+import numpy
 
 from mamba.core.context import Context
 from mamba.core.testing.utils import CallbackTestClass
@@ -182,13 +184,24 @@ class TestClass:
         assert '> OK test;' in dummy_test_class.func_1_last_value.msg
         assert ';1;1;0;1\r\n' in dummy_test_class.func_1_last_value.msg
 
-        # Send single TM - 6. Error
+        # Send single TM - 6. Tm with array value
+        self.context.rx['tm'].on_next(
+            ServiceResponse(id='test',
+                            type=ParameterType.get,
+                            value=numpy.arange(2000, dtype=numpy.float32)))
+
+        assert dummy_test_class.func_1_times_called == 6
+        assert ';0.0,1.0,2.0,' in dummy_test_class.func_1_last_value.msg
+        assert ',1999.0;0.0,' in dummy_test_class.func_1_last_value.msg
+        assert dummy_test_class.func_1_last_value.msg.count('\n') == 1
+
+        # Send single TM - 7. Error
         self.context.rx['tm'].on_next(
             ServiceResponse(id='test',
                             type=ParameterType.error,
                             value='error msg'))
 
-        assert dummy_test_class.func_1_times_called == 6
+        assert dummy_test_class.func_1_times_called == 7
         assert isinstance(dummy_test_class.func_1_last_value, Raw)
         assert dummy_test_class.func_1_last_value.msg == '> ERROR test error msg\r\n'
 
@@ -198,6 +211,50 @@ class TestClass:
         self.context.rx['tm'].on_next(
             ServiceResponse(id='test_4', type=ParameterType.helo))
 
-        assert dummy_test_class.func_1_times_called == 8
+        assert dummy_test_class.func_1_times_called == 9
         assert isinstance(dummy_test_class.func_1_last_value, Raw)
         assert dummy_test_class.func_1_last_value.msg == '> OK helo test_4\r\n'
+
+    def test_component_observer_tm_array_rows(self):
+        dummy_test_class = CallbackTestClass()
+        component = HvsProtocolTranslator(self.context)
+        component.initialize()
+
+        self.context.rx['raw_tm'].subscribe(dummy_test_class.test_func_1)
+
+        # Rows separated by commas, row elements by spaces
+        self.context.rx['tm'].on_next(
+            ServiceResponse(id='test',
+                            type=ParameterType.get,
+                            value=numpy.array([[1.5, 10], [2.5, 20]])))
+
+        assert dummy_test_class.func_1_times_called == 1
+        assert ';1.5 10.0,2.5 20.0;1.5 10.0,2.5 20.0;0;1\r\n' in \
+            dummy_test_class.func_1_last_value.msg
+
+    def test_component_request_timeout(self):
+        """ Test the telecommands deadline """
+        dummy_test_class = CallbackTestClass()
+        component = HvsProtocolTranslator(self.context)
+        component.initialize()
+
+        self.context.rx['tc'].subscribe(dummy_test_class.test_func_1)
+
+        # Telecommands have no deadline by default
+        self.context.rx['raw_tc'].on_next(Raw('tm test\r\n'))
+
+        assert dummy_test_class.func_1_last_value.deadline is None
+
+        context = Context()
+        component = HvsProtocolTranslator(
+            context, local_config={'request_timeout': 2})
+        component.initialize()
+
+        context.rx['tc'].subscribe(dummy_test_class.test_func_1)
+
+        start = time.monotonic()
+        context.rx['raw_tc'].on_next(Raw('tm test_1\r\ntm test_2\r\n'))
+
+        assert dummy_test_class.func_1_times_called == 3
+        assert start + 2 <= dummy_test_class.func_1_last_value.deadline \
+               <= time.monotonic() + 2
@@ -0,0 +1,261 @@
+import pytest
+import time
+
+from mamba.core.testing.utils import CallbackTestClass
+from mamba.core.context import Context
+from mamba.component.utils.parameter_poller import ParameterPoller
+from mamba.core.exceptions import ComponentConfigException
+from mamba.core.msg import Empty, ServiceRequest, ServiceResponse, \
+    ParameterInfo, ParameterType
+
+
+class FakeProvider:
+    """ Provider answering the get requests, if enabled """
+    def __init__(self, context, name='power_supply', answer=True):
+        self.context = context
+        self.answer = answer
+        self.requests = []
+
+        context.rx['io_service_request'].subscribe_route(name, self.received)
+        context.rx['io_service_signature'].on_next([
+            ParameterInfo(provider=name,
+                          param_id=param_id,
+                          param_type=ParameterType.get,
+                          signature=[[], 'float'],
+                          description='')
+            for param_id in ['voltage', 'current']
+        ])
+
+    def received(self, service_request):
+        self.requests.append(service_request)
+
+        if self.answer:
+            self.context.rx['io_result'].on_next(
+                ServiceResponse(provider=service_request.provider,
+                                id=service_request.id,
+                                type=ParameterType.get,
+                                value=1,
+                                request_id=service_request.request_id))
+
+    def count(self, param_id):
+        return len([
+            request for request in self.requests if request.id == param_id
+        ])
+
+
+class TestClass:
+    def setup_method(self):
+        """ setup_method called for every method """
+        self.context = Context()
+
+    def teardown_method(self):
+        """ teardown_method called for every method """
+        self.context.rx['quit'].on_next(Empty())
+        del self.context
+
+    def request(self, param_id, param_type, args=[]):
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='mamba_parameter_poller',
+                           id=param_id,
+                           type=param_type,
+                           args=args))
+
+    def test_component_w_empty_context(self):
+        component = ParameterPoller(self.context)
+        component.initialize()
+
+        # Test default configuration
+        assert component._configuration == {
+            'name': 'mamba_parameter_poller',
+            'min_period': 0.1,
+            'poll_timeout': 5,
+            'polls': []
+        }
+        assert component._thread is None
+
+    def test_wrong_polls_configuration(self):
+        with pytest.raises(ComponentConfigException) as excinfo:
+            ParameterPoller(self.context,
+                            local_config={
+                                'polls': [{
+                                    'provider': 'power_supply',
+                                    'period': 1
+                                }]
+                            }).initialize()
+
+        assert 'shall have a provider, a parameter and a numeric period' in \
+               str(excinfo.value)
+
+        with pytest.raises(ComponentConfigException) as excinfo:
+            ParameterPoller(self.context,
+                            local_config={
+                                'polls': [{
+                                    'provider': 'power_supply',
+                                    'parameter': 'voltage',
+                                    'period': 0
+                                }]
+                            }).initialize()
+
+        assert 'In service mamba_parameter_poller: poll period of ' \
+               'power_supply -> "voltage" shall be positive' in \
+               str(excinfo.value)
+
+    def test_configured_polls(self):
+        provider = FakeProvider(self.context)
+
+        component = ParameterPoller(self.context,
+                                    local_config={
+                                        'polls': [{
+                                            'provider': 'power_supply',
+                                            'parameter': 'voltage',
+                                            'period': 0.1
+                                        }, {
+                                            'provider': 'power_supply',
+                                            'parameter': 'current',
+                                            'period': 0.2
+                                        }]
+                                    })
+        component.initialize()
+
+        time.sleep(1.05)
+
+        assert 9 <= provider.count('voltage') <= 11
+        assert 4 <= provider.count('current') <= 6
+        assert all(request.type == ParameterType.get
+                   and request.provider == 'power_supply'
+                   for request in provider.requests)
+        assert component._in_flight == {}
+
+    def test_polls_are_spread(self):
+        component = ParameterPoller(self.context,
+                                    local_config={
+                                        'polls': [{
+                                            'provider': 'power_supply',
+                                            'parameter': f'param_{index}',
+                                            'period': 10
+                                        } for index in range(8)]
+                                    })
+        component.initialize()
+
+        due = sorted(entry[0] for entry in component._schedule)
+
+        # Polls with the same period do not start at the same time
+        assert min(second - first
+                   for first, second in zip(due, due[1:])) > 0.5
+
+    def test_merged_subscriptions(self):
+        dummy_test_class = CallbackTestClass()
+
+        component = ParameterPoller(self.context)
+        component.initialize()
+
+        # Signatures are published once all the components are created
+        provider = FakeProvider(self.context)
+
+        self.context.rx['io_result'].subscribe(dummy_test_class.test_func_1)
+
+        # 1 - Two subscribers are served with a single poll
+        self.request('subscribe', ParameterType.set,
+                     ['power_supply', 'voltage', '0.2'])
+        self.request('subscribe', ParameterType.set,
+                     ['power_supply', 'voltage', '0.1'])
+
+        assert dummy_test_class.func_1_last_value.type == ParameterType.set
+        assert dummy_test_class.func_1_last_value.id == 'subscribe'
+
+        self.request('polls', ParameterType.get)
+
+        assert dummy_test_class.func_1_last_value.value == \
+               'power_supply voltage 0.1'
+
+        time.sleep(0.55)
+
+        assert 4 <= provider.count('voltage') <= 6
+
+        # 2 - The remaining subscription is polled at its period
+        self.request('unsubscribe', ParameterType.set,
+                     ['power_supply', 'voltage', '0.1'])
+
+        self.request('polls', ParameterType.get)
+
+        assert dummy_test_class.func_1_last_value.value == \
+               'power_supply voltage 0.2'
+
+        provider.requests.clear()
+        time.sleep(0.5)
+
+        assert 2 <= provider.count('voltage') <= 3
+
+        # 3 - Polls stop without subscriptions
+        self.request('unsubscribe', ParameterType.set,
+                     ['power_supply', 'voltage', '0.2'])
+
+        time.sleep(0.25)
+        provider.requests.clear()
+        time.sleep(0.3)
+
+        assert provider.count('voltage') == 0
+
+        self.request('polls', ParameterType.get)
+
+        assert dummy_test_class.func_1_last_value.value == ''
+
+    def test_wrong_subscriptions(self):
+        dummy_test_class = CallbackTestClass()
+
+        component = ParameterPoller(self.context)
+        component.initialize()
+
+        FakeProvider(self.context)
+
+        self.context.rx['io_result'].subscribe(dummy_test_class.test_func_1)
+
+        for args, message in [
+            (['power_supply', 'voltage'], 'Wrong number of arguments, '
+             'expected: provider parameter period'),
+            (['power_supply', 'voltage', 'fast'],
+             'Period shall be numeric: fast'),
+            (['power_supply', 'power', '1'],
+             'Unknown get parameter power_supply -> "power"'),
+            (['power_supply', 'voltage', '0.01'],
+             'Period shall not be lower than 0.1'),
+        ]:
+            self.request('subscribe', ParameterType.set, args)
+
+            assert dummy_test_class.func_1_last_value.type == \
+                   ParameterType.error
+            assert dummy_test_class.func_1_last_value.value == message
+
+        self.request('unsubscribe', ParameterType.set,
+                     ['power_supply', 'voltage', '1'])
+
+        assert dummy_test_class.func_1_last_value.type == ParameterType.error
+        assert dummy_test_class.func_1_last_value.value == \
+               'No subscription to power_supply -> "voltage" with period 1.0'
+
+        assert component._thread is None
+
+    def test_unanswered_polls_are_skipped(self):
+        provider = FakeProvider(self.context, answer=False)
+        dummy_test_class = CallbackTestClass()
+
+        component = ParameterPoller(self.context,
+                                    local_config={
+                                        'poll_timeout': 0.35,
+                                        'polls': [{
+                                            'provider': 'power_supply',
+                                            'parameter': 'voltage',
+                                            'period': 0.1
+                                        }]
+                                    })
+        component.initialize()
+
+        time.sleep(0.6)
+
+        # The poll is sent again once the previous one has timed out
+        assert provider.count('voltage') == 2
+
+        self.context.rx['io_result'].subscribe(dummy_test_class.test_func_1)
+        self.request('polls_skipped', ParameterType.get)
+
+        assert dummy_test_class.func_1_last_value.value >= 3
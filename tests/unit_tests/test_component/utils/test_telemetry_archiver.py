@@ -0,0 +1,132 @@
+import pytest
+import time
+from tempfile import mkdtemp
+from shutil import rmtree
+
+from mamba.core.testing.utils import CallbackTestClass
+from mamba.core.context import Context
+from mamba.component.utils.telemetry_archiver import TelemetryArchiver
+from mamba.core.telemetry_archive import TelemetryArchive
+from mamba.core.exceptions import ComponentConfigException
+from mamba.core.msg import Empty, ServiceRequest, ServiceResponse, \
+    ParameterType
+
+
+class TestClass:
+    def setup_method(self):
+        """ setup_method called for every method """
+        self.context = Context()
+        self.temp_path = mkdtemp()
+
+    def teardown_method(self):
+        """ teardown_method called for every method """
+        self.context.rx['quit'].on_next(Empty())
+        del self.context
+        rmtree(self.temp_path)
+
+    def result(self, param_id, value, provider='power_supply',
+               request_id=None, result_type=ParameterType.get,
+               subject='io_result'):
+        response = ServiceResponse(provider=provider,
+                                   id=param_id,
+                                   type=result_type,
+                                   value=value)
+        response.request_id = request_id
+        self.context.rx[subject].on_next(response)
+
+    def test_component_w_empty_context(self):
+        self.context.set('project_dir', self.temp_path)
+        component = TelemetryArchiver(self.context)
+
+        # Test default configuration
+        assert component._configuration == {
+            'name': 'mamba_telemetry_archiver',
+            'directory': 'archive',
+            'chunk_samples': 1000000,
+            'fsync_interval': 1,
+            'max_pending': 1000000,
+            'parameters': []
+        }
+        assert component._parameters is None
+        assert component._writer._directory == f'{self.temp_path}/archive'
+
+    def test_wrong_configuration(self):
+        for local_config in [{
+                'chunk_samples': 'many'
+        }, {
+                'fsync_interval': 0
+        }, {
+                'parameters': [{
+                    'provider': 'power_supply'
+                }]
+        }]:
+            with pytest.raises(ComponentConfigException):
+                TelemetryArchiver(self.context, local_config=local_config)
+
+    def test_archive_results(self):
+        component = TelemetryArchiver(self.context,
+                                      local_config={
+                                          'directory': self.temp_path,
+                                          'fsync_interval': 0.05
+                                      })
+        component.initialize()
+
+        dummy_test_class = CallbackTestClass()
+        self.context.rx['io_result'].subscribe(dummy_test_class.test_func_1)
+
+        # Results of get requests
+        self.result('voltage', 1.5, request_id=1)
+        self.result('voltage', '2.5', request_id=2)
+        self.result('voltage', None, request_id=3)
+        self.result('voltage', 'Error', result_type=ParameterType.error)
+        self.result('output', None, result_type=ParameterType.set)
+
+        # Cyclic telemetry is archived from io_result_raw, before being
+        # decimated
+        for value in [1, 2]:
+            self.result('counter',
+                        value,
+                        provider='cyclic_tm',
+                        subject='io_result_raw')
+        self.result('counter', 2, provider='cyclic_tm')
+
+        assert component._writer.flush(timeout=5)
+
+        archive = TelemetryArchive(self.temp_path)
+        assert archive.parameters() == [('cyclic_tm', 'counter'),
+                                        ('power_supply', 'voltage')]
+        assert archive.read('power_supply',
+                            'voltage')[1].tolist() == [1.5, 2.5]
+        assert archive.read('cyclic_tm', 'counter')[1].tolist() == [1, 2]
+
+        timestamps = archive.read('cyclic_tm', 'counter')[0]
+        assert time.time() - 5 < timestamps[0] <= timestamps[1] < time.time()
+
+        self.context.rx['io_service_request'].on_next(
+            ServiceRequest(provider='mamba_telemetry_archiver',
+                           id='archive_status',
+                           type=ParameterType.get,
+                           args=[]))
+
+        assert dummy_test_class.func_1_last_value.value == '4 0 0'
+
+    def test_archive_selected_parameters(self):
+        component = TelemetryArchiver(self.context,
+                                      local_config={
+                                          'directory':
+                                          self.temp_path,
+                                          'parameters': [{
+                                              'provider': 'power_supply',
+                                              'parameter': 'current'
+                                          }]
+                                      })
+        component.initialize()
+
+        self.result('voltage', 1.5, request_id=1)
+        self.result('current', 0.5, request_id=2)
+
+        assert component._writer.flush(timeout=5)
+
+        archive = TelemetryArchive(self.temp_path)
+        assert archive.parameters() == [('power_supply', 'current')]
+        assert archive.read('power_supply', 'current')[1].tolist() == [0.5]
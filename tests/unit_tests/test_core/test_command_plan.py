@@ -0,0 +1,107 @@
+from mamba.core.component_base.instrument_driver import \
+    compile_instrument_command, compile_command_plans, compile_template
+from mamba.core.msg import ParameterType
+
+
+class TestClass:
+    def test_compile_instrument_command(self):
+        inst_cmd = compile_instrument_command({'query': '*IDN?'})
+
+        assert inst_cmd.kind == 'query'
+        assert inst_cmd.command == '*IDN?'
+        assert inst_cmd.template.segments == (('*IDN?', None, '', None), )
+        assert inst_cmd.memory_slot is None
+        assert inst_cmd.render([]) == '*IDN?'
+
+        inst_cmd = compile_instrument_command({'write': 'FREQ {:.1f} {{Hz}}'},
+                                              memory_slot='frequency')
+
+        assert inst_cmd.template.segments[0] == ('FREQ ', 0, '.1f', None)
+        assert inst_cmd.memory_slot == 'frequency'
+        assert inst_cmd.render([1.25]) == 'FREQ 1.2 {Hz}'
+
+        # Escaped braces are unescaped also for commands without fields
+        inst_cmd = compile_instrument_command({'query': '{{1}}'})
+
+        assert inst_cmd.render([]) == '{1}'
+
+        # String fields of dictionary commands are compiled
+        rmap_cmd = {'command_code': {'write': 1}, 'address': '0x{}'}
+        inst_cmd = compile_instrument_command({'rmap': rmap_cmd})
+
+        assert inst_cmd.kind == 'rmap'
+        assert inst_cmd.command == rmap_cmd
+        assert inst_cmd.template is None
+        assert list(inst_cmd.fields.keys()) == ['address']
+        assert inst_cmd.render_field('address', ['10']) == '0x10'
+        assert inst_cmd.render_field('size', ['10'], '0') == '0'
+
+    def test_compile_template(self):
+        for template, args in [('{0} {1} {0}', ['a', 'b']),
+                               ('{:} end', ['x y']),
+                               ('{!r:>6}', ['a']),
+                               ('{0[0]}', [[7]]),
+                               ('{:{}}', [3, 4]),
+                               ('{} {1}', [1, 2])]:
+            compiled = compile_template(template)
+
+            try:
+                expected = template.format(*args)
+            except ValueError:
+                expected = ValueError
+
+            try:
+                rendered = compiled.render(args)
+            except ValueError:
+                rendered = ValueError
+
+            assert rendered == expected
+
+        # Fields that are not argument indexes are left to format
+        assert compile_template('{0[0]}').segments is None
+        assert compile_template('{:{}}').segments is None
+        assert compile_template('{0} {1}').segments is not None
+
+    def test_compile_command_plans(self):
+        parameter_info = {
+            ('idn', ParameterType.get): {
+                'signature': [[], 'str'],
+                'instrument_command': [{
+                    'query': '*IDN?'
+                }]
+            },
+            ('frequency', ParameterType.set): {
+                'signature': [['float'], None],
+                'instrument_command': [{
+                    'write': 'FREQ {}'
+                }, {
+                    'query': 'FREQ?'
+                }]
+            },
+            ('frequency', ParameterType.get): {
+                'signature': [[], 'float'],
+                'instrument_command': None
+            },
+        }
+
+        plans = compile_command_plans(parameter_info,
+                                      {'frequency': 'frequency_slot'})
+
+        assert list(plans.keys()) == [('idn', ParameterType.get),
+                                      ('frequency', ParameterType.set)]
+
+        plan = plans[('idn', ParameterType.get)]
+        assert plan.arity == 0
+        assert plan.signature == []
+        assert plan.commands[0].memory_slot is None
+        assert [cmd.kind for cmd in plan.commands] == ['query']
+
+        plan = plans[('frequency', ParameterType.set)]
+        assert plan.arity == 1
+        assert plan.signature == ['float']
+        assert [cmd.kind for cmd in plan.commands] == ['write', 'query']
+        assert [cmd.render([10]) for cmd in plan.commands] == [
+            'FREQ 10', 'FREQ?'
+        ]
+        assert [cmd.memory_slot
+                for cmd in plan.commands] == ['frequency_slot'] * 2
@@ -0,0 +1,133 @@
+import time
+import threading
+import pytest
+
+from mamba.core.command_worker import CommandWorker
+from mamba.core.exceptions import ComponentConfigException
+from mamba.core.msg import ServiceRequest, ParameterType
+
+
+class TestClass:
+    def setup_method(self):
+        """ setup_method called for every method """
+        self.executed = []
+        self.rejected = []
+        self.release = threading.Event()
+
+    def blocking_handler(self, service_request):
+        self.release.wait(1)
+        self.executed.append(service_request.id)
+
+    def test_command_worker_wrong_policy(self):
+        with pytest.raises(ComponentConfigException) as excinfo:
+            CommandWorker(handler=self.blocking_handler,
+                          on_rejected=self.rejected.append,
+                          full_policy='wrong')
+
+        assert 'Command queue full policy "wrong" is not valid' in str(
+            excinfo.value)
+
+    def test_command_worker_priorities(self):
+        worker = CommandWorker.from_config({},
+                                           handler=self.blocking_handler,
+                                           on_rejected=self.rejected.append)
+        worker.start()
+
+        # First request blocks the worker while the others are queued
+        for param_id in ['param_1', 'param_2', 'param_3', 'connect']:
+            worker.submit(
+                ServiceRequest(id=param_id, type=ParameterType.set))
+            time.sleep(.05)
+
+        assert worker.qsize() == 3
+
+        self.release.set()
+        time.sleep(.1)
+
+        assert self.executed == ['param_1', 'connect', 'param_2', 'param_3']
+        assert worker.qsize() == 0
+        assert worker.last_wait > 0
+
+        worker.stop()
+
+    def test_command_worker_reject(self):
+        worker = CommandWorker.from_config({'queue_size': 1},
+                                           handler=self.blocking_handler,
+                                           on_rejected=self.rejected.append)
+        worker.start()
+
+        for param_id in ['param_1', 'param_2', 'param_3']:
+            worker.submit(
+                ServiceRequest(id=param_id, type=ParameterType.set))
+            time.sleep(.05)
+
+        assert [request.id for request in self.rejected] == ['param_3']
+        assert worker.rejected == 1
+        assert worker.queue_length == 1
+
+        self.release.set()
+        time.sleep(.1)
+
+        assert self.executed == ['param_1', 'param_2']
+
+        worker.stop()
+
+    def test_command_worker_metrics(self):
+        metrics = []
+        worker = CommandWorker.from_config(
+            {'queue_size': 1},
+            handler=self.blocking_handler,
+            on_rejected=self.rejected.append,
+            on_metrics=lambda worker: metrics.append(
+                (worker.queue_length, worker.rejected)))
+        worker.start()
+
+        for param_id in ['param_1', 'param_2', 'param_3']:
+            worker.submit(
+                ServiceRequest(id=param_id, type=ParameterType.set))
+            time.sleep(.05)
+
+        # Queued, dequeued, queued and rejected
+        assert metrics == [(1, 0), (0, 0), (1, 0), (1, 1)]
+
+        self.release.set()
+        time.sleep(.1)
+
+        assert metrics[-1] == (0, 1)
+        assert worker.max_wait >= worker.last_wait > 0
+        assert 0 < worker.average_wait <= worker.max_wait
+
+        worker.stop()
+
+    def test_command_worker_stop_releases_blocked(self):
+        worker = CommandWorker.from_config(
+            {
+                'queue_size': 1,
+                'full_policy': 'block'
+            },
+            handler=self.blocking_handler,
+            on_rejected=self.rejected.append)
+        worker.start()
+
+        for param_id in ['param_1', 'param_2']:
+            worker.submit(
+                ServiceRequest(id=param_id, type=ParameterType.set))
+            time.sleep(.05)
+
+        # The queue is full, the next requester blocks
+        requester = threading.Thread(target=worker.submit,
+                                     args=[
+                                         ServiceRequest(
+                                             id='param_3',
+                                             type=ParameterType.set)
+                                     ])
+        requester.start()
+        time.sleep(.05)
+
+        assert requester.is_alive()
+
+        worker.stop()
+        self.release.set()
+        requester.join(1)
+
+        assert not requester.is_alive()
@@ -0,0 +1,195 @@
+import pytest
+import threading
+import time
+
+from mamba.core.connection_supervisor import ConnectionSupervisor, \
+    ConnectionState
+from mamba.core.exceptions import ComponentConfigException
+
+
+class FakeConnection:
+    def __init__(self, failures):
+        self.failures = failures
+        self.attempts = []
+        self.probes = 0
+        self.alive = True
+        self.states = []
+        self.reconnected = threading.Event()
+
+    def reconnect(self):
+        self.attempts.append(time.monotonic())
+
+        if len(self.attempts) <= self.failures:
+            return False
+
+        self.reconnected.set()
+        return True
+
+    def probe(self):
+        self.probes += 1
+
+    def on_state(self, state):
+        self.states.append(state)
+
+
+class TestClass:
+    def setup_method(self):
+        """ setup_method called for every method """
+        self.supervisor = None
+
+    def teardown_method(self):
+        """ teardown_method called for every method """
+        if self.supervisor is not None:
+            self.supervisor.close()
+
+    def test_reconnect_backoff(self):
+        connection = FakeConnection(failures=3)
+
+        self.supervisor = ConnectionSupervisor(
+            reconnect=connection.reconnect,
+            probe=connection.probe,
+            on_state=connection.on_state,
+            initial_delay=0.05,
+            max_delay=0.1,
+            jitter=0)
+
+        start = time.monotonic()
+        self.supervisor.lost()
+
+        assert self.supervisor.state == ConnectionState.reconnecting
+        assert connection.reconnected.wait(2)
+        time.sleep(.05)
+
+        delays = [
+            second - first for first, second in zip(
+                [start] + connection.attempts, connection.attempts)
+        ]
+
+        # The delay doubles up to the maximum delay
+        assert len(delays) == 4
+        assert 0.04 < delays[0] < 0.09
+        assert 0.09 < delays[1] < 0.14
+        assert 0.09 < delays[2] < 0.14
+        assert 0.09 < delays[3] < 0.14
+
+        assert self.supervisor.state == ConnectionState.connected
+        assert self.supervisor.attempts == 4
+        assert connection.states == [
+            ConnectionState.reconnecting, ConnectionState.connected
+        ]
+
+        # The backoff is restarted after a successful reconnection
+        assert self.supervisor._delay == 0.05
+
+    def test_jitter(self):
+        connection = FakeConnection(failures=0)
+
+        self.supervisor = ConnectionSupervisor(
+            reconnect=connection.reconnect,
+            probe=connection.probe,
+            on_state=connection.on_state,
+            initial_delay=1,
+            max_delay=1,
+            jitter=0.5)
+
+        delays = [self.supervisor._backoff() for _ in range(100)]
+
+        assert all(0.5 <= delay <= 1.5 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_probes(self):
+        connection = FakeConnection(failures=0)
+
+        self.supervisor = ConnectionSupervisor(
+            reconnect=connection.reconnect,
+            probe=connection.probe,
+            on_state=connection.on_state,
+            probe_interval=0.05)
+
+        self.supervisor.connected()
+        time.sleep(0.28)
+
+        assert 4 <= connection.probes <= 6
+
+        # Disconnected connections are not probed nor reconnected
+        self.supervisor.disconnected()
+        probes = connection.probes
+        time.sleep(0.15)
+
+        assert connection.probes == probes
+        assert connection.attempts == []
+        assert connection.states == [
+            ConnectionState.connected, ConnectionState.disconnected
+        ]
+
+    def test_disconnected_while_reconnecting(self):
+        connection = FakeConnection(failures=100)
+
+        self.supervisor = ConnectionSupervisor(
+            reconnect=connection.reconnect,
+            probe=connection.probe,
+            on_state=connection.on_state,
+            initial_delay=0.05,
+            max_delay=0.05)
+
+        self.supervisor.lost()
+        time.sleep(0.12)
+
+        with self.supervisor.lock:
+            self.supervisor.disconnected()
+
+        attempts = len(connection.attempts)
+        time.sleep(0.15)
+
+        assert attempts >= 1
+        assert len(connection.attempts) == attempts
+        assert self.supervisor.state == ConnectionState.disconnected
+
+    def test_from_config(self):
+        connection = FakeConnection(failures=0)
+
+        supervisor = ConnectionSupervisor.from_config(
+            {
+                'initial_delay': 1,
+                'max_delay': 10,
+                'jitter': 0,
+                'probe_interval': 5
+            }, connection.reconnect, connection.probe, connection.on_state)
+
+        assert supervisor._initial_delay == 1
+        assert supervisor._max_delay == 10
+        assert supervisor._jitter == 0
+        assert supervisor._probe_interval == 5
+
+        supervisor = ConnectionSupervisor.from_config(
+            {}, connection.reconnect, connection.probe, connection.on_state)
+
+        assert supervisor._probe_interval is None
+
+        with pytest.raises(ComponentConfigException) as excinfo:
+            ConnectionSupervisor.from_config({'max_delay': 'long'},
+                                             connection.reconnect,
+                                             connection.probe,
+                                             connection.on_state)
+
+        assert 'Reconnect delays, jitter and probe interval shall be ' \
+               'numeric' in str(excinfo.value)
+
+        for config in [{
+                'initial_delay': 0
+        }, {
+                'initial_delay': 2,
+                'max_delay': 1
+        }, {
+                'jitter': 1
+        }, {
+                'probe_interval': -1
+        }]:
+            with pytest.raises(ComponentConfigException) as excinfo:
+                ConnectionSupervisor.from_config(config,
+                                                 connection.reconnect,
+                                                 connection.probe,
+                                                 connection.on_state)
+
+            assert 'Reconnect delays and probe interval shall be positive' \
+                   in str(excinfo.value)
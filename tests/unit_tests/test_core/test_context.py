@@ -47,3 +47,21 @@ class TestClassSignal:
 
         assert callback_test_class.func_1_times_called == 2
         assert callback_test_class.func_1_last_value == [1, 2, 3]
+
+    def test_context_event_loop(self):
+        context = Context()
+
+        event_loop = context.event_loop()
+
+        # The loop is shared, and started on first use
+        assert context.event_loop() is event_loop
+        assert event_loop.is_running()
+        assert Context().event_loop() is not event_loop
+
+        # A stopped loop is replaced
+        event_loop.stop()
+
+        assert not event_loop.is_running()
+        assert context.event_loop() is not event_loop
+
+        context.event_loop().stop()
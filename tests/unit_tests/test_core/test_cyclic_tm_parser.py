@@ -0,0 +1,40 @@
+from mamba.core.component_base.tcp_tmtc_cyclic import CyclicTmParser, \
+    literal_tag
+
+
+class TestClass:
+    def test_literal_tag(self):
+        assert literal_tag('SPWG_TM_SPW_STS {:}') == 'SPWG_TM_SPW_STS'
+        assert literal_tag('TEMP A {:d}') == 'TEMP'
+        assert literal_tag('STATUS_OK') == 'STATUS_OK'
+        assert literal_tag('VOLT{:f}') is None
+        assert literal_tag('{:} TEMP') is None
+
+    def test_parse(self):
+        parser = CyclicTmParser({
+            'status': 'SPWG_TM_SPW_STS {:}',
+            'temp_a': 'TEMP A {:d}',
+            'temp_b': 'TEMP B {:d}',
+            'volt': 'VOLT{:f}',
+        })
+
+        assert parser.parse('SPWG_TM_SPW_STS 0 1 0 1') == [('status',
+                                                            '0 1 0 1')]
+        assert parser.parse('TEMP B 21') == [('temp_b', 21)]
+        assert parser.parse('VOLT3.5') == [('volt', 3.5)]
+        assert parser.unparsed == 0
+
+        # Lines without matching format are counted
+        assert parser.parse('TEMP C 21') == []
+        assert parser.parse('UNKNOWN 1') == []
+        assert parser.parse('') == []
+        assert parser.unparsed == 3
+
+    def test_parse_several_formats(self):
+        parser = CyclicTmParser({
+            'raw': 'TEMP {}',
+            'temp': 'TEMP {:d}',
+        })
+
+        assert parser.parse('TEMP 21') == [('raw', '21'), ('temp', 21)]
+        assert parser.parse('TEMP high') == [('raw', 'high')]
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+import threading
+import time
+
+from mamba.core.event_loop import EventLoop
+
+
+class TestClass:
+    def setup_method(self):
+        """ setup_method called for every method """
+        self.event_loop = EventLoop()
+
+    def teardown_method(self):
+        """ teardown_method called for every method """
+        if self.event_loop.is_running():
+            self.event_loop.stop()
+
+    def test_run(self):
+        async def loop_thread():
+            await asyncio.sleep(0)
+            return threading.current_thread().name
+
+        assert self.event_loop.run(loop_thread()) == 'mamba_event_loop'
+        assert not self.event_loop.in_loop_thread()
+
+    def test_concurrent_coroutines(self):
+        async def wait():
+            await asyncio.sleep(0.1)
+
+        start = time.monotonic()
+        futures = [self.event_loop.submit(wait()) for _ in range(100)]
+
+        for future in futures:
+            future.result()
+
+        assert time.monotonic() - start < 0.5
+
+    def test_run_from_loop_thread(self):
+        async def blocking_call():
+            self.event_loop.run(asyncio.sleep(0))
+
+        with pytest.raises(RuntimeError) as excinfo:
+            self.event_loop.run(blocking_call())
+
+        assert 'Blocking call from the event loop thread' in str(
+            excinfo.value)
+
+    def test_stop(self):
+        self.event_loop.stop()
+
+        assert not self.event_loop.is_running()
+        assert self.event_loop.loop.is_closed()
+
+        with pytest.raises(RuntimeError) as excinfo:
+            self.event_loop.run(asyncio.sleep(0))
+
+        assert 'Event loop is stopped' in str(excinfo.value)
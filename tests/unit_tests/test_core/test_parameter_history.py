@@ -0,0 +1,96 @@
+import numpy
+import pytest
+
+from mamba.core.parameter_history import ParameterHistory
+from mamba.core.exceptions import ComponentConfigException
+
+
+class TestClass:
+    def test_ring_buffer(self):
+        history = ParameterHistory(capacity=4)
+
+        timestamps, values = history.last(2)
+        assert timestamps.shape == (0, ) and values.shape == (0, )
+        assert history.stats(0, 10) is None
+
+        for second in range(1, 4):
+            history.append(second, str(second * 10))
+
+        assert len(history) == 3
+
+        timestamps, values = history.last(2)
+        assert list(timestamps) == [2, 3]
+        assert list(values) == [20, 30]
+
+        # The oldest samples are overwritten
+        for second in range(4, 7):
+            history.append(second, second * 10)
+
+        assert len(history) == 4
+
+        timestamps, values = history.last(10)
+        assert list(timestamps) == [3, 4, 5, 6]
+        assert list(values) == [30, 40, 50, 60]
+
+        # Time ranges, across the end of the buffer
+        assert list(history.between(3.5, 5)[1]) == [40, 50]
+        assert list(history.between(4, 4)[1]) == [40]
+        assert list(history.between(0, 3)[1]) == [30]
+        assert list(history.between(6, 10)[1]) == [60]
+        assert list(history.between(7, 10)[1]) == []
+        assert list(history.between(5, 4)[1]) == []
+
+        assert list(history.stats(0, 10)) == [30, 60, 45]
+        assert list(history.stats(4, 5)) == [40, 50, 45]
+        assert history.stats(7, 10) is None
+
+        # Values that are not numeric are rejected
+        history.append(7, 'high')
+        assert history.rejected == 1
+        assert len(history) == 4
+        assert list(history.last(1)[0]) == [6]
+
+    def test_vector_samples(self):
+        history = ParameterHistory(capacity=3, width=4)
+
+        history.append(1, '0 1 2 3')
+        history.append(2, '2 3 4 5')
+        history.append(3, [4, 5, 6, 7])
+        history.append(4, '1 2 3')
+
+        assert history.rejected == 1
+
+        timestamps, values = history.last(2)
+        assert list(timestamps) == [2, 3]
+        assert values.tolist() == [[2, 3, 4, 5], [4, 5, 6, 7]]
+
+        stats = history.stats(0, 10)
+        assert stats.tolist() == [[0, 1, 2, 3], [4, 5, 6, 7], [2, 3, 4, 5]]
+
+    def test_returned_arrays_are_copies(self):
+        history = ParameterHistory(capacity=2)
+        history.append(1, 1)
+
+        timestamps, values = history.last(1)
+        history.append(2, 2)
+        history.append(3, 3)
+
+        assert list(values) == [1]
+        assert isinstance(values, numpy.ndarray)
+
+    def test_from_config(self):
+        history = ParameterHistory.from_config({
+            'capacity': 100,
+            'width': 4
+        }, 'counter', 'gateway')
+
+        assert history.capacity == 100
+        assert history._values.shape == (100, 4)
+
+        for config in [None, {'capacity': 'long'}, {'capacity': 0},
+                       {'capacity': 1, 'width': 0}]:
+            with pytest.raises(ComponentConfigException) as excinfo:
+                ParameterHistory.from_config(config, 'counter', 'gateway')
+
+            assert 'In service gateway : "counter" history' in str(
+                excinfo.value)
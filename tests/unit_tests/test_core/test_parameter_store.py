@@ -0,0 +1,127 @@
+import threading
+
+from mamba.core.parameter_store import ParameterStore, ParameterValue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestClass:
+    def test_dictionary_interface(self):
+        store = ParameterStore()
+
+        store['a'] = 1
+        store.declare('b', 'on', 'str')
+
+        assert store == {'a': 1, 'b': 'on'}
+        assert {'a': 1, 'b': 'on'} == store
+        assert store != {'a': 1}
+        assert store['b'] == 'on'
+        assert 'a' in store
+        assert 'c' not in store
+        assert len(store) == 2
+        assert sorted(store) == ['a', 'b']
+        assert store.get('c') is None
+
+        assert store.slot_type('b') == 'str'
+        assert store.slot_type('a') is None
+
+        del store['a']
+        assert store == {'b': 'on'}
+        assert repr(store) == "ParameterStore({'b': 'on'})"
+
+    def test_versions_and_timestamps(self):
+        clock = FakeClock()
+        store = ParameterStore(clock=clock)
+
+        assert store.version == 0
+
+        store.declare('a', 0, 'int')
+        store.declare('b', 0, 'int')
+
+        assert store.version == 2
+        assert store.get_value('a') == ParameterValue(0, 1, 100.0)
+
+        # Writing the same value refreshes only the timestamp
+        clock.now = 101.0
+        store['a'] = 0
+        assert store.version == 2
+        assert store.get_value('a') == ParameterValue(0, 1, 101.0)
+
+        # Values of other type are a change
+        store['a'] = 0.0
+        assert store.get_value('a') == ParameterValue(0.0, 3, 101.0)
+
+        # A multi-key write is one change of the store
+        clock.now = 102.0
+        store.update({'a': 1}, b=2)
+        assert store.version == 4
+        assert store.snapshot() == {
+            'a': ParameterValue(1, 4, 102.0),
+            'b': ParameterValue(2, 4, 102.0)
+        }
+
+        store['b'] = 3
+        assert store.changed_since(4) == {'b': ParameterValue(3, 5, 102.0)}
+        assert store.changed_since(4, ['a']) == {}
+        assert store.changed_since(3, ['a', 'c']) == {
+            'a': ParameterValue(1, 4, 102.0)
+        }
+
+        assert store.values_snapshot(['a', 'c']) == {'a': 1}
+
+        assert store.modify('b', lambda value: value * 2) == 6
+        assert store.get_value('b').version == 6
+
+    def test_subscriptions(self):
+        store = ParameterStore()
+        all_changes = []
+        a_changes = []
+
+        store.subscribe(all_changes.append)
+        unsubscribe = store.subscribe(a_changes.append, keys=['a'])
+
+        store['a'] = 1
+        store['b'] = 1
+        store['b'] = 1
+        store.update(a=2, b=2)
+
+        assert [list(changes) for changes in all_changes] == [['a'], ['b'],
+                                                              ['a', 'b']]
+        assert [changes['a'].value for changes in a_changes] == [1, 2]
+
+        unsubscribe()
+        store['a'] = 3
+
+        assert len(a_changes) == 2
+        assert len(all_changes) == 4
+
+    def test_atomic_snapshots(self):
+        store = ParameterStore()
+        store.update(a=0, b=0)
+
+        done = threading.Event()
+
+        def writer():
+            for value in range(1, 20000):
+                store.update(a=value, b=value)
+            done.set()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+
+        torn = 0
+        while not done.is_set():
+            snapshot = store.values_snapshot(['a', 'b'])
+            if snapshot['a'] != snapshot['b']:
+                torn += 1
+
+        thread.join()
+
+        assert torn == 0
+        assert store == {'a': 19999, 'b': 19999}
@@ -0,0 +1,167 @@
+import pytest
+
+from mamba.core.response_cache import ResponseCache, CachePolicy
+from mamba.core.exceptions import ComponentConfigException
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestClass:
+    def setup_method(self):
+        """ setup_method called for every method """
+        self.clock = FakeClock()
+        self.cache = ResponseCache(
+            {
+                'idn': CachePolicy(ttl=1, max_staleness=1),
+                'freq': CachePolicy(ttl=1, max_staleness=10)
+            }, {
+                'freq': {'freq'},
+                'reset': {'idn', 'freq'}
+            },
+            clock=self.clock)
+
+    def test_lookup_ttl(self):
+        assert self.cache.is_cached('freq')
+        assert not self.cache.is_cached('power')
+
+        assert self.cache.lookup('freq') == (False, None)
+
+        self.cache.store('freq', '100')
+        self.clock.now = 0.5
+        assert self.cache.lookup('freq') == (True, '100')
+
+        self.clock.now = 1.5
+        assert self.cache.lookup('freq') == (False, None)
+
+        assert self.cache.hits == 1
+        assert self.cache.misses == 2
+
+    def test_lookup_stale(self):
+        self.cache.store('idn', 'Mamba')
+        self.cache.store('freq', '100')
+
+        self.clock.now = 5
+        assert self.cache.lookup_stale('idn') == (False, None)
+        assert self.cache.lookup_stale('freq') == (True, '100')
+
+        self.clock.now = 10
+        assert self.cache.lookup_stale('freq') == (False, None)
+
+        assert self.cache.stale_hits == 1
+
+    def test_invalidate(self):
+        self.cache.store('idn', 'Mamba')
+        self.cache.store('freq', '100')
+
+        self.cache.invalidate('freq')
+        assert self.cache.lookup('freq') == (False, None)
+        assert self.cache.lookup('idn') == (True, 'Mamba')
+
+        self.cache.invalidate('unknown')
+        assert self.cache.lookup('idn') == (True, 'Mamba')
+
+        self.cache.store('freq', '100')
+        self.cache.invalidate('reset')
+        assert self.cache.lookup('idn') == (False, None)
+        assert self.cache.lookup('freq') == (False, None)
+
+        self.cache.store('idn', 'Mamba')
+        self.cache.clear()
+        assert self.cache.lookup_stale('idn') == (False, None)
+
+    def test_from_parameters(self):
+        assert ResponseCache.from_parameters({}, 'test') is None
+
+        cache = ResponseCache.from_parameters(
+            {
+                'frequency': {
+                    'set': {
+                        'alias': 'FREQ',
+                        'instrument_command': [{
+                            'write': 'FREQ {:}'
+                        }]
+                    },
+                    'get': {
+                        'alias': 'FREQ',
+                        'instrument_command': [{
+                            'query': 'FREQ?'
+                        }]
+                    },
+                    'cache': {
+                        'ttl': 1,
+                        'max_staleness': 5
+                    }
+                },
+                'idn': {
+                    'get': {
+                        'instrument_command': [{
+                            'query': '*IDN?'
+                        }]
+                    },
+                    'cache': {
+                        'ttl': 60,
+                        'invalidated_by': ['reset']
+                    }
+                },
+                'reset': {
+                    'set': {
+                        'instrument_command': [{
+                            'write': '*RST'
+                        }]
+                    }
+                }
+            }, 'test')
+
+        assert cache._policies == {
+            'freq': CachePolicy(ttl=1, max_staleness=5),
+            'idn': CachePolicy(ttl=60, max_staleness=60)
+        }
+        assert cache._invalidations == {
+            'freq': {'freq'},
+            'idn': {'idn'},
+            'reset': {'idn'}
+        }
+
+    def test_from_parameters_errors(self):
+        with pytest.raises(ComponentConfigException) as excinfo:
+            ResponseCache.from_parameters(
+                {'connected': {
+                    'get': None,
+                    'cache': {
+                        'ttl': 1
+                    }
+                }}, 'test')
+
+        assert 'In service test : "connected" cache is only allowed for ' \
+               'getters with instrument command' in str(excinfo.value)
+
+        getter = {'instrument_command': [{'query': 'FREQ?'}]}
+
+        for cache in [{}, {'ttl': 'fast'}, {'ttl': 1, 'max_staleness': None}]:
+            with pytest.raises(ComponentConfigException) as excinfo:
+                ResponseCache.from_parameters(
+                    {'freq': {
+                        'get': getter,
+                        'cache': cache
+                    }}, 'test')
+
+            assert 'In service test : "freq" cache shall have a numeric ' \
+                   'ttl and max_staleness' in str(excinfo.value)
+
+        for cache in [{'ttl': -1}, {'ttl': 2, 'max_staleness': 1}]:
+            with pytest.raises(ComponentConfigException) as excinfo:
+                ResponseCache.from_parameters(
+                    {'freq': {
+                        'get': getter,
+                        'cache': cache
+                    }}, 'test')
+
+            assert 'In service test : "freq" cache ttl shall be positive, ' \
+                   'and max_staleness not lower than ttl' in str(
+                       excinfo.value)
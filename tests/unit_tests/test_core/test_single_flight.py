@@ -0,0 +1,22 @@
+from mamba.core.single_flight import SingleFlight
+
+
+class TestClass:
+    def test_single_flight(self):
+        flight = SingleFlight()
+
+        assert flight.join(('idn', ()), 1)
+        assert not flight.join(('idn', ()), 2)
+        assert flight.join(('idn', ('1', )), 3)
+        assert not flight.join(('idn', ()), 4)
+
+        assert flight.coalesced == 2
+
+        # Only the executed request completes the flight
+        assert flight.complete(2) == []
+        assert flight.complete(1) == [2, 4]
+        assert flight.complete(3) == []
+        assert flight.complete(1) == []
+
+        # The next request is executed again
+        assert flight.join(('idn', ()), 5)
@@ -6,6 +6,7 @@ from rx import operators as op
 
 from mamba.core.subject_factory import SubjectFactory as SubjectFactory
 from mamba.core.testing.utils import CallbackTestClass
+from mamba.core.msg import ServiceRequest, ParameterType
 
 
 class TestClassSubjectFactoryClass:
@@ -80,3 +81,70 @@ class TestClassSubjectFactoryClass:
         assert callback_test_class.func_1_times_called == 0
         assert callback_test_class.func_2_last_value == 1
         assert callback_test_class.func_2_times_called == 1
+
+    def test_subject_factory_subscribe_route(self):
+        """ Test delivery of values to the observers of its routing key """
+        dummy_subject_factory = SubjectFactory()
+        callback_test_class = CallbackTestClass()
+
+        dummy_subject_factory['TestSubject'].subscribe_route(
+            'provider_1', callback_test_class.test_func_1)
+        dummy_subject_factory['TestSubject'].subscribe_route(
+            'provider_2', callback_test_class.test_func_2)
+
+        dummy_subject_factory['TestSubject'].on_next(
+            ServiceRequest(id='param', type=ParameterType.get,
+                           provider='provider_1'))
+
+        assert callback_test_class.func_1_times_called == 1
+        assert callback_test_class.func_1_last_value.provider == 'provider_1'
+        assert callback_test_class.func_2_times_called == 0
+
+        # Values without routing key are only broadcast
+        dummy_subject_factory['TestSubject'].on_next(1)
+
+        assert callback_test_class.func_1_times_called == 1
+        assert callback_test_class.func_2_times_called == 0
+
+        dummy_subject_factory['TestSubject'].on_next(
+            ServiceRequest(id='param', type=ParameterType.get,
+                           provider='provider_3'))
+
+        assert callback_test_class.func_1_times_called == 1
+        assert callback_test_class.func_2_times_called == 0
+
+    def test_subject_factory_subscribe_route_and_broadcast(self):
+        """ Test routed values are still broadcast to all observers """
+        dummy_subject_factory = SubjectFactory()
+        callback_test_class = CallbackTestClass()
+
+        dummy_subject_factory['TestSubject'].subscribe_route(
+            'provider_1', callback_test_class.test_func_1)
+        dummy_subject_factory['TestSubject'].subscribe(
+            callback_test_class.test_func_2)
+
+        dummy_subject_factory['TestSubject'].on_next(
+            ServiceRequest(id='param', type=ParameterType.get,
+                           provider='provider_1'))
+
+        assert callback_test_class.func_1_times_called == 1
+        assert callback_test_class.func_2_times_called == 1
+
+    def test_subject_factory_route_dispose(self):
+        """ Test unregistering from a route """
+        dummy_subject_factory = SubjectFactory()
+        callback_test_class = CallbackTestClass()
+
+        route_1 = dummy_subject_factory['TestSubject'].subscribe_route(
+            'provider_1', callback_test_class.test_func_1)
+        dummy_subject_factory['TestSubject'].subscribe_route(
+            'provider_1', callback_test_class.test_func_2)
+
+        route_1.dispose()
+
+        dummy_subject_factory['TestSubject'].on_next(
+            ServiceRequest(id='param', type=ParameterType.get,
+                           provider='provider_1'))
+
+        assert callback_test_class.func_1_times_called == 0
+        assert callback_test_class.func_2_times_called == 1
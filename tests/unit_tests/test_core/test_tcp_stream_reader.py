@@ -0,0 +1,114 @@
+import socket
+import threading
+import pytest
+
+from mamba.core.component_base.tcp_instrument_driver import \
+    TcpStreamReader, MessageTooLongError
+
+
+class TestClass:
+    def setup_method(self):
+        """ setup_method called for every method """
+        self.local, self.remote = socket.socketpair()
+
+    def teardown_method(self):
+        """ teardown_method called for every method """
+        self.local.close()
+        self.remote.close()
+
+    def test_read_message_split_segments(self):
+        reader = TcpStreamReader(self.local, b'\r\n')
+
+        # Message and terminator split across several segments
+        self.remote.sendall(b'first mes')
+        timer = threading.Timer(.05, self.remote.sendall,
+                                [b'sage\r\nsecond\r'])
+        timer.start()
+
+        assert reader.read_message() == b'first message'
+
+        timer = threading.Timer(.05, self.remote.sendall, [b'\n'])
+        timer.start()
+
+        assert reader.read_message() == b'second'
+
+    def test_read_messages_pipelined(self):
+        reader = TcpStreamReader(self.local, b'\n')
+
+        self.remote.sendall(b'1\n2\n3\n4')
+
+        assert reader.read_messages() == [b'1', b'2', b'3']
+
+        self.remote.sendall(b'\n')
+
+        assert reader.read_messages() == [b'4']
+
+    def test_read_message_long(self):
+        reader = TcpStreamReader(self.local, b'\n')
+        message = bytes(range(256)).replace(b'\n', b'') * 400
+
+        sender = threading.Thread(target=self.remote.sendall,
+                                  args=[message + b'\nend\n'])
+        sender.start()
+
+        assert reader.read_message() == message
+        assert reader.read_message() == b'end'
+
+        sender.join()
+
+    def test_read_message_max_size(self):
+        reader = TcpStreamReader(self.local, b'\n', max_message_size=16)
+
+        self.remote.sendall(b'a' * 10000)
+
+        with pytest.raises(MessageTooLongError) as excinfo:
+            reader.read_message()
+
+        assert 'Message exceeds the maximum size of 16 bytes' in str(
+            excinfo.value)
+
+        # The rest of the long message is discarded
+        self.remote.sendall(b'a' * 100 + b'\nshort\n')
+
+        assert reader.read_message() == b'short'
+
+        # Complete messages are also checked
+        self.remote.sendall(b'b' * 17 + b'\nok\n')
+
+        with pytest.raises(MessageTooLongError):
+            reader.read_message()
+
+        assert reader.read_message() == b'ok'
+
+    def test_read_message_timeout(self):
+        reader = TcpStreamReader(self.local, b'\n', timeout=.1)
+
+        self.remote.sendall(b'no terminator')
+
+        with pytest.raises(socket.timeout):
+            reader.read_message()
+
+        assert self.local.gettimeout() is None
+
+    def test_read_message_closed(self):
+        reader = TcpStreamReader(self.local, b'\n')
+
+        self.remote.sendall(b'last\n')
+        self.remote.close()
+
+        assert reader.read_message() == b'last'
+
+        with pytest.raises(ConnectionResetError):
+            reader.read_message()
+
+    def test_clear(self):
+        reader = TcpStreamReader(self.local, b'\n')
+
+        self.remote.sendall(b'old\nstale\n')
+
+        assert reader.read_message() == b'old'
+
+        reader.clear()
+        self.remote.sendall(b'fresh\n')
+
+        assert reader.read_message() == b'fresh'
@@ -0,0 +1,112 @@
+import os
+import time
+from tempfile import mkdtemp
+from shutil import rmtree
+
+import numpy
+
+from mamba.core.telemetry_archive import ArchiveWriter, TelemetryArchive
+
+
+class TestClass:
+    def setup_method(self):
+        """ setup_method called for every method """
+        self.temp_path = mkdtemp()
+
+    def teardown_method(self):
+        """ teardown_method called for every method """
+        rmtree(self.temp_path)
+
+    def test_write_and_read(self):
+        writer = ArchiveWriter(self.temp_path, chunk_samples=4)
+        writer.start()
+
+        for index in range(10):
+            writer.append(1000.0 + index, 'power_supply', 'voltage',
+                          index * 0.5)
+        writer.append(1000.0, 'power_supply', 'current', '2.5')
+        writer.append(1001.0, 'power_supply', 'current', 'on')
+        writer.append(1002.0, 'power_supply', 'current', None)
+
+        assert writer.flush(timeout=5)
+        assert writer.written == 11
+        assert writer.rejected == 2
+        assert writer.dropped == 0
+
+        # Rolled over every 4 samples
+        assert len(
+            os.listdir(
+                os.path.join(self.temp_path, 'power_supply',
+                             'voltage'))) == 6
+
+        archive = TelemetryArchive(self.temp_path)
+        assert archive.parameters() == [('power_supply', 'current'),
+                                        ('power_supply', 'voltage')]
+
+        timestamps, values = archive.read('power_supply', 'voltage')
+        assert timestamps.tolist() == [1000.0 + index for index in range(10)]
+        assert values.tolist() == [index * 0.5 for index in range(10)]
+
+        timestamps, values = archive.read('power_supply', 'voltage', 1003.0,
+                                          1008.0)
+        assert timestamps.tolist() == [1003.0, 1004.0, 1005.0, 1006.0,
+                                       1007.0, 1008.0]
+        assert values.tolist() == [1.5, 2.0, 2.5, 3.0, 3.5, 4.0]
+
+        assert archive.read('power_supply', 'voltage', start=1008.5)[
+            1].tolist() == [4.5]
+        assert archive.read('power_supply', 'voltage', end=999)[0].size == 0
+        assert archive.read('power_supply', 'current')[1].tolist() == [2.5]
+        assert archive.read('power_supply', 'unknown')[0].size == 0
+
+        writer.close()
+
+    def test_sessions_are_appended(self):
+        for session in range(2):
+            writer = ArchiveWriter(self.temp_path)
+            writer.start()
+            writer.append(time.time(), 'tm', 'counter', session)
+            writer.close()
+
+        timestamps, values = TelemetryArchive(self.temp_path).read(
+            'tm', 'counter')
+
+        assert values.tolist() == [0, 1]
+        assert timestamps[0] <= timestamps[1]
+
+    def test_interrupted_write(self):
+        writer = ArchiveWriter(self.temp_path)
+        writer.start()
+        writer.append(1000.0, 'tm', 'counter', 1)
+        writer.append(1001.0, 'tm', 'counter', 2)
+        writer.close()
+
+        # A value column shorter than the time column, as left by a crash
+        directory = os.path.join(self.temp_path, 'tm', 'counter')
+        value_file = [
+            name for name in os.listdir(directory) if name.endswith('.value')
+        ][0]
+        with open(os.path.join(directory, value_file), 'ab') as file:
+            file.truncate(12)
+
+        timestamps, values = TelemetryArchive(self.temp_path).read(
+            'tm', 'counter')
+
+        assert timestamps.tolist() == [1000.0]
+        assert values.tolist() == [1]
+
+    def test_full_queue_drops(self):
+        writer = ArchiveWriter(self.temp_path, max_pending=3)
+
+        for index in range(5):
+            writer.append(1000.0 + index, 'tm', 'counter', index)
+
+        assert writer.dropped == 2
+
+        writer.start()
+        writer.close()
+
+        assert writer.written == 3
+        assert numpy.array_equal(
+            TelemetryArchive(self.temp_path).read('tm', 'counter')[1],
+            [0, 1, 2])
@@ -0,0 +1,124 @@
+import pytest
+import time
+
+from mamba.core.telemetry_throttle import TelemetryThrottle, PublishPolicy
+from mamba.core.exceptions import ComponentConfigException
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestClass:
+    def setup_method(self):
+        """ setup_method called for every method """
+        self.throttle = None
+        self.published = []
+
+    def teardown_method(self):
+        """ teardown_method called for every method """
+        if self.throttle is not None:
+            self.throttle.close()
+
+    def publish(self, key, value):
+        self.published.append((key, value))
+
+    def test_without_policy(self):
+        self.throttle = TelemetryThrottle({}, self.publish)
+
+        for value in range(3):
+            self.throttle.offer('temp', value)
+
+        assert self.published == [('temp', 0), ('temp', 1), ('temp', 2)]
+        assert self.throttle.dropped == 0
+
+    def test_deadband(self):
+        self.throttle = TelemetryThrottle(
+            {'temp': PublishPolicy(min_interval=0, deadband=1,
+                                   conflate=True)}, self.publish)
+
+        for value in ['20', '20.5', '20.9', '21', '20.1', 'n/a', 'n/a']:
+            self.throttle.offer('temp', value)
+
+        # Changes from the last published value
+        assert self.published == [('temp', '20'), ('temp', '21'),
+                                  ('temp', 'n/a'), ('temp', 'n/a')]
+        assert self.throttle.dropped == 3
+
+    def test_max_rate_drop(self):
+        clock = FakeClock()
+        self.throttle = TelemetryThrottle(
+            {'temp': PublishPolicy(min_interval=1, deadband=0,
+                                   conflate=False)}, self.publish, clock)
+
+        for value in range(5):
+            self.throttle.offer('temp', value)
+            clock.now += 0.4
+
+        assert self.published == [('temp', 0), ('temp', 3)]
+        assert self.throttle.dropped == 3
+        assert self.throttle.conflated == 0
+
+    def test_max_rate_conflation(self):
+        self.throttle = TelemetryThrottle(
+            {'temp': PublishPolicy(min_interval=0.1, deadband=0,
+                                   conflate=True)}, self.publish)
+
+        for value in range(5):
+            self.throttle.offer('temp', value)
+
+        assert self.published == [('temp', 0)]
+
+        # The last sample is published when the interval expires
+        time.sleep(0.15)
+
+        assert self.published == [('temp', 0), ('temp', 4)]
+        assert self.throttle.conflated == 3
+        assert self.throttle.dropped == 0
+
+        # The rate is kept after the flush
+        self.throttle.offer('temp', 5)
+        assert len(self.published) == 2
+
+        time.sleep(0.15)
+        assert self.published[-1] == ('temp', 5)
+
+    def test_close(self):
+        self.throttle = TelemetryThrottle(
+            {'temp': PublishPolicy(min_interval=0.05, deadband=0,
+                                   conflate=True)}, self.publish)
+
+        self.throttle.offer('temp', 0)
+        self.throttle.offer('temp', 1)
+        self.throttle.close()
+
+        time.sleep(0.1)
+        assert self.published == [('temp', 0)]
+
+    def test_from_config(self):
+        assert PublishPolicy.from_config(
+            {
+                'max_rate': 4,
+                'deadband': 0.5,
+                'conflate': False
+            }, 'temp', 'sensor') == PublishPolicy(min_interval=0.25,
+                                                  deadband=0.5,
+                                                  conflate=False)
+        assert PublishPolicy.from_config({}, 'temp', 'sensor') == \
+            PublishPolicy(min_interval=0, deadband=0, conflate=True)
+
+        with pytest.raises(ComponentConfigException) as excinfo:
+            PublishPolicy.from_config({'max_rate': 'fast'}, 'temp', 'sensor')
+
+        assert 'In service sensor : "temp" publish max_rate and deadband ' \
+               'shall be numeric' in str(excinfo.value)
+
+        for config in [{'max_rate': 0}, {'deadband': -1}]:
+            with pytest.raises(ComponentConfigException) as excinfo:
+                PublishPolicy.from_config(config, 'temp', 'sensor')
+
+            assert 'shall be positive' in str(excinfo.value)
@@ -0,0 +1,111 @@
+import socket
+import threading
+import pytest
+
+from mamba.core.component_base.udp_instrument_driver import \
+    UdpDatagramChannel
+
+
+class TestClass:
+    def setup_method(self):
+        """ setup_method called for every method """
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.settimeout(2)
+        self.port = self.server.getsockname()[1]
+        self.channel = None
+
+    def teardown_method(self):
+        """ teardown_method called for every method """
+        if self.channel is not None:
+            self.channel.close()
+        self.server.close()
+
+    def _reply(self, transform, count=1):
+        def serve():
+            for _ in range(count):
+                data, client = self.server.recvfrom(1024)
+                for reply in transform(str(data, 'utf-8')):
+                    self.server.sendto(bytes(reply, 'utf-8'), client)
+
+        server_thread = threading.Thread(target=serve)
+        server_thread.start()
+        return server_thread
+
+    def test_query_persistent_socket(self):
+        self.channel = UdpDatagramChannel('127.0.0.1', self.port, '\r\n',
+                                          '\n', 'utf-8', timeout=2)
+
+        server_thread = self._reply(lambda cmd: [f'{cmd.strip()} ok\n'], 2)
+
+        assert self.channel.query('FIRST?') == 'FIRST? ok'
+        assert self.channel.query('SECOND?') == 'SECOND? ok'
+
+        server_thread.join()
+
+    def test_query_discards_stale_datagrams(self):
+        self.channel = UdpDatagramChannel('127.0.0.1', self.port, '\n', '\n',
+                                          'utf-8', timeout=2)
+
+        # Late replies of a previous query are received before the reply
+        server_thread = self._reply(lambda cmd: ['late 1\n', 'late 2\n'])
+        self.channel.write('OLD?')
+        server_thread.join()
+
+        server_thread = self._reply(lambda cmd: [f'{cmd.strip()} ok\n'])
+
+        assert self.channel.query('NEW?') == 'NEW? ok'
+        assert self.channel.discarded == 2
+
+        server_thread.join()
+
+    def test_query_timeout(self):
+        self.channel = UdpDatagramChannel('127.0.0.1', self.port, '\n', '\n',
+                                          'utf-8', timeout=0.1)
+
+        with pytest.raises(socket.timeout):
+            self.channel.query('NO_REPLY?')
+
+    def test_tagged_queries_out_of_order(self):
+        self.channel = UdpDatagramChannel('127.0.0.1', self.port, '\n', '\n',
+                                          'utf-8', timeout=2,
+                                          sequence_tag=True)
+
+        received = []
+        both_received = threading.Event()
+
+        def serve():
+            # Reply to both queries in reverse order, plus a stale reply
+            for _ in range(2):
+                data, client = self.server.recvfrom(1024)
+                received.append(str(data, 'utf-8').strip())
+            both_received.set()
+
+            self.server.sendto(b'#999 stale\n', client)
+            for message in reversed(received):
+                tag, _, cmd = message.partition(' ')
+                self.server.sendto(bytes(f'{tag} {cmd} ok\n', 'utf-8'),
+                                   client)
+
+        server_thread = threading.Thread(target=serve)
+        server_thread.start()
+
+        replies = {}
+
+        def query(cmd):
+            replies[cmd] = self.channel.query(cmd)
+
+        queries = [
+            threading.Thread(target=query, args=[cmd])
+            for cmd in ['A?', 'B?']
+        ]
+        for query_thread in queries:
+            query_thread.start()
+        for query_thread in queries:
+            query_thread.join()
+
+        server_thread.join()
+
+        assert both_received.is_set()
+        assert replies == {'A?': 'A? ok', 'B?': 'B? ok'}
+        assert self.channel.discarded == 1